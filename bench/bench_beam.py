@@ -0,0 +1,81 @@
+import argparse
+import csv
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Adjust the path to import the algorithm utilities from src/python
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src" / "python"))
+
+try:
+    from solver.beam import beam_search
+    from utils import colex
+    from utils.coverage import build_coverage_index
+except ImportError as e:
+    print(f"Error importing beam search: {e}", file=sys.stderr)
+    sys.exit(1)
+
+# --- Configuration ---
+DEFAULT_CASES = [(12, 6, 5, 4), (14, 6, 6, 4), (15, 6, 5, 4)]
+DEFAULT_WIDTHS = "1,4,16"
+DEFAULT_OUTPUT_CSV = "benchmark_beam.csv"
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark beam search cover size and wall time against the beam width B."
+    )
+    parser.add_argument(
+        "--case",
+        action="append",
+        type=lambda v: tuple(int(x) for x in v.split(",")),
+        help="n,k,j,s instance (repeatable; default: a fixed set of cases)",
+    )
+    parser.add_argument("--widths", type=str, default=DEFAULT_WIDTHS)
+    parser.add_argument(
+        "--workers", type=int, default=None, help="Worker processes (default: auto)"
+    )
+    parser.add_argument("-o", "--output", type=str, default=DEFAULT_OUTPUT_CSV)
+    args = parser.parse_args()
+
+    results = []
+    for n, k, j, s in args.case or DEFAULT_CASES:
+        k_masks = colex.masks(np.arange(colex.num_subsets(n, k)), n, k)
+        j_masks = colex.masks(np.arange(colex.num_subsets(n, j)), n, j)
+        index = build_coverage_index(k_masks, j_masks, s, n)
+        for width in (int(w) for w in args.widths.split(",")):
+            start = time.perf_counter()
+            selected = beam_search(index, width, workers=args.workers)
+            elapsed = time.perf_counter() - start
+            result = {
+                "n": n,
+                "k": k,
+                "j": j,
+                "s": s,
+                "beam_width": width,
+                "cover_size": len(selected),
+                "time_s": round(elapsed, 3),
+                "valid": bool(index.is_cover(selected)),
+            }
+            print(
+                f"n={n} k={k} j={j} s={s} B={width}: size={result['cover_size']} "
+                f"time={result['time_s']}s valid={result['valid']}"
+            )
+            results.append(result)
+
+    output_path = Path(args.output)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, "w", newline="", encoding="utf-8") as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=list(results[0].keys()))
+        writer.writeheader()
+        writer.writerows(results)
+    print(f"\nBenchmark results saved successfully to {output_path}")
+    if not all(r["valid"] for r in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
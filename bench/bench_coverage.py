@@ -0,0 +1,125 @@
+import argparse
+import csv
+import itertools
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+# Adjust the path to import the algorithm utilities from src/python
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src" / "python"))
+
+try:
+    from utils.coverage import build_coverage_index, covering_k_indices, subset_masks
+except ImportError as e:
+    print(f"Error importing coverage engine: {e}", file=sys.stderr)
+    sys.exit(1)
+
+# --- Configuration ---
+DEFAULT_N_RANGE = (15, 25)
+DEFAULT_K, DEFAULT_J, DEFAULT_S = 6, 5, 4
+DEFAULT_SAMPLE_ROWS = 200  # j-subsets timed per method; totals are extrapolated
+DEFAULT_OUTPUT_CSV = "benchmark_coverage.csv"
+
+
+def legacy_rows(k_combos, j_rows, s) -> List[List[int]]:
+    """Covering lists built the way the original code did (s-subset set comparison)."""
+    k_sets = [set(itertools.combinations(kc, s)) for kc in k_combos]
+    rows = []
+    for js in j_rows:
+        st_js = set(itertools.combinations(js, s))
+        rows.append([i for i, ks in enumerate(k_sets) if not ks.isdisjoint(st_js)])
+    return rows
+
+
+def run_single_benchmark(
+    n: int, k: int, j: int, s: int, sample_rows: int
+) -> Dict[str, Any]:
+    """Times both coverage methods on a sample of j-subsets for one value of n."""
+    samples = list(range(1, n + 1))
+    k_combos = list(itertools.combinations(samples, k))
+    j_subsets = list(itertools.combinations(samples, j))
+    rng = random.Random(n)
+    rows = sorted(rng.sample(range(len(j_subsets)), min(sample_rows, len(j_subsets))))
+    j_rows = [j_subsets[i] for i in rows]
+    scale = len(j_subsets) / len(j_rows)
+
+    start = time.perf_counter()
+    expected = legacy_rows(k_combos, j_rows, s)
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    k_masks = subset_masks(k_combos, samples)
+    setup_time = time.perf_counter() - start
+    start = time.perf_counter()
+    got = covering_k_indices(k_masks, subset_masks(j_rows, samples), s)
+    engine_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    index = build_coverage_index(k_masks, subset_masks(j_subsets, samples), s, n)
+    csr_time = time.perf_counter() - start
+
+    identical = all(e == g.tolist() for e, g in zip(expected, got)) and all(
+        e == index.covering(i).tolist() for e, i in zip(expected, rows)
+    )
+    result = {
+        "n": n,
+        "k": k,
+        "j": j,
+        "s": s,
+        "num_k_combos": len(k_combos),
+        "num_j_subsets": len(j_subsets),
+        "sampled_rows": len(j_rows),
+        "legacy_est_s": round(legacy_time * scale, 3),
+        "engine_est_s": round(setup_time + engine_time * scale, 3),
+        "csr_build_s": round(csr_time, 3),
+        "nnz": index.nnz,
+        "speedup": round(legacy_time / max(engine_time, 1e-9), 1),
+        "identical": identical,
+    }
+    print(
+        f"n={n}: legacy~{result['legacy_est_s']}s engine~{result['engine_est_s']}s "
+        f"csr={result['csr_build_s']}s "
+        f"speedup x{result['speedup']} identical={identical}"
+    )
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the coverage engine (pairwise popcount and direct CSR enumeration) against s-subset set comparison."
+    )
+    parser.add_argument("--n-min", type=int, default=DEFAULT_N_RANGE[0])
+    parser.add_argument("--n-max", type=int, default=DEFAULT_N_RANGE[1])
+    parser.add_argument("-k", type=int, default=DEFAULT_K)
+    parser.add_argument("-j", type=int, default=DEFAULT_J)
+    parser.add_argument("-s", type=int, default=DEFAULT_S)
+    parser.add_argument(
+        "--sample-rows",
+        type=int,
+        default=DEFAULT_SAMPLE_ROWS,
+        help=f"j-subsets timed per n; totals are extrapolated (default: {DEFAULT_SAMPLE_ROWS})",
+    )
+    parser.add_argument("-o", "--output", type=str, default=DEFAULT_OUTPUT_CSV)
+    args = parser.parse_args()
+
+    results = [
+        run_single_benchmark(n, args.k, args.j, args.s, args.sample_rows)
+        for n in range(args.n_min, args.n_max + 1)
+    ]
+
+    output_path = Path(args.output)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, "w", newline="", encoding="utf-8") as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=list(results[0].keys()))
+        writer.writeheader()
+        writer.writerows(results)
+    print(f"\nBenchmark results saved successfully to {output_path}")
+    if not all(r["identical"] for r in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
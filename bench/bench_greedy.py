@@ -0,0 +1,109 @@
+import argparse
+import csv
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+import numpy as np
+
+# Adjust the path to import the algorithm utilities from src/python
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src" / "python"))
+
+try:
+    from solver.greedy import GREEDY_ENGINES
+    from utils import colex
+    from utils.coverage import build_coverage_index
+except ImportError as e:
+    print(f"Error importing greedy engines: {e}", file=sys.stderr)
+    sys.exit(1)
+
+# --- Configuration ---
+DEFAULT_CASES = [(12, 6, 5, 4), (14, 6, 6, 4), (15, 6, 5, 4), (16, 7, 6, 5)]
+DEFAULT_OUTPUT_CSV = "benchmark_greedy.csv"
+
+
+def run_single_benchmark(
+    n: int, k: int, j: int, s: int, engines: List[str], epsilon: float, seed: int
+) -> List[Dict[str, Any]]:
+    """Runs each greedy engine on the full (n, k, j, s) instance."""
+    k_masks = colex.masks(np.arange(colex.num_subsets(n, k)), n, k)
+    j_masks = colex.masks(np.arange(colex.num_subsets(n, j)), n, j)
+    index = build_coverage_index(k_masks, j_masks, s, n)
+
+    results = []
+    reference = None
+    for name in engines:
+        start = time.perf_counter()
+        options = {"epsilon": epsilon, "seed": seed} if name == "stochastic" else {}
+        selected, stats = GREEDY_ENGINES[name](index, **options)
+        elapsed = time.perf_counter() - start
+        if reference is None:
+            reference = selected
+        result = {
+            "n": n,
+            "k": k,
+            "j": j,
+            "s": s,
+            "engine": name,
+            "cover_size": len(selected),
+            "evaluations": stats["evaluations"],
+            "time_s": round(elapsed, 4),
+            "valid": bool(index.is_cover(np.asarray(selected, dtype=np.int64))),
+            "same_as_first": selected == reference,
+            "size_vs_first": round(len(selected) / max(1, len(reference)), 3),
+        }
+        print(
+            f"n={n} k={k} j={j} s={s} {name}: size={result['cover_size']} "
+            f"evaluations={result['evaluations']} time={result['time_s']}s "
+            f"valid={result['valid']} same={result['same_as_first']} "
+            f"size_vs_first={result['size_vs_first']}"
+        )
+        results.append(result)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark greedy engines (gain evaluations, time, cover size relative to the first engine) on full instances."
+    )
+    parser.add_argument(
+        "--case",
+        action="append",
+        type=lambda v: tuple(int(x) for x in v.split(",")),
+        help="n,k,j,s instance (repeatable; default: a fixed set of cases)",
+    )
+    parser.add_argument(
+        "--engines",
+        type=str,
+        default=",".join(GREEDY_ENGINES),
+        help=f"Comma-separated engines (default: {','.join(GREEDY_ENGINES)})",
+    )
+    parser.add_argument(
+        "--epsilon", type=float, default=0.1, help="Stochastic engine epsilon"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Stochastic engine seed")
+    parser.add_argument("-o", "--output", type=str, default=DEFAULT_OUTPUT_CSV)
+    args = parser.parse_args()
+
+    engines = args.engines.split(",")
+    results = []
+    for n, k, j, s in args.case or DEFAULT_CASES:
+        results.extend(
+            run_single_benchmark(n, k, j, s, engines, args.epsilon, args.seed)
+        )
+
+    output_path = Path(args.output)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, "w", newline="", encoding="utf-8") as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=list(results[0].keys()))
+        writer.writeheader()
+        writer.writerows(results)
+    print(f"\nBenchmark results saved successfully to {output_path}")
+    if not all(r["valid"] for r in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+import argparse
+import contextlib
+import csv
+import io
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Adjust the path to import the algorithm utilities from src/python
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src" / "python"))
+
+try:
+    from algorithm import _threshold_set_cover
+    from utils import colex
+except ImportError as e:
+    print(f"Error importing the CP-SAT model: {e}", file=sys.stderr)
+    sys.exit(1)
+
+# --- Configuration ---
+DEFAULT_CASES = [(9, 6, 5, 4, 1), (10, 6, 5, 4, 1), (10, 6, 6, 4, 1), (9, 5, 4, 3, 2)]
+DEFAULT_MODES = "none,lex"
+DEFAULT_OUTPUT_CSV = "benchmark_symmetry.csv"
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark CP-SAT proof time on full instances with and without sample-permutation symmetry breaking."
+    )
+    parser.add_argument(
+        "--case",
+        action="append",
+        type=lambda v: tuple(int(x) for x in v.split(",")),
+        help="n,k,j,s,t instance (repeatable; default: a fixed set of cases)",
+    )
+    parser.add_argument("--modes", type=str, default=DEFAULT_MODES)
+    parser.add_argument("--time-limit", type=float, default=60.0)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("-o", "--output", type=str, default=DEFAULT_OUTPUT_CSV)
+    args = parser.parse_args()
+
+    results = []
+    for n, k, j, s, t in args.case or DEFAULT_CASES:
+        combos = np.arange(colex.num_subsets(n, k), dtype=np.int32)
+        j_subsets = np.arange(colex.num_subsets(n, j), dtype=np.int32)
+        for mode in args.modes.split(","):
+            start = time.perf_counter()
+            with contextlib.redirect_stderr(io.StringIO()):
+                selected, objective, bound, stats = _threshold_set_cover(
+                    combos,
+                    j_subsets,
+                    t,
+                    args.workers,
+                    time_limit=args.time_limit,
+                    s=s,
+                    n=n,
+                    k=k,
+                    j=j,
+                    symmetry=mode,
+                )
+            elapsed = time.perf_counter() - start
+            result = {
+                "n": n,
+                "k": k,
+                "j": j,
+                "s": s,
+                "t": t,
+                "symmetry": mode,
+                "objective": objective,
+                "best_bound": bound,
+                "proven": objective == bound,
+                "model_build_time": round(stats["model_build_time"], 3),
+                "solve_time": round(stats["solve_time"], 3),
+                "time_s": round(elapsed, 3),
+            }
+            print(
+                f"n={n} k={k} j={j} s={s} t={t} {mode}: objective={objective:.0f} "
+                f"bound={bound:.0f} proven={result['proven']} "
+                f"solve={result['solve_time']}s total={result['time_s']}s"
+            )
+            results.append(result)
+
+    output_path = Path(args.output)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, "w", newline="", encoding="utf-8") as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=list(results[0].keys()))
+        writer.writeheader()
+        writer.writerows(results)
+    print(f"\nBenchmark results saved successfully to {output_path}")
+
+
+if __name__ == "__main__":
+    main()
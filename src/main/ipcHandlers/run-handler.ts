@@ -147,7 +147,8 @@ ipcMain.handle('run-algorithm', async (_event, params: AlgorithmParams): Promise
           const progressData: ProgressUpdate = {
             percent: data.percent,
             message: data.message,
-            elapsed_time: data.elapsed_time
+            elapsed_time: data.elapsed_time,
+            solution: data.solution
           };
           BrowserWindow.getAllWindows().forEach(window => {
             if (!window.isDestroyed()) {
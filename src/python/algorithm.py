@@ -27,7 +27,7 @@ import random
 import sys
 import time
 import warnings
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 import numpy as np
 from ortools.sat.python import cp_model  # High-performance 0-1 MIP
@@ -55,22 +55,272 @@ except ImportError:
     )
     unique_k_combos = None
 
+# Shared intersection-size coverage engine and colex subset ranks (required by every solver path)
+from solver.beam import beam_search
+from solver.cg_solver import ColumnGenerationSolver
+from solver.grasp import grasp_multi_start
+from solver.greedy import GREEDY_ENGINES
+from solver.lns import lns_improve
+from solver.local_search import swap_local_search
+from solver.lp_rounding import lp_rounding_cover
+from solver.lr_bound import LagrangianRelaxationBound
+from solver.presolve import presolve_cover
+from solver.symmetry import (
+    add_lex_leader,
+    column_permutations,
+    orbit_labels,
+    sample_generators,
+)
+from solver.tabu import tabu_set_cover
+from utils import colex
+from utils.coverage import (
+    CoverageIndex,
+    CoverageState,
+    build_coverage_index,
+    coverage_from_j_rows,
+    uncovered_j_indices,
+)
+from utils.deadline import Deadline
+
+# HiGHS MILP backend (needs scipy); backend="highs" is rejected without it
+try:
+    from solver.milp_solver import highs_set_cover
+except ImportError:
+    highs_set_cover = None
+
+# Solvers for the cover model; "tabu" is a heuristic for instances too large
+# for the exact ones
+BACKENDS = ("cpsat", "highs", "tabu")
+
 ########################
 #  Core Algorithm (Threshold Set Cover) #
 ########################
 
 
+def _greedy_warm_start(
+    index: CoverageIndex, t: int, hinted_k: Sequence[int] = ()
+) -> Tuple[List[int], bool]:
+    """Completes ``hinted_k`` (a bucket-greedy cover when empty and t = 1) to a t-cover.
+
+    j-subsets still covered fewer than ``t`` times get their lowest-index
+    covering combinations added, then redundant combinations are dropped.
+    Returns the selected k indices and whether every j-subset reaches ``t``.
+    """
+    if t == 1 and not len(hinted_k):
+        hinted_k, _ = GREEDY_ENGINES["bucket"](index)
+    state = CoverageState(index, t=t, selected_k=hinted_k)
+    for row in np.flatnonzero(state.counts < t).tolist():
+        for k_idx in index.covering(row).tolist():
+            if state.counts[row] >= t:
+                break
+            if not state.selected[k_idx]:
+                state.add(k_idx)
+    for k_idx in state.selected_indices().tolist():
+        if state.can_remove(k_idx):
+            state.remove(k_idx)
+    return state.selected_indices().tolist(), state.is_cover()
+
+
+# Shortest CP-SAT run given to a phase whose deadline has (almost) passed; the
+# hinted warm start is usually returned within it
+MIN_SOLVE_TIME = 0.1
+
+
+def _solve_time_limit(
+    time_limit: Optional[float], deadline: Optional[Deadline]
+) -> Optional[float]:
+    """CP-SAT time limit: ``time_limit`` capped by what is left of ``deadline``."""
+    if deadline is None:
+        return time_limit
+    return max(MIN_SOLVE_TIME, deadline.budget(cap=time_limit))
+
+
+def _new_cp_solver(time_limit: Optional[float], workers: int) -> cp_model.CpSolver:
+    """CP-SAT solver with the shared search parameters."""
+    solver = cp_model.CpSolver()
+
+    cp_sat_time_budget = time_limit or 25
+    p = solver.parameters
+    p.max_time_in_seconds = cp_sat_time_budget
+    # Ensure workers are set (passed parameter)
+    p.num_search_workers = workers if workers > 0 else 0  # Use passed value, 0 for auto
+    p.use_lns = True
+    p.linearization_level = 2
+    p.random_seed = 42
+    # Integer objective: stop as soon as the objective meets the lower bound
+    p.absolute_gap_limit = 0.99
+    print(
+        f"Solver: Setting time={cp_sat_time_budget}s, workers={p.num_search_workers}, use_lns={p.use_lns}, linearization={p.linearization_level}, seed={p.random_seed}",
+        file=sys.stderr,
+    )
+    return solver
+
+
+class _SolutionProgress(cp_model.CpSolverSolutionCallback):
+    """Streams every improving CP-SAT solution through report_progress.
+
+    Each solution is reported with its size, the current lower bound, the
+    relative gap and the solver wall time (also under the ``"solution"`` key
+    of the progress JSON). With ``gap_limit`` the search stops at the first
+    solution whose relative gap is at most that value. ``offset`` is added to
+    the objective and bound (combinations fixed by presolve).
+    """
+
+    def __init__(
+        self,
+        time_limit: float,
+        start_time: Optional[float] = None,
+        progress_callback=None,
+        gap_limit: Optional[float] = None,
+        offset: int = 0,
+    ):
+        super().__init__()
+        self.time_limit = time_limit
+        self.start_time = start_time
+        self.progress_callback = progress_callback
+        self.gap_limit = gap_limit
+        self.offset = offset
+        self.solutions = 0
+        self.first_solution_time: Optional[float] = None
+
+    def on_solution_callback(self):
+        objective = self.ObjectiveValue() + self.offset
+        bound = self.BestObjectiveBound() + self.offset
+        elapsed = self.WallTime()
+        gap = (objective - bound) / objective if objective > 0 else 0.0
+        self.solutions += 1
+        if self.first_solution_time is None:
+            self.first_solution_time = elapsed
+        report_progress(
+            10 + int(80 * min(1.0, elapsed / max(self.time_limit, 1e-9))),
+            f"Solution {self.solutions}: {objective:.0f} combinations, bound {bound:.0f}, gap {gap:.1%}",
+            self.start_time,
+            self.progress_callback,
+            solution={
+                "size": objective,
+                "bound": bound,
+                "gap": gap,
+                "elapsed": elapsed,
+            },
+        )
+        if self.gap_limit is not None and gap <= self.gap_limit:
+            print(
+                f"Gap {gap:.3f} <= {self.gap_limit}: stopping the search.",
+                file=sys.stderr,
+            )
+            self.StopSearch()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "solutions": self.solutions,
+            "first_solution_time": self.first_solution_time,
+        }
+
+
 def _threshold_set_cover(
-    combos: List[Tuple[int, ...]],
-    j_subsets: List[Tuple[int, ...]],
+    combos: np.ndarray,
+    j_subsets: np.ndarray,
     t: int,
     workers: int,
     time_limit: Optional[int] = None,
     progress_callback=None,
     start_time: Optional[float] = None,
     warm_start_hints: Optional[List[int]] = None,
-) -> Tuple[List[Tuple[int, ...]], float, float]:
-    """OR‑Tools CP‑SAT exactly minimise combinations under threshold t. Supports warm start with hints."""
+    s: Optional[int] = None,
+    *,
+    n: int,
+    k: int,
+    j: int,
+    presolve: bool = False,
+    symmetry: str = "lex",
+    column_perms: Optional[List[np.ndarray]] = None,
+    orbit_generators: Optional[List[np.ndarray]] = None,
+    gap_limit: Optional[float] = None,
+    deadline: Optional[Deadline] = None,
+    backend: str = "cpsat",
+    warm_upper_bound: bool = True,
+) -> Tuple[np.ndarray, float, float, Dict[str, float]]:
+    """OR‑Tools CP‑SAT exactly minimise combinations under threshold t. Supports warm start with hints.
+
+    ``combos`` and ``j_subsets`` are int32 colex ranks of k-combinations and
+    j-subsets over the sample index space 0..n-1; the selected combination
+    ranks are returned. A combination covers a j-subset when they share at
+    least ``s`` samples (``s`` defaults to j). The model is built from the
+    CSR rows of the coverage index; the last element of the result holds
+    the model build and solve wall times in seconds. With ``presolve`` (t = 1
+    only) the model is built over the instance left by
+    :func:`solver.presolve.presolve_cover`; fixed combinations are added back
+    to the selection and to the objective and bound, and the reduction counts
+    are returned under ``"presolve"``. ``symmetry="lex"`` adds lex-leader
+    constraints for the sample permutations in ``column_perms`` (column maps
+    from :func:`solver.symmetry.column_permutations`; derived from the cyclic
+    shift and adjacent transpositions when None), ``"none"`` adds nothing;
+    the permutations must map the given j-subsets onto themselves.
+    ``symmetry="orbit"`` solves the orbit model of :func:`_orbit_set_cover`
+    instead. Improving solutions are streamed through report_progress as they
+    are found; with ``gap_limit`` the search stops once the relative gap
+    (objective - bound) / objective is at most that value. The number of
+    solutions and the time to the first one are returned in the stats. With
+    ``deadline`` the solve gets what is left of it after the model build (at
+    most ``time_limit``); if it ends without a solution, the greedy warm-start
+    cover is returned with the solver's bound. With ``warm_upper_bound`` the
+    warm-start cover size also bounds sum(x) from above. ``backend="highs"`` solves the
+    same cover as a sparse MILP with HiGHS instead (:func:`_highs_set_cover`),
+    ``backend="tabu"`` shrinks the warm start by tabu search
+    (:func:`_tabu_set_cover`); the orbit model always uses CP-SAT.
+    """
+    if symmetry == "orbit":
+        return _orbit_set_cover(
+            combos,
+            j_subsets,
+            t,
+            workers,
+            time_limit,
+            progress_callback,
+            start_time,
+            s,
+            n=n,
+            k=k,
+            j=j,
+            generators=orbit_generators,
+            gap_limit=gap_limit,
+            deadline=deadline,
+        )
+    if backend == "highs":
+        return _highs_set_cover(
+            combos,
+            j_subsets,
+            t,
+            time_limit,
+            progress_callback,
+            start_time,
+            warm_start_hints,
+            s,
+            n=n,
+            k=k,
+            j=j,
+            presolve=presolve,
+            gap_limit=gap_limit,
+            deadline=deadline,
+        )
+    if backend == "tabu":
+        return _tabu_set_cover(
+            combos,
+            j_subsets,
+            t,
+            time_limit,
+            progress_callback,
+            start_time,
+            warm_start_hints,
+            s,
+            n=n,
+            k=k,
+            j=j,
+            presolve=presolve,
+            deadline=deadline,
+        )
+    if backend != "cpsat":
+        raise ValueError(f"Unknown backend '{backend}'. Choose from {BACKENDS}.")
     num_combos = len(combos)
     num_j_subsets = len(j_subsets)
     print(
@@ -85,28 +335,33 @@ def _threshold_set_cover(
         progress_callback,
     )
 
+    build_start = time.perf_counter()
     model = cp_model.CpModel()
-    x = [model.NewBoolVar(f"x_{i}") for i in range(num_combos)]
 
     # === Optimized Constraint Building for s == j ===
     # Check if k == j (required for the s=j=k fast path).
     # The calling context (select_optimal_samples) ensures s == j when this function is called via the s==j branch.
-    # s_size_check gets size j from j_subsets, len(combos[0]) gets size k.
-    s_size_check = len(j_subsets[0]) if num_j_subsets > 0 else 0  # Infer j size
-    k_size_check = len(combos[0]) if num_combos > 0 else 0  # Infer k size
+    # s_size_check is the j-subset size, k_size_check the k-combination size.
+    s_size_check = j if num_j_subsets > 0 else 0
+    k_size_check = k if num_combos > 0 else 0
     is_k_equal_j = (
         k_size_check == s_size_check
     ) and k_size_check > 0  # Check if k == j and valid sizes
 
-    j_to_cols: List[List[int]] = [[] for _ in range(num_j_subsets)]  # Pre-allocate list
-
     use_symmetry_breaking = True  # Enabled by default
 
+    # Coverage level: defaults to the j-subset size (the s == j caller)
+    s_size = s if s is not None else s_size_check
+    # Build the sparse coverage index once with the shared intersection-size engine
+    coverage = build_coverage_index(
+        colex.masks(combos, n, k), colex.masks(j_subsets, n, j), s_size, n
+    )
+
     # Fast path only applies if k=j=s and t=1
-    if is_k_equal_j and t == 1:
+    if is_k_equal_j and s_size == s_size_check and t == 1:
         # --- Fast path for k=j=s, t=1 ---
-        # A k-combo 'kc' covers a j-subset 'js' iff kc == js.
-        # Constraint: For each j_subset 'js', sum(x_i for k_combos[i] == js) >= 1
+        # A k-combo 'kc' covers a j-subset 'js' iff kc == js, so each CSR row
+        # holds at most the equal combo.
         print("Using optimized constraint building for s=j, t=1", file=sys.stderr)
         report_progress(
             1,
@@ -114,140 +369,116 @@ def _threshold_set_cover(
             start_time,
             progress_callback,
         )
-        # Map each j_subset to its index
-        j_subset_to_index: Dict[Tuple[int, ...], int] = {
-            js: idx for idx, js in enumerate(j_subsets)
-        }
-        # Map k_combos that *are* j_subsets to the corresponding j_subset index
-        for k_idx, kc in enumerate(combos):
-            j_idx = j_subset_to_index.get(kc)
-            if j_idx is not None:
-                # Add the variable index 'k_idx' to the constraint list for j_subset 'j_idx'
-                j_to_cols[j_idx].append(k_idx)
-
-        # Add constraints: each j_subset must be covered by at least one selected k_combo (which must equal it)
-        constraints_added = 0
-        for j_idx, covering_k_indices in enumerate(j_to_cols):
-            # ---->Add a print statement here<----
-            print(
-                f"DEBUG: Checking j_idx={j_idx}, js={j_subsets[j_idx]}, covering_indices={covering_k_indices}",
-                file=sys.stderr,
-            )
-            if not covering_k_indices:
-                # This j_subset cannot be covered by any of the provided k_combos in this round
-                print(
-                    f"Warning: j_subset {j_subsets[j_idx]} (index {j_idx}) cannot be covered by any k_combo in this round's input.",
-                    file=sys.stderr,
-                )
-                # Raise error or allow solver to determine infeasibility? Let solver handle it.
-                # Add a constraint that is always false to force infeasibility if needed, but sum >= 1 is fine.
-                model.Add(
-                    sum(x[i] for i in covering_k_indices) >= t
-                )  # Will be Add(0 >= 1) -> infeasible
-            else:
-                model.Add(sum(x[i] for i in covering_k_indices) >= t)
-                constraints_added += 1
-        if constraints_added < num_j_subsets:
-            print(
-                f"Warning: Only {constraints_added}/{num_j_subsets} j_subsets have potential covering k_combos.",
-                file=sys.stderr,
-            )
-        print(
-            f"Finished optimized constraint building (s=j, t=1). Added {constraints_added} constraints.",
-            file=sys.stderr,
-        )
         use_symmetry_breaking = (
-            False  # <--- Disable symmetry breaking when s = j and t = 1!
+            False  # <--- Disable symmetry breaking when s = j and t = 1!
         )
         print(
             "Disabling symmetry breaking constraints for s=j, t=1 case.",
             file=sys.stderr,
         )
     else:
-        # --- Original generic path (s < j or t > 1) ---
-        # This path will still be slow for large inputs if s is close to j.
+        # --- Generic path (s < j or t > 1) ---
+        # Coverage comes from intersection sizes, so no s-subset sets are built.
         print("Using generic constraint building (s<j or t>1 or s!=j)", file=sys.stderr)
         report_progress(1, "构建通用约束 (s!=j or t>1)...", start_time, progress_callback)
-        s_size = len(j_subsets[0]) if j_subsets else 0  # Get s size from j_subsets
-        # Precompute combo_sets only once
-        combo_s_sets = [set(itertools.combinations(c, s_size)) for c in combos]
-        constraints_added = 0
-        for j_idx, js in enumerate(j_subsets):
-            needs = []
-            st_js = set(itertools.combinations(js, s_size))
-            for k_idx, covered_s_set in enumerate(combo_s_sets):
-                if not covered_s_set.isdisjoint(st_js):
-                    needs.append(k_idx)
-            if not needs:
-                # Allow solver to determine infeasibility
-                print(
-                    f"Warning: j_subset {js} (index {j_idx}) cannot be covered by any k_combo.",
-                    file=sys.stderr,
-                )
-            j_to_cols[j_idx] = needs  # Store indices for this j_subset
-            model.Add(sum(x[i] for i in needs) >= t)
-            constraints_added += 1
+
+    uncoverable = np.flatnonzero(coverage.j_degrees() == 0)
+    for j_idx in uncoverable.tolist():
+        # Allow solver to determine infeasibility (empty row: 0 >= t)
         print(
-            f"Finished generic constraint building. Added {constraints_added} constraints.",
+            f"Warning: j_subset {j_subsets[j_idx]} (index {j_idx}) cannot be covered by any k_combo.",
             file=sys.stderr,
         )
 
-    # --- Rest of the function remains the same ---
-
-    # Objective: minimize the number of selected k‑combinations
-    model.Minimize(sum(x))
-
-    # Symmetry-breaking constraints (Symmetry Breaking)
-    if use_symmetry_breaking:  # <--- Add only when necessary
-        for i in range(1, len(x)):
-            model.Add(x[i - 1] >= x[i])
-        print("Added symmetry breaking constraints.", file=sys.stderr)
-    # else: (No need to print; the disable message has already been printed above)
-
-    # Set solver parameters
-    solver = cp_model.CpSolver()
-
-    cp_sat_time_budget = time_limit or 25
-    p = solver.parameters
-    p.max_time_in_seconds = cp_sat_time_budget
-    # Ensure workers are set (passed parameter)
-    p.num_search_workers = workers if workers > 0 else 0  # Use passed value, 0 for auto
-    p.use_lns = True
-    p.linearization_level = 2
-    p.random_seed = 42
+    # Presolve drops uncoverable rows, so it is only used when the instance is
+    # feasible; with t > 1 forced/dominance reductions do not apply as stated
+    pre = None
+    model_index = coverage
+    if presolve and t == 1 and not uncoverable.size:
+        pre = presolve_cover(coverage)
+        model_index = pre.reduced_index()
+    elif presolve:
+        print(
+            "Presolve skipped (needs t = 1 and a coverable instance).", file=sys.stderr
+        )
+    active_k = pre.active_k if pre else np.arange(num_combos)
+    num_fixed = len(pre.fixed_k) if pre else 0
+    x = [model.NewBoolVar(f"x_{i}") for i in active_k.tolist()]
+
+    # One constraint per CSR row of the j->k index: a clause for t = 1, a flat
+    # LinearExpr.Sum otherwise (no nested Python `sum` expression trees)
+    j_indptr = model_index.j_indptr.tolist()
+    j_indices = model_index.j_indices.tolist()
+    for j_idx in range(model_index.num_j):
+        row = [x[i] for i in j_indices[j_indptr[j_idx] : j_indptr[j_idx + 1]]]
+        if t == 1:
+            model.AddBoolOr(row)
+        else:
+            model.Add(cp_model.LinearExpr.Sum(row) >= t)
     print(
-        f"Solver: Setting time={cp_sat_time_budget}s, workers={p.num_search_workers}, use_lns={p.use_lns}, linearization={p.linearization_level}, seed={p.random_seed}",
+        f"Finished constraint building. Added {model_index.num_j} constraints "
+        f"({model_index.nnz} nonzeros, {uncoverable.size} uncoverable j-subsets).",
         file=sys.stderr,
     )
 
-    # === Warm-start ===
-    if warm_start_hints:
-        hints_applied = 0
-        if len(warm_start_hints) != len(x):
+    # --- Rest of the function remains the same ---
+
+    # Objective: minimize the number of selected k‑combinations
+    model.Minimize(cp_model.LinearExpr.Sum(x))
+
+    # Symmetry breaking: lex-leader constraints from sample permutations that
+    # map the instance onto itself. They are only valid on the full column
+    # set, so they are skipped when presolve fixed or dropped columns.
+    if symmetry not in ("none", "lex", "orbit"):
+        raise ValueError(f"Unknown symmetry mode '{symmetry}'")
+    if use_symmetry_breaking and symmetry != "none":
+        if pre and pre.stats["eliminated_columns"]:
             print(
-                f"Warning: warm_start_hints length ({len(warm_start_hints)}) != number of variables ({len(x)}). Skipping hints.",
+                "Symmetry constraints skipped: presolve eliminated columns.",
                 file=sys.stderr,
             )
         else:
-            num_hints = sum(1 for h in warm_start_hints if h)
+            if column_perms is None:
+                column_perms = column_permutations(
+                    combos, j_subsets, n, k, j, sample_generators(n)
+                )
+            add_lex_leader(model, x, column_perms)
+
+    # === Warm-start ===
+    # The given hints (or a greedy cover when there are none) are completed
+    # to a full cover of the model, hinted on every variable, and its size
+    # bounds sum(x) from above so the search starts at a feasible objective.
+    hinted_k: List[int] = []
+    if warm_start_hints:
+        if len(warm_start_hints) != num_combos:
             print(
-                f"Applying {num_hints} non-zero hints from warm_start_hints list...",
+                f"Warning: warm_start_hints length ({len(warm_start_hints)}) != number of combinations ({num_combos}). Ignoring hints.",
                 file=sys.stderr,
             )
-            if num_hints > 0:  # Only add hints if there are any non-zero ones
-                for i, hint in enumerate(warm_start_hints):
-                    if hint:
-                        model.AddHint(x[i], 1)
-                        hints_applied += 1
-                print(f"Applied {hints_applied} hints to the model.", file=sys.stderr)
-            else:
-                print(
-                    "Warm start hints list contained all zeros, no hints applied.",
-                    file=sys.stderr,
-                )
+        else:
+            # Hints are given per combination; map them onto the model variables
+            hinted_k = [
+                pos for pos, i in enumerate(active_k.tolist()) if warm_start_hints[i]
+            ]
+    warm_k, warm_is_cover = _greedy_warm_start(model_index, t, hinted_k)
+    warm_mask = np.zeros(len(x), dtype=bool)
+    warm_mask[warm_k] = True
+    for var, hint in zip(x, warm_mask.tolist()):
+        model.AddHint(var, int(hint))
+    print(
+        f"Warm start: {len(hinted_k)} hinted combinations completed to "
+        f"{len(warm_k)} ({'full cover' if warm_is_cover else 'partial cover'}), hinted on all {len(x)} variables.",
+        file=sys.stderr,
+    )
+    if warm_is_cover and warm_upper_bound:
+        model.Add(cp_model.LinearExpr.Sum(x) <= len(warm_k))
+        print(f"Objective upper bound: sum(x) <= {len(warm_k)}", file=sys.stderr)
 
-    else:
-        print("No warm start hints provided.", file=sys.stderr)
+    # Set solver parameters; the build time counts against the deadline
+    solver = _new_cp_solver(_solve_time_limit(time_limit, deadline), workers)
+
+    model_build_time = time.perf_counter() - build_start
+    print(f"Model build time: {model_build_time:.3f} s", file=sys.stderr)
 
     # Solve
     print(f"Solver: Starting solve...", file=sys.stderr)
@@ -258,7 +489,14 @@ def _threshold_set_cover(
         start_time,
         progress_callback,
     )
-    status = solver.Solve(model)
+    solution_progress = _SolutionProgress(
+        solver.parameters.max_time_in_seconds,
+        start_time,
+        progress_callback,
+        gap_limit,
+        offset=num_fixed,
+    )
+    status = solver.Solve(model, solution_progress)
 
     solver_time = solver.WallTime()
     print(f"Solver wall time: {solver_time:.3f} s", file=sys.stderr)
@@ -270,7 +508,14 @@ def _threshold_set_cover(
     response_stats = solver.ResponseStats()
     print(f"Solver Response Stats:\n{response_stats}", file=sys.stderr)
 
-    if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+    if status == cp_model.UNKNOWN and warm_is_cover:
+        # Out of time before the first solution: the warm start is the best so far
+        print(
+            "No solution within the time limit; returning the warm-start cover.",
+            file=sys.stderr,
+        )
+        selected_values = warm_mask.astype(int).tolist()
+    elif status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
         status_name = solver.StatusName(status)
         error_message = f"Solve failed or timed out. Status: {status_name} ({status})"
         print(f"Error: {error_message}", file=sys.stderr)
@@ -278,14 +523,13 @@ def _threshold_set_cover(
         if status == cp_model.INFEASIBLE:
             error_message += ".  Possible cause: some j-subsets cannot be covered by any of the provided k-combinations (see earlier warnings)."
         raise RuntimeError(error_message)
-
-    selected = []
-    selected_values = []  # Store solver.Value results
-    for i, var in enumerate(x):
-        val = solver.Value(var)
-        selected_values.append(val)  # Record each variable's value
-        if val:  # or if val > 0.5 for safety with potential floating point issues
-            selected.append(combos[i])
+    else:
+        selected_values = [solver.Value(var) for var in x]  # Store solver.Value results
+    if pre:
+        selected_k = np.sort(pre.expand(np.flatnonzero(selected_values)))
+    else:
+        selected_k = np.flatnonzero(selected_values)
+    selected = combos[selected_k]  # Selected combination ranks
 
     # ----> Add print<----
     print(
@@ -300,13 +544,531 @@ def _threshold_set_cover(
     print(f"DEBUG: First 20 solver values: {selected_values[:20]}", file=sys.stderr)
     # ----> End print <----
 
-    objective_value = solver.ObjectiveValue()
-    best_bound = solver.BestObjectiveBound()
+    objective_value = float(num_selected + num_fixed)
+    best_bound = max(0.0, solver.BestObjectiveBound()) + num_fixed
     print(
         f"Solver finished. Status: {solver.StatusName(status)}, Objective: {objective_value:.1f}, BestBound: {best_bound:.1f}",
         file=sys.stderr,
     )
-    return selected, objective_value, best_bound
+    solve_stats = {
+        "model_build_time": model_build_time,
+        "solve_time": solver_time,
+        **solution_progress.stats(),
+    }
+    if pre:
+        solve_stats["presolve"] = pre.stats
+    return selected, objective_value, best_bound, solve_stats
+
+
+def _orbit_set_cover(
+    combos: np.ndarray,
+    j_subsets: np.ndarray,
+    t: int,
+    workers: int,
+    time_limit: Optional[float] = None,
+    progress_callback=None,
+    start_time: Optional[float] = None,
+    s: Optional[int] = None,
+    *,
+    n: int,
+    k: int,
+    j: int,
+    generators: Optional[List[np.ndarray]] = None,
+    gap_limit: Optional[float] = None,
+    deadline: Optional[Deadline] = None,
+) -> Tuple[np.ndarray, float, float, Dict[str, Any]]:
+    """CP-SAT over the covers that are invariant under a group of sample permutations.
+
+    The group is generated by ``generators`` (default: the cyclic shift of
+    the samples, Z_n) and must map ``combos`` and ``j_subsets`` onto
+    themselves. The model has one Boolean per orbit of k-combinations,
+    weighted by the orbit size, and one constraint per orbit of j-subsets
+    (on its smallest member; an invariant selection covers the whole orbit
+    if it covers one member). The selected orbits are expanded to
+    combination ranks and verified against every j-subset. Invariant covers
+    can be larger than the optimum, so the returned bound is 0; the orbit
+    model's own bound is reported in the stats under ``"orbit"``; solutions
+    are streamed and ``gap_limit`` applies to that bound.
+    """
+    s_size = s if s is not None else j
+    build_start = time.perf_counter()
+    report_progress(
+        1, "Building orbit model (CP-SAT)...", start_time, progress_callback
+    )
+    if generators is None:
+        generators = sample_generators(n, ("cyclic",))
+    col_maps = column_permutations(combos, j_subsets, n, k, j, generators)
+    row_maps = column_permutations(j_subsets, j_subsets, n, j, j, generators)
+    if len(col_maps) != len(generators) or len(row_maps) != len(generators):
+        raise ValueError(
+            "Orbit mode needs combinations and j-subsets invariant under the group."
+        )
+    col_orbit = orbit_labels(col_maps, len(combos))
+    row_orbit = orbit_labels(row_maps, len(j_subsets))
+    num_orbits = int(col_orbit.max()) + 1 if col_orbit.size else 0
+    orbit_sizes = np.bincount(col_orbit, minlength=num_orbits)
+    _, rep_rows = np.unique(row_orbit, return_index=True)
+    num_rows = rep_rows.size
+
+    # Covering columns of the representative rows; with the roles swapped the
+    # enumeration starts from the few representatives instead of every column
+    rows = build_coverage_index(
+        colex.masks(j_subsets[rep_rows], n, j), colex.masks(combos, n, k), s_size, n
+    )
+    keys = (
+        np.repeat(np.arange(num_rows, dtype=np.int64), np.diff(rows.k_indptr))
+        * num_orbits
+        + col_orbit[rows.k_indices]
+    )
+    keys, multiplicity = np.unique(keys, return_counts=True)
+    row_of, orbit_of = np.divmod(keys, num_orbits)
+    indptr = np.zeros(num_rows + 1, dtype=np.int64)
+    np.cumsum(np.bincount(row_of, minlength=num_rows), out=indptr[1:])
+    print(
+        f"Orbit model: {len(combos)} k-combinations in {num_orbits} orbits, "
+        f"{len(j_subsets)} j-subsets in {num_rows} orbits.",
+        file=sys.stderr,
+    )
+
+    model = cp_model.CpModel()
+    y = [model.NewBoolVar(f"y_{o}") for o in range(num_orbits)]
+    bounds = indptr.tolist()
+    orbit_list = orbit_of.tolist()
+    mult_list = multiplicity.tolist()
+    for r in range(num_rows):
+        row = [y[o] for o in orbit_list[bounds[r] : bounds[r + 1]]]
+        if t == 1:
+            model.AddBoolOr(row)
+        else:
+            # Every member of an orbit covering r is a distinct combination
+            model.Add(
+                cp_model.LinearExpr.WeightedSum(
+                    row, mult_list[bounds[r] : bounds[r + 1]]
+                )
+                >= t
+            )
+    objective = cp_model.LinearExpr.WeightedSum(y, orbit_sizes.tolist())
+    model.Minimize(objective)
+
+    if t == 1:
+        # Greedy cover of the orbit instance as hint and upper bound
+        orbit_index = coverage_from_j_rows(indptr, orbit_of, num_orbits)
+        warm_k, warm_is_cover = _greedy_warm_start(orbit_index, 1)
+        warm_mask = np.zeros(num_orbits, dtype=bool)
+        warm_mask[warm_k] = True
+        for var, hint in zip(y, warm_mask.tolist()):
+            model.AddHint(var, int(hint))
+        if warm_is_cover:
+            model.Add(objective <= int(orbit_sizes[warm_k].sum()))
+
+    solver = _new_cp_solver(_solve_time_limit(time_limit, deadline), workers)
+    model_build_time = time.perf_counter() - build_start
+    print(f"Model build time: {model_build_time:.3f} s", file=sys.stderr)
+    report_progress(10, "Orbit model built, solving...", start_time, progress_callback)
+    solution_progress = _SolutionProgress(
+        solver.parameters.max_time_in_seconds, start_time, progress_callback, gap_limit
+    )
+    status = solver.Solve(model, solution_progress)
+    solver_time = solver.WallTime()
+    if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+        raise RuntimeError(
+            f"Orbit solve failed or timed out. Status: {solver.StatusName(status)} ({status})"
+        )
+
+    chosen = np.array([solver.Value(var) for var in y], dtype=bool)
+    selected = combos[np.flatnonzero(chosen[col_orbit])]
+    missing = uncovered_j_indices(
+        colex.masks(selected, n, k), colex.masks(j_subsets, n, j), s_size, t
+    )
+    if missing.size:
+        raise RuntimeError(f"Orbit cover misses {missing.size} j-subsets.")
+    orbit_stats = {
+        "column_orbits": num_orbits,
+        "row_orbits": int(num_rows),
+        "objective": solver.ObjectiveValue(),
+        "bound": solver.BestObjectiveBound(),
+    }
+    print(
+        f"Orbit solve finished. Status: {solver.StatusName(status)}, "
+        f"{int(chosen.sum())} orbits -> {len(selected)} combinations (verified), "
+        f"orbit bound {orbit_stats['bound']:.1f}.",
+        file=sys.stderr,
+    )
+    solve_stats = {
+        "model_build_time": model_build_time,
+        "solve_time": solver_time,
+        **solution_progress.stats(),
+        "orbit": orbit_stats,
+    }
+    return selected, float(len(selected)), 0.0, solve_stats
+
+
+def _highs_set_cover(
+    combos: np.ndarray,
+    j_subsets: np.ndarray,
+    t: int,
+    time_limit: Optional[float] = None,
+    progress_callback=None,
+    start_time: Optional[float] = None,
+    warm_start_hints: Optional[List[int]] = None,
+    s: Optional[int] = None,
+    *,
+    n: int,
+    k: int,
+    j: int,
+    presolve: bool = False,
+    gap_limit: Optional[float] = None,
+    deadline: Optional[Deadline] = None,
+) -> Tuple[np.ndarray, float, float, Dict[str, Any]]:
+    """The ``backend="highs"`` path of :func:`_threshold_set_cover`.
+
+    Takes the same instance, presolve, warm start and deadline and returns
+    the same tuple, but solves the cover as a sparse MILP with HiGHS
+    (:func:`solver.milp_solver.highs_set_cover`). The warm-start cover is
+    returned when HiGHS finds no smaller cover in time. No
+    lex-leader constraints are added: HiGHS detects the symmetry itself.
+    The HiGHS status and node count are returned under ``"highs"``.
+    """
+    if highs_set_cover is None:
+        raise ValueError("backend='highs' needs scipy (scipy.optimize.milp)")
+    print(
+        f"Running _highs_set_cover with {len(combos)} k-combinations, {len(j_subsets)} j-subsets, t={t}",
+        file=sys.stderr,
+    )
+    report_progress(
+        0, "Initializing solver model (HiGHS)...", start_time, progress_callback
+    )
+
+    build_start = time.perf_counter()
+    s_size = s if s is not None else j
+    coverage = build_coverage_index(
+        colex.masks(combos, n, k), colex.masks(j_subsets, n, j), s_size, n
+    )
+    uncoverable = np.flatnonzero(coverage.j_degrees() < t)
+    if uncoverable.size:
+        raise RuntimeError(
+            f"Solve failed. Status: INFEASIBLE. {uncoverable.size} j-subsets are "
+            f"covered by fewer than t={t} of the provided k-combinations."
+        )
+    pre = presolve_cover(coverage) if presolve and t == 1 else None
+    model_index = pre.reduced_index() if pre else coverage
+    active_k = pre.active_k if pre else np.arange(len(combos))
+    num_fixed = len(pre.fixed_k) if pre else 0
+
+    hinted_k: List[int] = []
+    if warm_start_hints and len(warm_start_hints) == len(combos):
+        hinted_k = [
+            pos for pos, i in enumerate(active_k.tolist()) if warm_start_hints[i]
+        ]
+    warm_k, warm_is_cover = _greedy_warm_start(model_index, t, hinted_k)
+    model_build_time = time.perf_counter() - build_start
+
+    report_progress(
+        10, "Model built, starting solve (HiGHS)...", start_time, progress_callback
+    )
+    chosen, bound, highs_stats = highs_set_cover(
+        model_index,
+        t,
+        time_limit=_solve_time_limit(time_limit, deadline),
+        gap_limit=gap_limit,
+    )
+    found = chosen is not None
+    if not found or (warm_is_cover and len(warm_k) < chosen.size):
+        if not warm_is_cover:
+            raise RuntimeError(
+                f"Solve failed or timed out. Status: {highs_stats['status']}"
+            )
+        print(
+            "No smaller HiGHS solution within the time limit; returning the warm-start cover.",
+            file=sys.stderr,
+        )
+        chosen = np.asarray(warm_k, dtype=np.int64)
+    if pre:
+        selected_k = np.sort(pre.expand(chosen))
+    else:
+        selected_k = np.sort(chosen)
+    selected = combos[selected_k]
+
+    objective_value = float(len(selected))
+    best_bound = bound + num_fixed
+    elapsed = time.perf_counter() - start_time if start_time is not None else 0.0
+    gap = (objective_value - best_bound) / objective_value if objective_value else 0.0
+    report_progress(
+        90,
+        f"HiGHS {highs_stats['status']}: {len(selected)} combinations, bound {best_bound:.0f}, gap {100 * gap:.1f}%",
+        start_time,
+        progress_callback,
+        solution={
+            "size": len(selected),
+            "bound": best_bound,
+            "gap": round(gap, 4),
+            "elapsed": round(elapsed, 3),
+        },
+    )
+    solve_stats = {
+        "model_build_time": model_build_time,
+        "solve_time": highs_stats["solve_time"],
+        "solutions": int(found),
+        "first_solution_time": None,
+        "highs": highs_stats,
+    }
+    if pre:
+        solve_stats["presolve"] = pre.stats
+    return selected, objective_value, best_bound, solve_stats
+
+
+# Share of the tabu backend's time spent on the Lagrangian lower bound
+TABU_BOUND_SHARE = 0.2
+
+
+def _tabu_set_cover(
+    combos: np.ndarray,
+    j_subsets: np.ndarray,
+    t: int,
+    time_limit: Optional[float] = None,
+    progress_callback=None,
+    start_time: Optional[float] = None,
+    warm_start_hints: Optional[List[int]] = None,
+    s: Optional[int] = None,
+    *,
+    n: int,
+    k: int,
+    j: int,
+    presolve: bool = False,
+    deadline: Optional[Deadline] = None,
+) -> Tuple[np.ndarray, float, float, Dict[str, Any]]:
+    """The ``backend="tabu"`` path of :func:`_threshold_set_cover`.
+
+    Takes the same instance, presolve, warm start and deadline and returns
+    the same tuple, but shrinks the warm-start cover with
+    :func:`solver.tabu.tabu_set_cover` for the whole time limit instead of
+    solving a model. The bound is the better of the counting bound
+    ceil(t * #j-subsets / largest column degree) and a Lagrangian bound
+    (solver.lr_bound) computed in the first ``TABU_BOUND_SHARE`` of the time
+    limit; the search statistics are returned under ``"tabu"``.
+    """
+    print(
+        f"Running _tabu_set_cover with {len(combos)} k-combinations, {len(j_subsets)} j-subsets, t={t}",
+        file=sys.stderr,
+    )
+    report_progress(0, "Initializing tabu search...", start_time, progress_callback)
+
+    build_start = time.perf_counter()
+    s_size = s if s is not None else j
+    coverage = build_coverage_index(
+        colex.masks(combos, n, k), colex.masks(j_subsets, n, j), s_size, n
+    )
+    uncoverable = np.flatnonzero(coverage.j_degrees() < t)
+    if uncoverable.size:
+        raise RuntimeError(
+            f"Solve failed. Status: INFEASIBLE. {uncoverable.size} j-subsets are "
+            f"covered by fewer than t={t} of the provided k-combinations."
+        )
+    pre = presolve_cover(coverage) if presolve and t == 1 else None
+    model_index = pre.reduced_index() if pre else coverage
+    active_k = pre.active_k if pre else np.arange(len(combos))
+    num_fixed = len(pre.fixed_k) if pre else 0
+
+    hinted_k: List[int] = []
+    if warm_start_hints and len(warm_start_hints) == len(combos):
+        hinted_k = [
+            pos for pos, i in enumerate(active_k.tolist()) if warm_start_hints[i]
+        ]
+    warm_k, _ = _greedy_warm_start(model_index, t, hinted_k)
+    bound = 0.0
+    if model_index.num_j:
+        bound = float(math.ceil(t * model_index.num_j / model_index.k_degrees().max()))
+    model_build_time = time.perf_counter() - build_start
+
+    tabu_deadline = Deadline(_solve_time_limit(time_limit, deadline) or 25)
+    if bound < len(warm_k):
+        report_progress(
+            5, "Computing Lagrangian lower bound...", start_time, progress_callback
+        )
+        lagrangian_bound = LagrangianRelaxationBound(
+            model_index, t=t, upper_bound=len(warm_k)
+        ).calculate_lower_bound(time_limit=tabu_deadline.budget(TABU_BOUND_SHARE))
+        bound = max(bound, lagrangian_bound)
+
+    report_progress(
+        10, "Warm start built, starting tabu search...", start_time, progress_callback
+    )
+    chosen, tabu_stats = tabu_set_cover(
+        model_index, warm_k, t, deadline=tabu_deadline, seed=42, target=int(bound)
+    )
+    if pre:
+        selected_k = np.sort(pre.expand(chosen))
+    else:
+        selected_k = np.sort(np.asarray(chosen, dtype=np.int64))
+    selected = combos[selected_k]
+
+    objective_value = float(len(selected))
+    best_bound = bound + num_fixed
+    elapsed = time.perf_counter() - start_time if start_time is not None else 0.0
+    gap = (objective_value - best_bound) / objective_value if objective_value else 0.0
+    report_progress(
+        90,
+        f"Tabu search: {len(selected)} combinations ({tabu_stats['iterations']} iterations), bound {best_bound:.0f}",
+        start_time,
+        progress_callback,
+        solution={
+            "size": len(selected),
+            "bound": best_bound,
+            "gap": round(gap, 4),
+            "elapsed": round(elapsed, 3),
+        },
+    )
+    solve_stats = {
+        "model_build_time": model_build_time,
+        "solve_time": time.perf_counter() - build_start - model_build_time,
+        "solutions": len(tabu_stats["size_times"]) + 1,
+        "first_solution_time": 0.0,
+        "tabu": tabu_stats,
+    }
+    if pre:
+        solve_stats["presolve"] = pre.stats
+    return selected, objective_value, best_bound, solve_stats
+
+
+def _threshold_set_cover_lazy(
+    combos: np.ndarray,
+    j_subsets: np.ndarray,
+    t: int,
+    workers: int,
+    time_limit: float,
+    start_time: Optional[float] = None,
+    warm_start_hints: Optional[List[int]] = None,
+    s: Optional[int] = None,
+    *,
+    n: int,
+    k: int,
+    j: int,
+    seed_size: int,
+    rng: random.Random,
+    max_cut_rounds: int = 50,
+    presolve: bool = False,
+    symmetry: str = "lex",
+    progress_callback=None,
+    gap_limit: Optional[float] = None,
+    deadline: Optional[Deadline] = None,
+    backend: str = "cpsat",
+) -> Tuple[np.ndarray, float, float, Dict[str, float]]:
+    """Cutting-plane wrapper around :func:`_threshold_set_cover` for many j-subsets.
+
+    Solves with a random seed set of ``seed_size`` j-subset constraints,
+    checks the solution against every j-subset with the vectorized
+    intersection-size checker, adds the violated j-subsets and re-solves
+    (hinted with the previous solution) until the cover is valid. If the
+    time limit or round limit is reached first, the cover is repaired by
+    adding covering combinations for the remaining violations, so the
+    returned selection always covers every coverable j-subset. The bound
+    comes from a relaxation and so stays a valid lower bound. ``presolve`` is
+    applied to each round's model; the last round's reduction counts are
+    returned under ``"presolve"``. Symmetries are detected once on the full
+    instance, but a random subset of rows is not invariant under them, so
+    lex-leader constraints and the warm-start upper bound are only added
+    once every j-subset is active; the relaxed rounds solve without them.
+    Every round streams its solutions to ``progress_callback`` and stops at
+    ``gap_limit``. All rounds share one deadline, ``time_limit`` seconds from
+    the call unless ``deadline`` is given, and use the solver ``backend``.
+    """
+    s_size = s if s is not None else j
+    if deadline is None:
+        deadline = Deadline(time_limit)
+    combo_masks = colex.masks(combos, n, k)
+    j_masks = colex.masks(j_subsets, n, j)
+
+    active = np.zeros(len(j_subsets), dtype=bool)
+    if len(j_subsets) > seed_size:
+        active[rng.sample(range(len(j_subsets)), seed_size)] = True
+    else:
+        active[:] = True
+    hints = warm_start_hints
+    column_perms = (
+        column_permutations(combos, j_subsets, n, k, j, sample_generators(n))
+        if symmetry != "none" and backend == "cpsat"
+        else []
+    )
+    totals = {"model_build_time": 0.0, "solve_time": 0.0, "cut_rounds": 0}
+
+    for cut_round in range(1, max_cut_rounds + 1):
+        if deadline.remaining() < 1 and cut_round > 1:
+            break
+        all_rows = bool(active.all())
+        try:
+            selected, objective_value, best_bound, stats = _threshold_set_cover(
+                combos=combos,
+                j_subsets=j_subsets[active],
+                t=t,
+                workers=workers,
+                progress_callback=progress_callback,
+                start_time=start_time,
+                warm_start_hints=hints,
+                s=s,
+                n=n,
+                k=k,
+                j=j,
+                presolve=presolve,
+                symmetry="none" if symmetry == "lex" and not all_rows else symmetry,
+                column_perms=column_perms,
+                gap_limit=gap_limit,
+                deadline=deadline,
+                backend=backend,
+                warm_upper_bound=all_rows,
+            )
+        except RuntimeError as e:
+            if cut_round == 1:
+                raise
+            # Keep the previous solution and repair it below
+            print(f"Cutting planes round {cut_round} failed: {e}", file=sys.stderr)
+            break
+        totals["model_build_time"] += stats["model_build_time"]
+        totals["solve_time"] += stats["solve_time"]
+        totals["solutions"] = totals.get("solutions", 0) + stats["solutions"]
+        if totals.get("first_solution_time") is None:
+            totals["first_solution_time"] = stats["first_solution_time"]
+        totals["cut_rounds"] = cut_round
+        if "presolve" in stats:
+            totals["presolve"] = stats["presolve"]
+
+        # Sparse check: cost follows the selection's coverage, not |J| x |selection|
+        violated = np.flatnonzero(
+            build_coverage_index(
+                colex.masks(selected, n, k), j_masks, s_size, n
+            ).j_degrees()
+            < t
+        )
+        print(
+            f"Cutting planes round {cut_round}: {int(active.sum())} active constraints, "
+            f"{violated.size} violated j-subsets.",
+            file=sys.stderr,
+        )
+        if not violated.size:
+            break
+        active[violated] = True
+        hints = np.isin(combos, selected).astype(int).tolist()
+
+    if violated.size:
+        # Out of time: add covering combinations for the remaining violations
+        print(
+            f"Cutting planes stopped with {violated.size} violated j-subsets; repairing greedily.",
+            file=sys.stderr,
+        )
+        repair = build_coverage_index(combo_masks, j_masks[violated], s_size, n)
+        state = CoverageState(
+            repair, t=t, selected_k=np.flatnonzero(np.isin(combos, selected))
+        )
+        for row in range(repair.num_j):
+            for k_idx in repair.covering(row).tolist():
+                if state.counts[row] >= t:
+                    break
+                if not state.selected[k_idx]:
+                    state.add(k_idx)
+        selected = combos[state.selected_indices()]
+        objective_value = float(len(selected))
+
+    totals["active_constraints"] = int(active.sum())
+    return selected, objective_value, best_bound, totals
 
 
 # Import bitmask utility
@@ -320,20 +1082,121 @@ except ImportError:
     generate_masks = None
 
 
+# Share of the time left after the s < j construction held back for tabu search
+TABU_SHARE = 0.5
+# Seconds per coverage-matrix nonzero of the bucket greedy engine (measured
+# 4e-8 to 1.2e-7). When the deadline leaves less than this estimate, the s < j
+# path runs stochastic greedy with FALLBACK_EPSILON instead.
+GREEDY_SECONDS_PER_NNZ = 1.2e-7
+FALLBACK_EPSILON = 0.5
+# Covering combinations scored per pick by _complete_cover
+COMPLETION_SAMPLE = 64
+
+
+def _complete_cover(
+    index: CoverageIndex,
+    selected_k: Sequence[int],
+    seed: Optional[int] = None,
+    sample_size: int = COMPLETION_SAMPLE,
+) -> List[int]:
+    """Completes a partial selection cheaply (t = 1).
+
+    Walks the uncovered j-subsets in index order; for each one still
+    uncovered, scores up to ``sample_size`` random combinations covering it
+    by how many uncovered j-subsets they cover and adds the best. Every pick
+    covers at least one new j-subset and costs ``sample_size`` column
+    degrees, so the completion stays far below a full greedy pass.
+    """
+    rng = np.random.default_rng(seed)
+    selected = list(selected_k)
+    uncovered = np.ones(index.num_j, dtype=bool)
+    uncovered[index.covered_by_many(np.asarray(selected, dtype=np.int64))] = False
+    for row in np.flatnonzero(uncovered).tolist():
+        if not uncovered[row]:
+            continue
+        candidates = index.covering(row)
+        if not candidates.size:
+            continue  # No combination covers it
+        if candidates.size > sample_size:
+            candidates = rng.choice(candidates, sample_size, replace=False)
+        lengths = index.k_indptr[candidates + 1] - index.k_indptr[candidates]
+        hits = uncovered[index.covered_by_many(candidates)]
+        prefix = np.concatenate(([0], np.cumsum(hits, dtype=np.int64)))
+        ends = np.cumsum(lengths)
+        k_idx = int(candidates[np.argmax(prefix[ends] - prefix[ends - lengths])])
+        selected.append(k_idx)
+        uncovered[index.covered_by(k_idx)] = False
+    return selected
+
+
 # Greedy algorithm for the case s < j
 def _greedy_cover_partial(
     samples: List[int],
-    k_combos: List[
-        Tuple[int, ...]
-    ],  # Note: k_combos might be pruned if s==j, but greedy is only called if s<j
+    k_combos: np.ndarray,  # int32 colex ranks of the candidate k-combinations
+    k: int,
     j: int,
     s: int,
     start_time: float,  #  Add start_time parameter
     progress_callback=None,
     use_bitmask: bool = True,  # Add flag to enable/disable bitmask optimization
-    beam_width: int = 1,  # Add beam_width parameter
-) -> Tuple[List[Tuple[int, ...]], List[int]]:  # <- Modify return value type
-    """Greedy algorithm for handling the s < j case: ensure each j-subset has at least one s-subset covered. Includes Beam Search option and 2-Opt refinement."""  # Updated docstring
+    beam_width: int = 1,  # Beam search over top-B partial covers when > 1
+    greedy_mode: str = "bucket",  # Engine from solver.greedy ("bucket", "lazy", "exact", "stochastic")
+    greedy_epsilon: float = 0.1,  # Sampling accuracy of the "stochastic" engine
+    workers: Optional[int] = None,  # Processes for beam / GRASP (None: auto)
+    local_search_time: float = 2.0,  # Seconds of swap local search after SPGR
+    bound_time: float = 2.0,  # Seconds of Lagrangian lower bound after SPGR (0: off)
+    seed: Optional[int] = None,  # Seed for local search and GRASP starts
+    grasp_starts: Optional[int] = None,  # GRASP starts (None: one per worker)
+    grasp_alpha: float = 0.05,  # GRASP restricted candidate list width
+    presolve: bool = True,  # Run the engines on the presolved instance
+    deadline: Optional[Deadline] = None,  # Stops greedy / GRASP / SPGR / local search
+    lp_rounding: bool = False,  # Start from LP randomized rounding instead of greedy
+    lp_rounding_time: float = 10.0,  # Seconds for LP rounding without a deadline
+    lns: bool = False,  # Improve the cover by large-neighbourhood search at the end
+    lns_time: float = 10.0,  # Seconds of LNS without a deadline
+    tabu: bool = False,  # Shrink the cover by tabu search before LNS
+    tabu_time: float = 10.0,  # Seconds of tabu search without a deadline
+) -> Tuple[np.ndarray, List[int], Dict[str, Any]]:
+    """Greedy algorithm for handling the s < j case: ensure each j-subset has at least one s-subset covered. Includes Beam Search option and 2-Opt refinement.
+
+    Returns the selected k-combination ranks, their indices into ``k_combos``
+    and stats (the presolve reduction counts under ``"presolve"``, the
+    Lagrangian lower bound under ``"lower_bound"``).
+    ``greedy_mode`` picks the selection engine; all engines break ties by the
+    lowest k index and so select the same cover, except the opt-in
+    "stochastic" engine, which scores a seeded random sample of candidates
+    per pick (for very large candidate pools). With ``beam_width`` > 1 the
+    selection is a beam search (solver.beam) expanded across ``workers``
+    processes instead; otherwise ``grasp_starts`` randomized GRASP starts
+    (solver.grasp) run across ``workers`` processes and replace the greedy
+    cover when smaller. A full cover is then reduced by single-point removal
+    and up to ``local_search_time`` seconds of swap local search
+    (solver.local_search). With ``presolve`` the selection engines run on the
+    instance reduced by solver.presolve and the fixed combinations are added
+    back; removal and local search always use the full instance. With
+    ``deadline`` presolve is skipped once the index build has used it up,
+    the greedy engine is replaced by stochastic greedy (``FALLBACK_EPSILON``)
+    when the time left is below its estimated cost on the presolved
+    instance, a greedy or beam selection stopped by the deadline is
+    completed by :func:`_complete_cover`, no GRASP batch starts after it and every start
+    stops at it, removal stops with the cover reached so far and local
+    search gets at most the time left. Up to ``bound_time`` seconds (half of the time left with
+    ``deadline``) go to a Lagrangian lower bound (solver.lr_bound) on the
+    presolved instance, returned under ``"lower_bound"``; local search is
+    skipped when the bound proves the cover optimal. With ``lp_rounding`` the starting cover
+    is the best randomized rounding of the LP relaxation (solver.lp_rounding,
+    half of the time left with ``deadline``) instead of the greedy engine,
+    and the LP bound joins the Lagrangian one (stats under ``"lp_rounding"``).
+    With ``lns`` the cover is finally improved by large-neighbourhood search
+    (solver.lns) until the deadline, or for ``lns_time`` seconds without one
+    (stats under ``"lns"``). With ``tabu`` the cover is first shrunk by tabu
+    search (solver.tabu) for the rest of the deadline (half of it with
+    ``lns``), or for ``tabu_time`` seconds without one (stats under
+    ``"tabu"``); the bound and local search then leave it at least
+    ``TABU_SHARE`` of the time left after the construction. The lower
+    bound is at least the counting bound ceil(#j-subsets / largest column
+    degree).
+    """  # Updated docstring
     n_samples = len(samples)
     print(
         f"Running greedy_cover_partial: n={n_samples}, j={j}, s={s}, beam_width={beam_width}",
@@ -349,23 +1212,19 @@ def _greedy_cover_partial(
             progress_callback,
         )
 
-    all_j_subsets_list = list(itertools.combinations(samples, j))
-    num_j_subsets = len(all_j_subsets_list)
+    # j-subsets are identified by their colex rank (0..C(n, j)-1)
+    num_j_subsets = colex.num_subsets(n_samples, j)
 
     if not num_j_subsets:
         if report_progress:
             report_progress(
                 100, "Done: no j-subsets to process", start_time, progress_callback
             )
-        return []
+        return k_combos[:0], [], {}
 
-    # --- Pre-calculate data structures for coverage check ---
-    j_subset_internals_sets = {
-        js: set(itertools.combinations(js, s)) for js in all_j_subsets_list
-    }
-    k_combo_s_subsets_sets = {kc: set(itertools.combinations(kc, s)) for kc in k_combos}
-    # Create a mapping from k-combo tuple to its original index for efficient lookup
-    k_combo_to_index = {combo: i for i, combo in enumerate(k_combos)}
+    # --- Pre-calculate bitmasks for the intersection-size coverage check ---
+    j_subset_masks = colex.masks(np.arange(num_j_subsets), n_samples, j)
+    k_combo_masks = colex.masks(k_combos, n_samples, k)
 
     # --- Precomputation for Sparse Cumulative Count ---
     if report_progress:
@@ -375,147 +1234,141 @@ def _greedy_cover_partial(
             start_time,
             progress_callback,
         )
-    j_subset_to_index: Dict[Tuple[int, ...], int] = {
-        js: idx for idx, js in enumerate(all_j_subsets_list)
-    }
-    # Inverted index: map j_subset index to list of k_combo indices that cover it (via any s-subset)
-    j_to_k: Dict[int, List[int]] = {i: [] for i in range(num_j_subsets)}
-    # Can we optimize building this?
-    # Iterate through k_combos and their s-subsets
-    for k_idx, kc in enumerate(k_combos):
-        # Find all j_subsets covered by this k_combo
-        covered_j_indices = set()
-        kc_s_subsets = k_combo_s_subsets_sets[kc]  # Use precalculated s-subsets
-        # This is the slow part if done naively (checking all j_subsets)
-        # Instead, let's iterate through s_subsets of kc and see which j_subsets they belong to? Still hard.
-        # Let's try iterating j_subsets and checking coverage by kc
-        for js_idx, js in enumerate(all_j_subsets_list):
-            # Check if kc covers js (share at least one s-subset)
-            if not j_subset_internals_sets[js].isdisjoint(kc_s_subsets):
-                j_to_k[js_idx].append(k_idx)
+    # Sparse coverage index (k->j CSR and its j->k transpose), enumerated directly
+    coverage = build_coverage_index(k_combo_masks, j_subset_masks, s, n_samples)
     if report_progress:
         report_progress(
             20, "Inverted index computation complete", start_time, progress_callback
         )
 
-    # --- Helper function for 2-Opt: Check full coverage (using set logic) ---
-    def _check_full_coverage(current_selection_indices: List[int]) -> bool:
-        """Checks if the given list of k-combo indices covers all j-subsets using set logic."""
-        if not current_selection_indices:
-            return num_j_subsets == 0
-
-        # Use set logic as bitmask is no longer the primary method here
-        selected_combos_for_check = [k_combos[i] for i in current_selection_indices]
-        overall_covered_s = set().union(
-            *(k_combo_s_subsets_sets[combo] for combo in selected_combos_for_check)
-        )
-        return all(
-            not j_subset_internals_sets[js].isdisjoint(overall_covered_s)
-            for js in all_j_subsets_list
-        )
+    # --- Presolve: fixed combinations + reduced instance for the engines ---
+    if deadline is not None and deadline.expired():
+        presolve = False  # The index build used up the budget
+    pre = presolve_cover(coverage) if presolve else None
+    solve_index = pre.reduced_index() if pre else coverage
+    num_fixed_satisfied = num_j_subsets - solve_index.num_j
+    greedy_estimate = GREEDY_SECONDS_PER_NNZ * solve_index.nnz
 
     # --- Main Greedy Loop (Sparse Cumulative Count) ---
     if report_progress:
         report_progress(
             25,
-            "Start greedy iteration (sparse cumulative count)...",
+            f"Start greedy iteration (sparse cumulative count, {greedy_mode})...",
             start_time,
             progress_callback,
         )
-    satisfied_j_mask = np.zeros(num_j_subsets, dtype=bool)
-    num_satisfied = 0
-    candidate_k_indices_set = set(
-        range(len(k_combos))
-    )  # Use set for faster removal check
-    selected_k_indices = []  # Store selected indices in order
-    iter_count = 0
-
-    while num_satisfied < num_j_subsets and candidate_k_indices_set:
-        iter_count += 1
-        unsatisfied_j_indices = np.where(~satisfied_j_mask)[0]
-        if not unsatisfied_j_indices.size:
-            print(f"Iteration {iter_count}: All j-subsets satisfied.", file=sys.stderr)
-            break
 
-        # Calculate scores (counts of newly covered j-subsets) for candidate k-combos
-        # Using a dictionary for sparse scores might be faster than large np array + masking
-        k_combo_scores: Dict[int, int] = {k_idx: 0 for k_idx in candidate_k_indices_set}
-        num_candidate_k = len(candidate_k_indices_set)
-        print(
-            f"Iteration {iter_count}: Scoring {num_candidate_k} candidates against {len(unsatisfied_j_indices)} unsatisfied j-subsets...",
-            file=sys.stderr,
+    def _on_pick(iter_count, best_k_idx_iter, best_count_iter, num_satisfied):
+        if report_progress:
+            report_progress(
+                30 + int(60 * ((num_satisfied + num_fixed_satisfied) / num_j_subsets)),
+                f"Iteration {iter_count}: selecting k-combination #{best_k_idx_iter} (newly satisfied {best_count_iter} subsets). Total satisfied {num_satisfied + num_fixed_satisfied}/{num_j_subsets}",
+                start_time,
+                progress_callback,
+            )
+
+    if greedy_mode not in GREEDY_ENGINES:
+        raise ValueError(
+            f"Unknown greedy_mode '{greedy_mode}'. Choose from {sorted(GREEDY_ENGINES)}."
+        )
+    lp_bound, lp_stats = None, None
+    if lp_rounding:
+        if deadline is not None:
+            lp_rounding_time = deadline.budget(0.5)
+        if report_progress:
+            report_progress(
+                30,
+                f"Solving the LP relaxation and rounding it ({lp_rounding_time:.1f}s)...",
+                start_time,
+                progress_callback,
+            )
+        selected_k_indices, lp_bound, lp_stats = lp_rounding_cover(
+            solve_index, seed=seed, workers=workers or 1, time_limit=lp_rounding_time
         )
+    elif beam_width > 1:
 
-        # Iterate through unsatisfied j-subsets and increment score for covering candidate k-combos
-        for js_idx in unsatisfied_j_indices:
-            # Get k_indices covering this j_subset from precomputed map
-            covering_k_list = j_to_k.get(js_idx, [])
-            for k_idx in covering_k_list:
-                # Increment score only if the k_combo is still a candidate
-                if k_idx in k_combo_scores:
-                    k_combo_scores[k_idx] += 1
+        def _on_level(level, num_uncovered):
+            if report_progress:
+                report_progress(
+                    30 + int(60 * (1 - num_uncovered / num_j_subsets)),
+                    f"Beam level {level}: best partial cover leaves {num_uncovered}/{num_j_subsets} j-subsets unsatisfied",
+                    start_time,
+                    progress_callback,
+                )
 
-        # Find the best candidate k-combo (highest score)
+        selected_k_indices = beam_search(
+            solve_index,
+            beam_width,
+            workers=workers,
+            on_level=_on_level,
+            deadline=deadline,
+        )
+        if deadline is not None and deadline.expired():
+            # Stopped at the deadline: finish the best partial cover cheaply
+            selected_k_indices = _complete_cover(
+                solve_index, selected_k_indices, seed=seed
+            )
+    else:
         if (
-            not k_combo_scores
-        ):  # Should not happen if candidate_k_indices_set is not empty and j_to_k was built correctly
+            deadline is not None
+            and greedy_mode != "stochastic"
+            and deadline.remaining() < greedy_estimate
+        ):
             print(
-                f"Warning: Greedy iteration {iter_count}: k_combo_scores is empty. Candidates: {len(candidate_k_indices_set)}",
+                f"Greedy ({greedy_mode}) needs about {greedy_estimate:.1f}s, "
+                f"{deadline.remaining():.1f}s left: using stochastic greedy (epsilon={FALLBACK_EPSILON}).",
                 file=sys.stderr,
             )
-            break
-
-        # Find the k_idx with the maximum score
-        # max(dict, key=dict.get) finds the key with the max value
-        try:
-            # Use list comprehension to filter out scores of 0 before finding max, handles tie-breaking arbitrarily
-            non_zero_scores = {k: v for k, v in k_combo_scores.items() if v > 0}
-            if not non_zero_scores:
-                print(
-                    f"Warning: Greedy iteration {iter_count}: No k-combo covers any *new* j-subset.",
-                    file=sys.stderr,
-                )
-                break  # No progress possible
-            best_k_idx_iter = max(non_zero_scores, key=non_zero_scores.get)
-            best_count_iter = non_zero_scores[best_k_idx_iter]
-        except (
-            ValueError
-        ):  # Handles case where k_combo_scores might be empty after filtering?
-            print(
-                f"Warning: Greedy iteration {iter_count}: Error finding max score. Scores: {k_combo_scores}",
-                file=sys.stderr,
+            greedy_mode, greedy_epsilon = "stochastic", FALLBACK_EPSILON
+        engine_options = (
+            {"epsilon": greedy_epsilon, "seed": seed}
+            if greedy_mode == "stochastic"
+            else {}
+        )
+        selected_k_indices, greedy_stats = GREEDY_ENGINES[greedy_mode](
+            solve_index, on_pick=_on_pick, deadline=deadline, **engine_options
+        )
+        print(
+            f"Greedy ({greedy_mode}) selection: {greedy_stats['iterations']} iterations, "
+            f"{greedy_stats['evaluations']} candidate evaluations.",
+            file=sys.stderr,
+        )
+        if deadline is not None and deadline.expired():
+            # Stopped at the deadline: finish the selection cheaply
+            selected_k_indices = _complete_cover(
+                solve_index, selected_k_indices, seed=seed
             )
-            break
-
-        # Add the best k-combo to the results
-        selected_k_indices.append(best_k_idx_iter)
-        candidate_k_indices_set.remove(best_k_idx_iter)  # Remove selected index
-
-        # Update satisfied_j_mask efficiently
-        # Find indices of unsatisfied j-subsets that are covered by the chosen k_idx
-        newly_satisfied_indices = []
-        for (
-            js_idx
-        ) in unsatisfied_j_indices:  # Iterate only through currently unsatisfied
-            # Check if the chosen k_idx is in the precomputed list for this j_subset
-            if best_k_idx_iter in j_to_k.get(js_idx, []):
-                newly_satisfied_indices.append(js_idx)
-
-        if newly_satisfied_indices:
-            satisfied_j_mask[newly_satisfied_indices] = True
-            num_satisfied = np.sum(satisfied_j_mask)  # Update total count
-
-        if report_progress:
-            report_progress(
-                30 + int(60 * (num_satisfied / num_j_subsets)),
-                f"Iteration {iter_count}: selecting k-combination #{best_k_idx_iter} (newly satisfied {best_count_iter} subsets). Total satisfied {num_satisfied}/{num_j_subsets}",
-                start_time,
-                progress_callback,
+        # GRASP multi-start: one randomized start per worker process by default
+        if grasp_starts is None:
+            grasp_starts = workers if workers and workers > 1 else 0
+        if deadline is not None and deadline.expired():
+            grasp_starts = 0
+        if grasp_starts > 0:
+            if report_progress:
+                report_progress(
+                    88,
+                    f"Running {grasp_starts} GRASP starts...",
+                    start_time,
+                    progress_callback,
+                )
+            grasp_indices = grasp_multi_start(
+                solve_index,
+                grasp_starts,
+                alpha=grasp_alpha,
+                seed=seed,
+                workers=workers or 1,
+                deadline=deadline,
             )
+            if grasp_indices and len(grasp_indices) < len(selected_k_indices):
+                selected_k_indices = grasp_indices
+    if pre:
+        selected_k_indices = pre.expand(selected_k_indices)
+    satisfied_j_mask = coverage.cover_counts(selected_k_indices) > 0
 
-    result_combos = [
-        k_combos[i] for i in selected_k_indices
-    ]  # Get combos from final indices
+    result_indices = selected_k_indices  # Indices into k_combos
+    lower_bound = None  # LP / Lagrangian bound, computed once the cover is complete
+    lns_stats = None
+    tabu_stats = None
 
     # --- Post-processing & 2-Opt ---
     # Calculate final satisfied count using the final mask state
@@ -539,24 +1392,22 @@ def _greedy_cover_partial(
         print("Starting single-point greedy removal optimization...", file=sys.stderr)
 
         current_result_indices = selected_k_indices[:]  # Work with indices
+        # Per-j cover counts: each removal test costs O(column degree), not a full scan
+        state = CoverageState(coverage, selected_k=current_result_indices)
         changed = True
         removed_count_spgr = 0  # Counting the number of single-point removals
         while changed:
             changed = False
             indices_before_pass = len(current_result_indices)
-            # Iterate over a copy of the list indices to allow safe removal
             for i in range(
                 len(current_result_indices) - 1, -1, -1
             ):  # Iterate backwards for safe removal
+                if deadline is not None and deadline.expired():
+                    break  # Every removal kept a full cover
                 k_idx_to_test = current_result_indices[i]
-                # Temporarily remove the current k_idx by creating a list without it
-                tmp_indices = (
-                    current_result_indices[:i] + current_result_indices[i + 1 :]
-                )
-
                 # Check if coverage still holds without it
-                if _check_full_coverage(tmp_indices):
-                    # Permanently remove by updating the list
+                if state.can_remove(k_idx_to_test):
+                    state.remove(k_idx_to_test)
                     current_result_indices.pop(i)  # Remove the element at index i
                     changed = True
                     removed_count_spgr += 1
@@ -564,8 +1415,6 @@ def _greedy_cover_partial(
                         f"  SPGR: Removed k_idx {k_idx_to_test}. New size: {len(current_result_indices)}",
                         file=sys.stderr,
                     )
-                    # Since we removed an element, the indices shifted. Restarting the inner loop check
-                    # or continuing backwards is safer than breaking and restarting the outer loop.
                     # Continuing backwards handles multiple removals in one pass.
 
             indices_after_pass = len(current_result_indices)
@@ -580,15 +1429,112 @@ def _greedy_cover_partial(
             f"Single-point greedy removal finished. Removed {removed_count_spgr} combos. Final size: {len(current_result_indices)}",
             file=sys.stderr,
         )
-        result_combos = [
-            k_combos[i] for i in current_result_indices
-        ]  # Update result_combos based on final indices
+        result_indices = (
+            current_result_indices  # Update result_indices based on SPGR result
+        )
+
+        # --- Lower bound (presolve keeps the optimum: fixed + reduced instance) ---
+        num_fixed = len(pre.fixed_k) if pre else 0
+        # Counting bound: each combination covers at most max-degree j-subsets
+        lower_bound = num_fixed + math.ceil(
+            solve_index.num_j / max(1, int(solve_index.k_degrees().max(initial=0)))
+        )
+        if lp_bound is not None:
+            lower_bound = max(lower_bound, num_fixed + lp_bound)
+        # With tabu, the bound and local search leave it TABU_SHARE of the time
+        tabu_reserve = 0.0
+        if tabu and deadline is not None:
+            tabu_reserve = deadline.budget(TABU_SHARE)
+        if deadline is not None:
+            bound_time = deadline.budget(0.5, reserve=tabu_reserve, cap=bound_time)
+        if lp_stats and lp_stats["converged"]:
+            bound_time = 0  # The Lagrangian dual cannot exceed the LP optimum
+        if bound_time > 0:
+            if report_progress:
+                report_progress(
+                    91,
+                    f"Computing Lagrangian lower bound ({bound_time:.1f}s)...",
+                    start_time,
+                    progress_callback,
+                )
+            lagrangian_bound = num_fixed + LagrangianRelaxationBound(
+                solve_index, upper_bound=len(result_indices) - num_fixed
+            ).calculate_lower_bound(time_limit=bound_time)
+            lower_bound = max(lower_bound, lagrangian_bound)
+        if lower_bound >= len(result_indices):
+            print(
+                "The lower bound proves the cover optimal; skipping local search.",
+                file=sys.stderr,
+            )
+            local_search_time = 0
+
+        # --- 2-Opt: time-budgeted 2-for-1 / 1-for-1 swap local search ---
+        swap_stats = {"two_for_one": 0}
+        if deadline is not None:
+            local_search_time = deadline.budget(
+                reserve=tabu_reserve, cap=local_search_time
+            )
+        if local_search_time > 0:
+            if report_progress:
+                report_progress(
+                    92,
+                    f"Starting swap local search ({local_search_time:.1f}s)...",
+                    start_time,
+                    progress_callback,
+                )
+            result_indices, swap_stats = swap_local_search(
+                coverage, result_indices, local_search_time, seed=seed
+            )
+
+        # --- Tabu search: fixed-size swaps, one combination fewer per full cover ---
+        if deadline is not None:
+            tabu_deadline = deadline.child(0.5) if lns else deadline
+        else:
+            tabu_deadline = Deadline(tabu_time)
+        if tabu and tabu_deadline.remaining() > 0.1:
+            if report_progress:
+                report_progress(
+                    93,
+                    f"Running tabu search ({tabu_deadline.remaining():.1f}s)...",
+                    start_time,
+                    progress_callback,
+                )
+            result_indices, tabu_stats = tabu_set_cover(
+                coverage,
+                result_indices,
+                deadline=tabu_deadline,
+                seed=seed,
+                target=lower_bound or 0,
+            )
+
+        # --- LNS: CP-SAT re-optimisation of sample neighbourhoods ---
+        lns_deadline = deadline if deadline is not None else Deadline(lns_time)
+        if lns and lns_deadline.remaining() > 0.1:
+            if report_progress:
+                report_progress(
+                    93,
+                    f"Running large-neighbourhood search ({lns_deadline.remaining():.1f}s)...",
+                    start_time,
+                    progress_callback,
+                )
+            result_indices, lns_stats = lns_improve(
+                coverage,
+                result_indices,
+                k_combo_masks,
+                n_samples,
+                deadline=lns_deadline,
+                workers=workers or 1,
+                seed=seed,
+                target=lower_bound or 0,
+            )
 
     # --- 最后统计信息 ---
     # 确定优化状态
     optimization_status = "skipped"  # Default
     if final_num_satisfied >= num_j_subsets:
-        if removed_count_spgr > 0:
+        if swap_stats["two_for_one"] > 0:
+            optimization_status = "applied (SPGR + 2-Opt)"
+        elif removed_count_spgr > 0:
             optimization_status = "applied (SPGR)"
         elif selected_k_indices:  # Check if greedy ran and produced a result
             optimization_status = "applied (no change)"
@@ -597,7 +1543,7 @@ def _greedy_cover_partial(
     # Use the fixed algorithm name 'sparse' and include the optimization status
     print(
         f"Greedy algorithm (sparse, single-point removal {optimization_status})."
-        f" Number of resulting combinations: {len(result_combos)}, j-subsets already covered {final_num_satisfied}/{num_j_subsets}。",
+        f" Number of resulting combinations: {len(result_indices)}, j-subsets already covered {final_num_satisfied}/{num_j_subsets}。",
         file=sys.stderr,
     )
 
@@ -609,16 +1555,27 @@ def _greedy_cover_partial(
             progress_callback,
         )  # Keep final progress at 95, updated message
 
-    # Recalculate final selected indices based on the optimized result_combos
-    final_selected_k_indices = [k_combo_to_index[c] for c in result_combos]
+    final_selected_k_indices = [int(i) for i in result_indices]
+    partial_stats = {"presolve": pre.stats} if pre else {}
+    if lp_stats:
+        partial_stats["lp_rounding"] = lp_stats
+    if lower_bound is not None:
+        partial_stats["lower_bound"] = lower_bound
+    if lns_stats:
+        partial_stats["lns"] = lns_stats
+    if tabu_stats:
+        partial_stats["tabu"] = tabu_stats
     return (
-        result_combos,
+        k_combos[final_selected_k_indices],
         final_selected_k_indices,
-    )  # <- Returning combinations and indices
+        partial_stats,
+    )  # <- Returning combination ranks, indices and stats
 
 
 # Global progress reporting function
-def report_progress(percent, message, start_time=None, progress_callback=None):
+def report_progress(
+    percent, message, start_time=None, progress_callback=None, solution=None
+):
     """
     Global function for reporting algorithm progress
 
@@ -627,6 +1584,8 @@ def report_progress(percent, message, start_time=None, progress_callback=None):
         message: progress message
         start_time: (used to calculate elapsed time)
         progress_callback: optional external callback function
+        solution: optional intermediate solution (size, bound, gap, elapsed)
+            added to the progress JSON
     """
     # Calculate the elapsed time (if a start time is provided)
     elapsed_str = ""
@@ -642,6 +1601,8 @@ def report_progress(percent, message, start_time=None, progress_callback=None):
         "message": f"{message} {elapsed_str}",
         "elapsed_time": elapsed_time,
     }
+    if solution is not None:
+        progress_data["solution"] = solution
     print(json.dumps(progress_data))  # Corrected indentation
     sys.stdout.flush()  # Corrected indentation, Explicitly flush stdout buffer
     # If an external callback function is provided, call it as well
@@ -895,14 +1856,31 @@ def select_optimal_samples(
     workers: Optional[int] = None,  # Allow user to override, None means auto-detect
     progress_callback=None,  # Add a progress callback function
     beam_width: int = 1,  # Add beam_width parameter with default
+    presolve: bool = True,  # Shrink the cover instance before solving (t = 1)
+    orbit_mode: bool = False,  # s < j: also try CP-SAT over Z_n-invariant covers
+    gap_limit: Optional[float] = None,  # Stop CP-SAT once (size - bound) / size <= gap
+    lp_rounding: bool = False,  # s < j: start from LP randomized rounding, not greedy
+    backend: str = "cpsat",  # "cpsat", "highs" (MILP, needs scipy) or "tabu"
+    lns_mode: bool = False,  # s < j: improve the greedy cover by LNS until the deadline
 ) -> Dict[str, Any]:
     """
     Returns a JSON-serialisable result dictionary.
      If a progress_callback is provided, it will be called periodically to report progress.
     progress_callback function signature: progress_callback(percent: int, message: str)
+    Every improving CP-SAT solution is reported as it is found.
+    ``backend`` picks the solver of the exact cover models (the k = j = s
+    rounds); with "highs" the s < j greedy cover is also handed to the
+    HiGHS MILP for the remaining time, which may improve it and prove a bound;
+    with "tabu" the s < j greedy cover is shrunk by tabu search (see
+    :func:`_greedy_cover_partial`) and the rounds run tabu search instead of a
+    model.
     """
     # Start timing
     start_time = time.perf_counter()  # Start timer for the whole function
+    # Every phase below takes its time from this one deadline
+    deadline = Deadline(time_limit or 30, start_time)
+    # Kept back from the solver phases for building and reporting the result
+    post_reserve = min(1.0, 0.05 * deadline.time_limit)
 
     # Report initial progress
     report_progress(0, "Validating parameters...", start_time, progress_callback)
@@ -914,6 +1892,8 @@ def select_optimal_samples(
         raise ValueError("Parameter out of range; see problem requirements")
     if not (1 <= t <= j):  # Add t validation
         raise ValueError(f"t ({t}) must satisfy 1 <= t <= j ({j})")
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend '{backend}'. Choose from {BACKENDS}.")
     if random_select:
         rng = random.Random(seed)
         samples = rng.sample(range(1, m + 1), n)
@@ -946,8 +1926,10 @@ def select_optimal_samples(
     # Generate combinations
     report_progress(5, "Generating combinations...", start_time, progress_callback)
 
-    k_combos = list(itertools.combinations(samples, k))
-    j_subsets = list(itertools.combinations(samples, j))
+    # Subsets are carried as int32 colex ranks over the sample index space
+    # (sample i <-> index i) and only turned into tuples for the final JSON.
+    k_combos = np.arange(colex.num_subsets(n, k), dtype=np.int32)
+    j_subsets = np.arange(colex.num_subsets(n, j), dtype=np.int32)
 
     report_progress(
         10,
@@ -957,11 +1939,14 @@ def select_optimal_samples(
     )
 
     # Initialize final result variables before branching
-    combos_selected = []
+    combos_selected = k_combos[:0]  # Selected k-combination ranks
     final_accuracy = 0.0
     final_objective = 0.0
     final_bound = 0.0
     greedy_indices_output = []  # For s < j case specifically
+    model_build_time = 0.0  # CP-SAT model construction, summed over rounds
+    solve_time = 0.0  # CP-SAT solver wall time, summed over rounds
+    presolve_stats: Dict[str, int] = {}  # Reductions of the last presolved instance
 
     # Choose algorithm based on the relationship between s and j
     # Only follow the CP-SAT specialized path when k = j = s
@@ -975,8 +1960,8 @@ def select_optimal_samples(
                 progress_callback,
             )
             original_k_count = len(k_combos)
-            k_combos = unique_k_combos(
-                samples, k, s
+            k_combos = colex.rank_tuples(
+                unique_k_combos(samples, k, s), samples
             )  # Prune k_combos based on s-subset signature
             report_progress(
                 12,
@@ -992,62 +1977,56 @@ def select_optimal_samples(
                 progress_callback,
             )
 
-        # ★ Run Greedy first to get warm start indices, even when s==j
-        # Define time budgets
-        overall_time_budget = time_limit or 30  # Total time for the function
-        warmup_greedy_time = 3  # Time for greedy + 2-Opt phase
-        cp_sat_time_budget = (
-            overall_time_budget - warmup_greedy_time
-        )  # Remaining time for CP-SAT
-        if cp_sat_time_budget <= 0:
-            print(
-                "Warning: Not enough time budget allocated for CP-SAT phase. Setting to minimum 1s.",
-                file=sys.stderr,
-            )
-            cp_sat_time_budget = 1
-
-        # Skip greedy warm-up for s==j, use zero hints
+        # Greedy warm start: _threshold_set_cover completes a bucket-greedy
+        # cover of each model, hints it on every variable and bounds sum(x)
         print(
-            "s == j: Skipping greedy warmup, using zero hints for CP-SAT",
+            "s == j: CP-SAT rounds start from a greedy warm-start cover",
             file=sys.stderr,
         )
         report_progress(
-            13, "s=j: 跳过预热贪心，使用零提示", start_time, progress_callback
+            13, "s=j: 使用贪心预热解作为提示", start_time, progress_callback
         )  # Update progress message
-        warm_start_hints_greedy = [0] * len(k_combos)
 
-        all_k_combos = k_combos[:]  # Backup the full set of k-combinations
-        k_combos_map = {
-            combo: i for i, combo in enumerate(all_k_combos)
-        }  # Map combo to original index for warm2 mapping
+        all_k_combos = k_combos.copy()  # Backup the full set of k-combinations
 
         # ---------- ① ① First CP-SAT round  ----------
         MAX_INIT_COLS = 100_000
-        MAX_SUBSETS = 50_000  # Keep subset sampling limit
-        TIME_ROUND_1 = 22  # Seconds
+        MAX_SUBSETS = 50_000  # Seed constraint count for the cutting-plane loop
+        ROUND_1_SHARE = 0.7  # Of the remaining time; Round 2 may use the rest
+        CG_SHARE = 0.2  # Of the remaining time, for column generation
         rng = random.Random(seed if seed is not None else 42)
 
-        # 1. Sample k_combos first
+        # 1. Too many columns: Round 1 uses the pool built by LP column
+        #    generation (solver.cg_solver), whose LP bound holds for all columns
         k_combos_round1 = k_combos  # Start with potentially pruned list
+        column_generation = None
         if len(k_combos_round1) > MAX_INIT_COLS:
             print(
-                f"Sampling {MAX_INIT_COLS} from {len(k_combos_round1)} k-combinations for Round 1...",
+                f"Column generation over {len(k_combos_round1)} k-combinations for Round 1...",
                 file=sys.stderr,
             )
-            indices_round1 = rng.sample(range(len(k_combos_round1)), MAX_INIT_COLS)
-            k_combos_round1 = [
-                k_combos[i] for i in indices_round1
-            ]  # Use original k_combos for indexing if pruned before
-            # Adjust warm start hints to match the sampled subset
-            # If using zero hints, this adjustment isn't needed
-            # warm1 = [warm_start_hints_greedy[i] for i in indices_round1] # If warm start was used
-            warm1 = [0] * len(k_combos_round1)  # If using zero hints
+            report_progress(
+                20, "s=j: Generating columns (LP)...", start_time, progress_callback
+            )
+            column_generation = ColumnGenerationSolver(
+                build_coverage_index(
+                    colex.masks(k_combos, n, k), colex.masks(j_subsets, n, j), s, n
+                ),
+                t,
+                workers=effective_workers,
+            )
+            k_combos_round1 = k_combos[
+                column_generation.generate_columns(
+                    deadline.child(CG_SHARE, reserve=post_reserve)
+                )
+            ]
+            warm1 = None  # Greedy warm start is built on the pooled columns
             print(
-                f"Sampled {len(k_combos_round1)} combos for Round 1.", file=sys.stderr
+                f"Column pool of {len(k_combos_round1)} combos for Round 1.",
+                file=sys.stderr,
             )
         else:
-            # warm1 = warm_start_hints_greedy # Use original hints if no sampling and warm start used
-            warm1 = [0] * len(k_combos_round1)  # If using zero hints
+            warm1 = None  # Greedy warm start is built inside the solver
             print(
                 f"Using all {len(k_combos_round1)} k-combinations for Round 1.",
                 file=sys.stderr,
@@ -1063,15 +2042,12 @@ def select_optimal_samples(
             file=sys.stderr,
         )
 
-        # 3. Sample the j_subsets if needed
+        # 3. More than MAX_SUBSETS j-subsets: start from a random seed set of
+        #    constraints and add violated ones (cutting planes) instead of
+        #    silently dropping j-subsets
         if original_j_count > MAX_SUBSETS:
-            print(f"Sampling j_subsets down to {MAX_SUBSETS}...", file=sys.stderr)
-            rng_js = random.Random(
-                seed if seed is not None else 42
-            )  # Use separate RNG? Fine for now.
-            j_subsets_r1 = rng_js.sample(j_subsets_potential, MAX_SUBSETS)
             print(
-                f"Sampled j_subsets for Round 1: kept {len(j_subsets_r1)}",
+                f"Using cutting planes from {MAX_SUBSETS} seed j_subsets for Round 1.",
                 file=sys.stderr,
             )
         else:
@@ -1082,7 +2058,7 @@ def select_optimal_samples(
 
         # Ensure we don't proceed with an empty list if filtering/sampling removed everything
         # If sampling or filtering results in j_subsets_r1 being empty, raise
-        if not j_subsets_r1:
+        if not len(j_subsets_r1):
             # raise RuntimeError("Unable to solve: no j-subsets left after filtering/sampling")
             raise RuntimeError(
                 "Filtered j_subsets is empty — most likely the coverage check is incorrect，"
@@ -1090,29 +2066,42 @@ def select_optimal_samples(
             )
 
         # 4. Pass consistent k_combos and j_subsets to the solver
+        deadline_round1 = deadline.child(ROUND_1_SHARE, reserve=post_reserve)
         print(
-            f"s == j: Starting CP-SAT Round 1 (time_limit={TIME_ROUND_1}s, cols={len(k_combos_round1)}, j_subsets={len(j_subsets_r1)})...",
+            f"s == j: Starting CP-SAT Round 1 (time_limit={deadline_round1.time_limit:.1f}s, cols={len(k_combos_round1)}, j_subsets={len(j_subsets_r1)})...",
             file=sys.stderr,
         )
         report_progress(
             25,
-            f"Running CP-SAT Round 1 (up to {TIME_ROUND_1}s, j_subsets={len(j_subsets_r1)})...",
+            f"Running CP-SAT Round 1 (up to {deadline_round1.time_limit:.1f}s, j_subsets={len(j_subsets_r1)})...",
             start_time,
             progress_callback,
         )
 
         try:
             # Pass k_combos_round1 and j_subsets_r1
-            sel1, obj1, bound1 = _threshold_set_cover(
+            sel1, obj1, bound1, stats1 = _threshold_set_cover_lazy(
                 combos=k_combos_round1,
-                j_subsets=j_subsets_r1,  # <--- Use correctly sampled j_subsets
+                j_subsets=j_subsets_r1,  # All j-subsets; constraints added lazily
                 t=t,
                 workers=effective_workers,
-                time_limit=TIME_ROUND_1,
-                progress_callback=None,  # Suppress nested progress
+                time_limit=deadline_round1.time_limit,
                 start_time=start_time,
                 warm_start_hints=warm1,  # Use potentially adjusted hints
+                n=n,
+                k=k,
+                j=j,
+                seed_size=MAX_SUBSETS,
+                rng=rng,
+                presolve=presolve,
+                progress_callback=progress_callback,
+                gap_limit=gap_limit,
+                deadline=deadline_round1,
+                backend=backend,
             )
+            model_build_time += stats1["model_build_time"]
+            solve_time += stats1["solve_time"]
+            presolve_stats = stats1.get("presolve", presolve_stats)
             # ---->  Add detailed debug prints <----
             print(f"DEBUG: _threshold_set_cover returned:", file=sys.stderr)
             print(
@@ -1122,6 +2111,9 @@ def select_optimal_samples(
             print(f"DEBUG: obj1: {obj1}", file=sys.stderr)
             print(f"DEBUG: bound1: {bound1}", file=sys.stderr)
             # ----> End debug prints <----
+            if column_generation is not None:
+                # The round's bound only holds for the pool
+                bound1 = float(math.ceil(column_generation.lower_bound - 1e-6))
 
             accuracy1 = (
                 bound1 / (obj1 + 1e-9)
@@ -1144,7 +2136,7 @@ def select_optimal_samples(
             report_progress(
                 75, "Error during Round 1 solve", start_time, progress_callback
             )
-            sel1 = []
+            sel1 = k_combos[:0]
             obj1 = 0.0
             bound1 = 0.0
             accuracy1 = 0.0
@@ -1153,7 +2145,6 @@ def select_optimal_samples(
             # Or maybe allow Round 2 attempt? For now, we'll stop and return R1 results.
 
         # ---------- ② Second CP-SAT round (if needed)  ----------
-        TIME_ROUND_2 = 10  # Seconds
         EXTRA_COLS = 50_000
         TARGET_ACCURACY = 0.80
 
@@ -1164,13 +2155,7 @@ def select_optimal_samples(
 
         # Only proceed to round 2 if round 1 was successful and accuracy is low
         if round1_successful and accuracy1 < TARGET_ACCURACY:
-            elapsed_r1 = time.perf_counter() - start_time
-            remaining_time = (
-                time_limit or (TIME_ROUND_1 + TIME_ROUND_2 + warmup_greedy_time + 5)
-            ) - elapsed_r1  # Calculate remaining time for R2 + buffer
-            actual_time_round2 = min(
-                TIME_ROUND_2, max(1, remaining_time - 2)
-            )  # Ensure at least 1s, leave 2s buffer
+            actual_time_round2 = deadline.budget(reserve=post_reserve)
 
             if actual_time_round2 < 1:
                 print(
@@ -1190,24 +2175,31 @@ def select_optimal_samples(
                 )
 
                 # Identify remaining combos from the *original* full set
-                k_combos_round1_set = set(k_combos_round1)
-                remaining_combos = [
-                    c for c in all_k_combos if c not in k_combos_round1_set
-                ]
+                remaining_combos = np.setdiff1d(all_k_combos, k_combos_round1)
 
-                # Sample extra combos
+                # Extra combos: the best priced ones, else a random sample
                 num_extra_to_sample = min(EXTRA_COLS, len(remaining_combos))
-                if num_extra_to_sample > 0:
-                    k_extra = rng.sample(remaining_combos, num_extra_to_sample)
+                if column_generation is not None:
+                    k_extra = k_combos[
+                        column_generation.priced_columns(num_extra_to_sample)
+                    ]
+                    print(
+                        f"Adding {len(k_extra)} best priced combos for Round 2.",
+                        file=sys.stderr,
+                    )
+                elif num_extra_to_sample > 0:
+                    k_extra = remaining_combos[
+                        rng.sample(range(len(remaining_combos)), num_extra_to_sample)
+                    ]
                     print(
                         f"Sampling {len(k_extra)} extra combos for Round 2.",
                         file=sys.stderr,
                     )
                 else:
-                    k_extra = []
+                    k_extra = remaining_combos[:0]
                     print("No remaining combos to sample for Round 2.", file=sys.stderr)
 
-                k_combos_round2 = k_combos_round1 + k_extra
+                k_combos_round2 = np.concatenate([k_combos_round1, k_extra])
                 print(f"Round 2 total combos: {len(k_combos_round2)}")
 
                 # —— imilarly filter and sample j_subsets for Round 2 ——
@@ -1215,9 +2207,9 @@ def select_optimal_samples(
                     f"Filtering/Sampling j_subsets for Round 2 based on {len(k_combos_round2)} k_combos...",
                     file=sys.stderr,
                 )
-                k_set2 = set(k_combos_round2)
-                j_subsets_potential_r2 = [
-                    js for js in j_subsets if js in k_set2
+                # k = j here, so a j-subset is coverable iff its rank is a round-2 column
+                j_subsets_potential_r2 = j_subsets[
+                    np.isin(j_subsets, k_combos_round2)
                 ]  # Filter from original j_subsets
                 original_coverable_count_r2 = len(j_subsets_potential_r2)
                 print(
@@ -1228,13 +2220,7 @@ def select_optimal_samples(
                 j_subsets_r2 = j_subsets_potential_r2
                 if original_coverable_count_r2 > MAX_SUBSETS:
                     print(
-                        f"Sampling j_subsets for Round 2 down to {MAX_SUBSETS}...",
-                        file=sys.stderr,
-                    )
-                    rng_js2 = random.Random(seed if seed is not None else 42)
-                    j_subsets_r2 = rng_js2.sample(j_subsets_potential_r2, MAX_SUBSETS)
-                    print(
-                        f"Sampled j_subsets for Round 2: kept {len(j_subsets_r2)}",
+                        f"Using cutting planes from {MAX_SUBSETS} seed j_subsets for Round 2.",
                         file=sys.stderr,
                     )
                 else:
@@ -1243,7 +2229,7 @@ def select_optimal_samples(
                         file=sys.stderr,
                     )
 
-                if not j_subsets_r2:
+                if not len(j_subsets_r2):
                     print(
                         "Error: No j_subsets remain after filtering/sampling for Round 2. Skipping Round 2.",
                         file=sys.stderr,
@@ -1251,8 +2237,7 @@ def select_optimal_samples(
                     # Skip the rest of Round 2 logic
                 else:
                     # ... proceed with warm start hints and call _threshold_set_cover ...
-                    sel1_set = set(sel1)
-                    warm2 = [1 if c in sel1_set else 0 for c in k_combos_round2]
+                    warm2 = np.isin(k_combos_round2, sel1).astype(int).tolist()
                     print(
                         f"Round 2 warm hints: {sum(warm2)} non-zero (based on Round 1 solution).",
                         file=sys.stderr,
@@ -1265,16 +2250,30 @@ def select_optimal_samples(
                     # Call _threshold_set_cover for Round 2
                     # Add try...except block similar to Round 1 call
                     try:
-                        sel2, obj2, bound2 = _threshold_set_cover(
+                        sel2, obj2, bound2, stats2 = _threshold_set_cover_lazy(
                             combos=k_combos_round2,  # Use combined list
                             j_subsets=j_subsets_r2,  # ← Pass in the filtered subsets
                             t=t,
                             workers=effective_workers,
                             time_limit=actual_time_round2,
-                            progress_callback=None,
                             start_time=start_time,
                             warm_start_hints=warm2,
+                            n=n,
+                            k=k,
+                            j=j,
+                            seed_size=MAX_SUBSETS,
+                            rng=rng,
+                            presolve=presolve,
+                            progress_callback=progress_callback,
+                            gap_limit=gap_limit,
+                            deadline=deadline.child(reserve=post_reserve),
+                            backend=backend,
                         )
+                        model_build_time += stats2["model_build_time"]
+                        solve_time += stats2["solve_time"]
+                        presolve_stats = stats2.get("presolve", presolve_stats)
+                        if column_generation is not None:
+                            bound2 = bound1  # Round 2 columns are still a pool
                         accuracy2 = (
                             bound2 / (obj2 + 1e-9)
                             if obj2 > 1e-9
@@ -1306,29 +2305,131 @@ def select_optimal_samples(
         report_progress(
             15, "s < j: running greedy algorithm...", start_time, progress_callback
         )
-        # Ensure k_combos used here is the original unfiltered list
+        # k_combos is the original unfiltered rank list here
         # (unique_k_combos pruning only happens if s==j)
-        original_k_combos = list(
-            itertools.combinations(samples, k)
-        )  # Regenerate if needed? Or pass original. Let's assume k_combos is the original if s!=j path taken
         # Call greedy algorithm
         (
             combos_selected,
             greedy_indices,
+            greedy_stats,
         ) = _greedy_cover_partial(  # <-- Capture greedy_indices here
             samples=samples,
             k_combos=k_combos,  # Use the k_combos available in this scope (should be original if s<j)
+            k=k,
             j=j,
             s=s,
             start_time=start_time,
             progress_callback=progress_callback,
             # use_bitmask=True, # Default is True in function def
             beam_width=beam_width,
+            workers=effective_workers,
+            seed=seed,
+            presolve=presolve and t == 1,
+            lp_rounding=lp_rounding,
+            lns=lns_mode,
+            tabu=backend == "tabu",
+            # Orbit mode / HiGHS get half of the remaining time after the greedy phase
+            deadline=deadline.child(
+                0.5 if orbit_mode or backend == "highs" else 1.0, reserve=post_reserve
+            ),
+        )
+        presolve_stats = greedy_stats.get("presolve", presolve_stats)
+        final_bound = float(greedy_stats.get("lower_bound", 0.0))
+
+        # Optional HiGHS MILP over the full instance, starting from the greedy cover
+        remaining_time = deadline.budget(
+            0.5 if orbit_mode else 1.0, reserve=post_reserve
         )
+        if (
+            backend == "highs"
+            and remaining_time >= 1
+            and final_bound < len(combos_selected)
+        ):
+            report_progress(
+                94,
+                f"HiGHS: solving the cover MILP ({remaining_time:.0f}s)...",
+                start_time,
+                progress_callback,
+            )
+            hints = np.zeros(len(k_combos), dtype=int)
+            hints[greedy_indices] = 1
+            try:
+                sel_mip, _, bound_mip, mip_stats = _threshold_set_cover(
+                    k_combos,
+                    j_subsets,
+                    t,
+                    effective_workers,
+                    time_limit=remaining_time,
+                    progress_callback=progress_callback,
+                    start_time=start_time,
+                    warm_start_hints=hints.tolist(),
+                    s=s,
+                    n=n,
+                    k=k,
+                    j=j,
+                    presolve=presolve,
+                    gap_limit=gap_limit,
+                    deadline=deadline.child(
+                        0.5 if orbit_mode else 1.0, reserve=post_reserve
+                    ),
+                    backend="highs",
+                )
+                model_build_time += mip_stats["model_build_time"]
+                solve_time += mip_stats["solve_time"]
+                final_bound = max(final_bound, bound_mip)
+                if len(sel_mip) < len(combos_selected):
+                    print(
+                        f"HiGHS cover ({len(sel_mip)}) replaces the greedy cover ({len(combos_selected)}).",
+                        file=sys.stderr,
+                    )
+                    combos_selected = sel_mip
+                    greedy_indices = sel_mip.tolist()  # k_combos holds every rank
+            except (RuntimeError, ValueError) as e:
+                print(f"HiGHS backend failed: {e}", file=sys.stderr)
+
+        # Optional orbit model: CP-SAT over Z_n-invariant covers, kept if smaller
+        remaining_time = deadline.budget(reserve=post_reserve)
+        proven_optimal = final_bound >= len(combos_selected)
+        if orbit_mode and remaining_time >= 1 and not proven_optimal:
+            report_progress(
+                96,
+                f"Orbit mode: running CP-SAT on Z_{n}-invariant covers ({remaining_time:.0f}s)...",
+                start_time,
+                progress_callback,
+            )
+            try:
+                sel_orbit, _, _, orbit_stats = _threshold_set_cover(
+                    k_combos,
+                    j_subsets,
+                    t,
+                    effective_workers,
+                    time_limit=remaining_time,
+                    progress_callback=progress_callback,
+                    start_time=start_time,
+                    s=s,
+                    n=n,
+                    k=k,
+                    j=j,
+                    symmetry="orbit",
+                    gap_limit=gap_limit,
+                    deadline=deadline.child(reserve=post_reserve),
+                )
+                model_build_time += orbit_stats["model_build_time"]
+                solve_time += orbit_stats["solve_time"]
+                if len(sel_orbit) < len(combos_selected):
+                    print(
+                        f"Orbit cover ({len(sel_orbit)}) replaces the greedy cover ({len(combos_selected)}).",
+                        file=sys.stderr,
+                    )
+                    combos_selected = sel_orbit
+                    greedy_indices = sel_orbit.tolist()  # k_combos holds every rank
+            except (RuntimeError, ValueError) as e:
+                print(f"Orbit mode failed: {e}", file=sys.stderr)
         # Assign results for the s < j case
-        final_accuracy = 0.0  # Greedy doesn't provide bounds/accuracy currently
         final_objective = len(combos_selected)
-        final_bound = 0.0  # Greedy doesn't provide bounds/accuracy currently
+        # LP / Lagrangian bound of the t = 1 relaxation (valid for every t >= 1),
+        # or the HiGHS bound if larger
+        final_accuracy = final_bound / final_objective if final_objective else 0.0
         # Store greedy_indices specifically for s<j case output
         greedy_indices_output = (
             greedy_indices  # Assign result from _greedy_cover_partial
@@ -1361,8 +2462,13 @@ def select_optimal_samples(
         "s": s,
         "t": t,
         "samples": samples,
-        "combos": combos_selected,  # Already updated if R2 ran
+        "combos": colex.to_tuples(
+            combos_selected, samples, k
+        ),  # Already updated if R2 ran; ranks become sample tuples only here
         "execution_time": round(execution_time, 3),
+        "model_build_time": round(model_build_time, 3),  # CP-SAT paths only
+        "solve_time": round(solve_time, 3),  # CP-SAT paths only
+        "presolve": presolve_stats,  # Eliminated rows/columns (empty if not run)
         "workers": effective_workers,
         "greedy_indices": greedy_indices_output,  # Use the dedicated output variable
         "accuracy": round(final_accuracy, 4),  # ★ Add final accuracy
@@ -1416,6 +2522,10 @@ class RequestModel(BaseModel):
     seed: Optional[int] = None
     time_limit: Optional[int] = 10
     workers: Optional[int] = 8  # Add optional workers, defaulting to 8
+    gap_limit: Optional[float] = None
+    lp_rounding: bool = False
+    backend: str = "cpsat"
+    lns_mode: bool = False
 
 
 @app.post("/select")
@@ -1510,6 +2620,32 @@ def main():
         default=1,
         help="Beam width for greedy algorithm when s<j (default: 1)",
     )  # Add beam argument
+    p.add_argument(
+        "--orbit",
+        action="store_true",
+        help="When s<j, also solve CP-SAT over covers invariant under cyclic sample shifts",
+    )
+    p.add_argument(
+        "--gap",
+        type=float,
+        help="Stop CP-SAT once the relative gap to the lower bound is at most this (e.g. 0.05)",
+    )
+    p.add_argument(
+        "--lp",
+        action="store_true",
+        help="When s<j, start from randomized roundings of the LP relaxation instead of greedy",
+    )
+    p.add_argument(
+        "--backend",
+        choices=BACKENDS,
+        default="cpsat",
+        help="Cover solver: CP-SAT, the HiGHS MILP (needs scipy; for s<j it also improves the greedy cover) or tabu search (large instances)",
+    )
+    p.add_argument(
+        "--lns",
+        action="store_true",
+        help="When s<j, improve the greedy cover by large-neighbourhood search until the time limit",
+    )
     args = p.parse_args()
 
     try:
@@ -1533,6 +2669,11 @@ def main():
             time_limit=args.time,
             workers=args.workers,  # Pass workers from args
             beam_width=args.beam,  # Pass beam width from args
+            orbit_mode=args.orbit,
+            gap_limit=args.gap,
+            lp_rounding=args.lp,
+            backend=args.backend,
+            lns_mode=args.lns,
         )
         # execution_time is now part of the result 'res'
 
@@ -126,17 +126,9 @@ def greedy_cover_gpu(samples: Tuple[int, ...], k: int, s: int):
     total_covers = offsets_np[Nk]  # Total number of cover relations
 
     # Create sparse data array (flattened list of s-indices)
-    sparse_covers_data_np = np.zeros(total_covers, dtype=np.int32)
-    current_pos = 0
-    for i in range(Nk):
-        num_covers_i = counts_np[i]
-        if num_covers_i > 0:
-            # Extract valid indices from covers_np for this k-set
-            valid_covers = covers_np[i, :num_covers_i]
-            sparse_covers_data_np[
-                current_pos : current_pos + num_covers_i
-            ] = valid_covers
-            current_pos += num_covers_i
+    # Rows of covers_np are padded with -1 at the end, so the valid entries in
+    # row-major order are exactly the concatenated per-k lists.
+    sparse_covers_data_np = covers_np[covers_np >= 0].astype(np.int32)
 
     sparse_end_time = time.perf_counter()
     print(
@@ -0,0 +1,151 @@
+# Beam search for the threshold cover (t = 1) over the shared CSR coverage
+# index (utils.coverage.CoverageIndex).
+#
+# A beam state is a partial cover: the tuple of selected k indices plus the set
+# of still-uncovered j-subsets, stored as a packed bitset (np.packbits) so
+# states are cheap to copy and to ship between processes. Each level expands
+# every state with its top-B candidates by gain and keeps the B children with
+# the fewest uncovered j-subsets. With B = 1 this is the plain greedy. Given a
+# deadline, the search stops before the first level that starts after it and
+# returns the best partial cover so far.
+
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+from utils.coverage import CoverageIndex
+from utils.deadline import Deadline
+
+# (num_uncovered, selected k indices, packed uncovered bitset)
+BeamState = Tuple[int, Tuple[int, ...], np.ndarray]
+
+# Coverage index of the current pool worker (installed by _init_worker)
+_worker_index: Optional[CoverageIndex] = None
+
+
+def _init_worker(index: CoverageIndex) -> None:
+    global _worker_index
+    _worker_index = index
+
+
+def _gains(index: CoverageIndex, uncovered: np.ndarray) -> np.ndarray:
+    """Number of uncovered j-subsets covered by each k-combination."""
+    prefix = np.concatenate(
+        ([0], np.cumsum(uncovered[index.k_indices], dtype=np.int64))
+    )
+    return prefix[index.k_indptr[1:]] - prefix[index.k_indptr[:-1]]
+
+
+def expand_state(
+    index: CoverageIndex, state: BeamState, beam_width: int
+) -> List[BeamState]:
+    """Children of ``state`` for its ``beam_width`` best candidates (lowest index on ties)."""
+    num_uncovered, selected, packed = state
+    uncovered = np.unpackbits(packed, count=index.num_j).astype(bool)
+    gains = _gains(index, uncovered)
+    candidates = np.flatnonzero(gains > 0)
+    best = candidates[np.lexsort((candidates, -gains[candidates]))][:beam_width]
+
+    children = []
+    for k_idx in best.tolist():
+        child = uncovered.copy()
+        child[index.covered_by(k_idx)] = False
+        children.append(
+            (num_uncovered - int(gains[k_idx]), selected + (k_idx,), np.packbits(child))
+        )
+    return children
+
+
+def _expand_in_worker(args: Tuple[BeamState, int]) -> List[BeamState]:
+    return expand_state(_worker_index, *args)
+
+
+def beam_search(
+    index: CoverageIndex,
+    beam_width: int,
+    workers: Optional[int] = None,
+    on_level: Optional[Callable[[int, int], None]] = None,
+    deadline: Optional[Deadline] = None,
+) -> List[int]:
+    """
+    Beam search for a small set of k-combinations covering every j-subset.
+
+    Args:
+        index: Coverage index of the instance.
+        beam_width: Number of partial covers kept per level (B).
+        workers: Processes used to expand states (None: up to B, capped by CPU count).
+        on_level: Optional callback(level, best num_uncovered) after each level.
+        deadline: Checked once per level; when it has passed the search
+            stops with the best partial cover.
+
+    Returns:
+        The selected k indices of the first complete cover found, in pick
+        order (empty if the candidates cannot cover every j-subset), or of
+        the best partial cover if the deadline passed first.
+    """
+    beam_width = max(1, beam_width)
+    if workers is None or workers <= 0:
+        workers = os.cpu_count() or 1
+    workers = min(workers, beam_width)
+
+    root: BeamState = (
+        index.num_j,
+        (),
+        np.packbits(np.ones(index.num_j, dtype=bool)),
+    )
+    beam = [root]
+    level = 0
+    pool = (
+        ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(index,))
+        if workers > 1
+        else None
+    )
+    print(
+        f"Beam search: B={beam_width}, {'%d worker processes' % workers if pool else 'in-process'}",
+        file=sys.stderr,
+    )
+    try:
+        while beam and beam[0][0] > 0:
+            if deadline is not None and deadline.expired():
+                print(
+                    f"Beam search: deadline reached after {level} levels, "
+                    f"{beam[0][0]} j-subsets still uncovered.",
+                    file=sys.stderr,
+                )
+                break
+            level += 1
+            tasks = [(state, beam_width) for state in beam]
+            if pool:
+                expanded = pool.map(_expand_in_worker, tasks)
+            else:
+                expanded = (expand_state(index, *task) for task in tasks)
+
+            # Keep the B children with the fewest uncovered j-subsets, dropping
+            # duplicates reached through different pick orders
+            children = sorted(
+                (child for batch in expanded for child in batch),
+                key=lambda c: (c[0], sorted(c[1])),
+            )
+            beam, seen = [], set()
+            for child in children:
+                key = frozenset(child[1])
+                if key not in seen:
+                    seen.add(key)
+                    beam.append(child)
+                    if len(beam) == beam_width:
+                        break
+            if on_level and beam:
+                on_level(level, beam[0][0])
+    finally:
+        if pool:
+            pool.shutdown()
+
+    if not beam:
+        print(
+            f"Warning: Beam search level {level}: No k-combo covers any *new* j-subset.",
+            file=sys.stderr,
+        )
+        return []
+    return list(beam[0][1])
@@ -1,199 +1,291 @@
-# Placeholder for Column Generation Solver
-# This will involve a more complex structure integrating a restricted master problem (RMP)
-# solved possibly with CP-SAT and a pricing subproblem to generate new columns (k-combinations).
+# Column generation for the threshold cover over the shared CSR coverage index
+# (utils.coverage.CoverageIndex).
+#
+# The restricted master problem (RMP) is the LP relaxation
+#     min sum_c x_c   s.t.   sum_{c covers r} x_c >= t  for every j-subset r,
+#                            0 <= x_c (<= 1 when t > 1; for t = 1 some LP
+#                            optimum has x_c <= 1 anyway)
+# over a pool of columns (k-combinations), solved with PDLP (or GLOP; the
+# simplex is slow on the highly degenerate LPs of symmetric instances, while
+# the first-order PDLP duals are accurate enough for pricing). Its row duals y
+# price every k-combination at once: the dual-weighted coverage score a_c . y
+# is a segment sum over the k->j CSR rows, and the columns with the most
+# negative reduced cost 1 - a_c . y enter the pool. For any y >= 0 both
+#     t * sum(y) / max(1, max_c a_c . y)     (y scaled to dual feasibility)
+#     t * sum(y) - sum_c max(0, a_c . y - 1)  (bound duals pay the excess)
+# are objectives of feasible solutions of the full LP dual, so every round
+# yields a valid lower bound, equal to the LP optimum once no column prices
+# out. The integer cover is then solved with CP-SAT over the generated pool.
 
-import itertools
+import math
 import sys
 import time
 from typing import Any, Dict, List, Optional, Tuple
 
-# Need to import necessary components from OR-Tools and potentially other modules
-# from ortools.sat.python import cp_model
-# import numpy as np
+import numpy as np
+from ortools.linear_solver import pywraplp
+from ortools.sat.python import cp_model
+from solver.greedy import bucket_greedy
+from utils.coverage import CoverageIndex, CoverageState
+from utils.deadline import Deadline
+
+# PDLP stops at this relative optimality gap; reduced costs above
+# -REDUCED_COST_TOL do not enter the pool since the duals are no more accurate
+PDLP_PARAMETERS = (
+    "termination_criteria { simple_optimality_criteria "
+    "{ eps_optimal_absolute: 1e-4 eps_optimal_relative: 1e-4 } }"
+)
+REDUCED_COST_TOL = 1e-4
+
+
+def _initial_pool(index: CoverageIndex, t: int) -> List[int]:
+    """A full cover to seed the pool: bucket greedy (t = 1) or lowest-index fill."""
+    if t == 1:
+        return bucket_greedy(index)[0]
+    state = CoverageState(index, t=t)
+    for row in range(index.num_j):
+        for k_idx in index.covering(row).tolist():
+            if state.counts[row] >= t:
+                break
+            if not state.selected[k_idx]:
+                state.add(k_idx)
+    return state.selected_indices().tolist()
 
 
-# Placeholder class or functions for the CG solver
 class ColumnGenerationSolver:
+    """
+    LP column generation plus an integer solve on the generated column pool.
+
+    Args:
+        index: Coverage index of the full instance.
+        t: Coverage threshold.
+        time_limit: Seconds for :meth:`solve` (default 30).
+        workers: CP-SAT search workers for the integer solve.
+        columns_per_round: Most columns added per pricing round.
+        max_rounds: Upper bound on pricing rounds.
+        lp_share: Fraction of the time limit given to column generation in
+            :meth:`solve`; the integer solve gets the rest.
+        lp_solver: OR-Tools linear solver for the master LP ("PDLP" or "GLOP").
+    """
+
     def __init__(
         self,
-        samples: List[int],
-        n: int,
-        k: int,
-        j: int,
-        s: int,
-        t: int,
-        time_limit: Optional[int] = None,
+        index: CoverageIndex,
+        t: int = 1,
+        time_limit: Optional[float] = None,
         workers: int = 1,
+        columns_per_round: int = 100,
+        max_rounds: int = 200,
+        lp_share: float = 0.5,
+        lp_solver: str = "PDLP",
     ):
-        self.samples = samples
-        self.n = n
-        self.k = k
-        self.j = j
-        self.s = s
+        uncoverable = np.count_nonzero(index.j_degrees() < t)
+        if uncoverable:
+            raise ValueError(
+                f"{uncoverable} j-subsets are covered by fewer than t={t} k-combinations."
+            )
+        self.index = index
         self.t = t
-        self.time_limit = time_limit
+        self.time_limit = time_limit or 30
         self.workers = workers
-        self.all_j_subsets = list(itertools.combinations(self.samples, self.j))
-        # ... other initializations ...
-        print("ColumnGenerationSolver initialized (Placeholder).", file=sys.stderr)
+        self.columns_per_round = columns_per_round
+        self.max_rounds = max_rounds
+        self.lp_share = lp_share
 
-    def solve(self):
-        """
-        Main loop for the column generation algorithm.
-        1. Initialize RMP with a small set of initial columns.
-        2. Loop:
-           a. Solve the current RMP (e.g., using CP-SAT or LP solver) to get primal and dual solutions.
-           b. Solve the pricing subproblem using dual values to find columns with negative reduced cost.
-           c. If profitable columns are found, add them to the RMP.
-           d. If no profitable columns found, the current RMP solution is optimal for the original problem.
-        """
-        print(
-            "Starting Column Generation solve process (Placeholder)...", file=sys.stderr
-        )
-        start_time = time.time()
+        self.initial = np.asarray(_initial_pool(index, t), dtype=np.int64)
+        self.in_pool = np.zeros(index.num_k, dtype=bool)
+        self.duals = np.zeros(index.num_j)
+        self.primal = np.zeros(index.num_k)  # Last RMP solution (0 outside the pool)
+        self.lower_bound = 0.0  # Best Lagrangian bound so far
+        self.stats: Dict[str, Any] = {
+            "rounds": 0,
+            "columns_added": 0,
+            "converged": False,
+            "lp_objective": None,
+            "lp_time": 0.0,
+            "ip_time": 0.0,
+        }
 
-        # --- Placeholder Logic ---
-        # 1. Generate initial set of columns (k-combinations)
-        initial_k_combos = self._generate_initial_columns()
-        current_k_combos = initial_k_combos[:]
+        self._lp = pywraplp.Solver.CreateSolver(lp_solver)
+        if self._lp is None:
+            raise ValueError(f"Linear solver '{lp_solver}' is not available")
+        if lp_solver == "PDLP":
+            self._lp.SetSolverSpecificParametersAsString(PDLP_PARAMETERS)
+        self._rows = [
+            self._lp.Constraint(float(t), self._lp.infinity())
+            for _ in range(index.num_j)
+        ]
+        self._objective = self._lp.Objective()
+        self._objective.SetMinimization()
+        self._columns: List[Tuple[int, pywraplp.Variable]] = []
+        self._add_columns(self.initial)
 
-        max_iterations = 10  # Limit iterations for placeholder
-        for iter_num in range(max_iterations):
-            print(f"\n--- CG Iteration {iter_num + 1} ---", file=sys.stderr)
-            print(
-                f"Current number of columns in RMP: {len(current_k_combos)}",
-                file=sys.stderr,
-            )
+    @property
+    def pool(self) -> np.ndarray:
+        """k indices of the generated columns (sorted)."""
+        return np.flatnonzero(self.in_pool)
 
-            # 2a. Solve RMP (Placeholder - simulate solving)
-            print(
-                "Solving Restricted Master Problem (RMP)... (Placeholder)",
-                file=sys.stderr,
-            )
-            # This would involve setting up and solving a model similar to _threshold_set_cover
-            # but only with `current_k_combos`. We'd need dual values if using LP relaxation.
-            # For CP-SAT, getting useful duals is harder. We might need LP or heuristics.
-            # Simulate getting duals (e.g., all ones for simplicity)
-            dual_values = {subset: 1.0 for subset in self.all_j_subsets}
-            print("Simulated RMP solved.", file=sys.stderr)
-
-            # 2b. Solve Pricing Subproblem (Placeholder - simulate finding columns)
-            print("Solving Pricing Subproblem...", file=sys.stderr)
-            new_profitable_columns = self._solve_pricing_subproblem(
-                dual_values, current_k_combos
-            )
+    def _add_columns(self, columns: np.ndarray) -> None:
+        inf = self._lp.infinity()
+        for c in columns.tolist():
+            var = self._lp.NumVar(0.0, 1.0 if self.t > 1 else inf, f"x_{c}")
+            self._objective.SetCoefficient(var, 1.0)
+            for r in self.index.covered_by(c).tolist():
+                self._rows[r].SetCoefficient(var, 1.0)
+            self._columns.append((c, var))
+        self.in_pool[columns] = True
+
+    def reduced_costs(self, duals: Optional[np.ndarray] = None) -> np.ndarray:
+        """1 - a_c . y for every k-combination (current duals by default)."""
+        y = self.duals if duals is None else duals
+        prefix = np.concatenate(([0.0], np.cumsum(y[self.index.k_indices])))
+        scores = prefix[self.index.k_indptr[1:]] - prefix[self.index.k_indptr[:-1]]
+        return 1.0 - scores
 
-            # 2c. Check and Add Columns
-            if not new_profitable_columns:
+    def priced_columns(self, limit: int) -> np.ndarray:
+        """Up to ``limit`` columns outside the pool, by increasing reduced cost."""
+        outside = np.flatnonzero(~self.in_pool)
+        order = np.argsort(self.reduced_costs()[outside], kind="stable")
+        return outside[order[:limit]]
+
+    def generate_columns(self, deadline: Optional[Deadline] = None) -> np.ndarray:
+        """
+        Runs pricing rounds until no column prices out, or the deadline or round limit.
+
+        Returns:
+            The column pool (sorted k indices); :attr:`lower_bound` holds the
+            best LP lower bound found and :attr:`primal` the last RMP solution.
+        """
+        deadline = deadline or Deadline(self.time_limit)
+        start = time.perf_counter()
+        for _ in range(self.max_rounds):
+            self._lp.SetTimeLimit(max(1, int(deadline.remaining() * 1000)))
+            status = self._lp.Solve()
+            if status != pywraplp.Solver.OPTIMAL:
                 print(
-                    "No more profitable columns found. CG potentially converged.",
+                    f"Column generation: RMP not solved to optimality (status {status}); stopping.",
                     file=sys.stderr,
                 )
                 break
-            else:
-                print(
-                    f"Found {len(new_profitable_columns)} new profitable column(s). Adding to RMP.",
-                    file=sys.stderr,
-                )
-                # Avoid adding duplicates explicitly, though pricing should ideally find new ones
-                added_count = 0
-                for col in new_profitable_columns:
-                    if col not in current_k_combos:  # Basic duplicate check
-                        current_k_combos.append(col)
-                        added_count += 1
-                print(f"Added {added_count} unique new columns.")
-                if added_count == 0:
-                    print(
-                        "No *unique* profitable columns found this iteration. Stopping.",
-                        file=sys.stderr,
-                    )
-                    break  # Stop if only duplicates were found
-
-        # 3. Final Solve (Optional: Solve RMP one last time with all generated columns)
-        print(
-            "\nPerforming final solve with all generated columns (Placeholder)...",
-            file=sys.stderr,
-        )
-        # final_solution = self._solve_final_rmp(current_k_combos)
+            self.stats["rounds"] += 1
+            self.stats["lp_objective"] = self._objective.Value()
+            self.duals = np.maximum(
+                0.0, np.array([row.dual_value() for row in self._rows])
+            )
+            for c, var in self._columns:
+                self.primal[c] = var.solution_value()
+            reduced = self.reduced_costs()
+            dual_value = self.t * self.duals.sum()
+            bound = max(
+                dual_value / max(1.0, 1.0 - reduced.min()),
+                dual_value + np.minimum(0.0, reduced).sum(),
+            )
+            self.lower_bound = max(self.lower_bound, float(bound))
 
-        end_time = time.time()
+            candidates = np.flatnonzero((reduced < -REDUCED_COST_TOL) & ~self.in_pool)
+            if not candidates.size:
+                self.stats["converged"] = True
+                break
+            if candidates.size > self.columns_per_round:
+                best = np.argpartition(reduced[candidates], self.columns_per_round - 1)[
+                    : self.columns_per_round
+                ]
+                candidates = candidates[best]
+            self._add_columns(candidates)
+            self.stats["columns_added"] += int(candidates.size)
+            if deadline.expired():
+                break
+        self.stats["lp_time"] = time.perf_counter() - start
         print(
-            f"Column Generation placeholder finished in {end_time - start_time:.3f}s.",
+            f"Column generation: {self.stats['rounds']} rounds, pool {int(self.in_pool.sum())}/{self.index.num_k} columns, "
+            f"RMP objective {self.stats['lp_objective']}, lower bound {self.lower_bound:.3f}"
+            f"{' (converged)' if self.stats['converged'] else ''}.",
             file=sys.stderr,
         )
+        return self.pool
 
-        # Placeholder result - return some of the generated combos
-        # The actual result should come from the final RMP solve
-        return current_k_combos[
-            : min(len(current_k_combos), 10)
-        ]  # Return first 10 found combos
-
-    def _generate_initial_columns(self) -> List[Tuple[int, ...]]:
-        """Generates a small starting set of k-combinations."""
-        print("Generating initial columns (Placeholder)...", file=sys.stderr)
-        # Simple strategy: take the first N combinations
-        initial_cols = list(
-            itertools.islice(itertools.combinations(self.samples, self.k), 50)
-        )
-        print(f"Generated {len(initial_cols)} initial columns.", file=sys.stderr)
-        return initial_cols
-
-    def _solve_pricing_subproblem(
-        self,
-        dual_values: Dict[Tuple[int, ...], float],
-        existing_columns: List[Tuple[int, ...]],
-    ) -> List[Tuple[int, ...]]:
+    def solve_integer(self, deadline: Optional[Deadline] = None) -> List[int]:
         """
-        Finds k-combinations with negative reduced cost.
-        Reduced Cost(k_combo) = Cost(k_combo) - Sum(dual_values[j_subset] * coverage[k_combo, j_subset])
-        Here, Cost = 1 for each k_combo. Coverage is 1 if k_combo covers j_subset (s-level), 0 otherwise.
-        We want to find k_combo that maximizes: Sum(dual_values[j_subset] * coverage[k_combo, j_subset])
-        If Max Sum > 1, then the reduced cost is negative.
-        (Placeholder Implementation)
+        CP-SAT over the pool, hinted with the initial cover and bounded below
+        by the LP bound; returns the initial cover if no solution is found.
         """
-        print("Solving Pricing Subproblem (Placeholder)...", file=sys.stderr)
-        # Simulate finding one new column that wasn't previously present
-        # This requires generating many potential k-combinations and evaluating their reduced cost.
-        # For this placeholder, just find *any* k-combo not already in existing_columns.
-        existing_set = set(existing_columns)
-        for potential_col in itertools.combinations(self.samples, self.k):
-            if potential_col not in existing_set:
-                print(f"Found potential new column: {potential_col}", file=sys.stderr)
-                # Simulate it having negative reduced cost
-                return [potential_col]
-        return []  # No new columns found
-
-    def _solve_final_rmp(
-        self, final_columns: List[Tuple[int, ...]]
-    ) -> List[Tuple[int, ...]]:
-        """Solves the Set Cover problem using only the provided columns."""
+        deadline = deadline or Deadline(self.time_limit)
+        pool = self.pool
+        pool_pos = np.full(self.index.num_k, -1, dtype=np.int64)
+        pool_pos[pool] = np.arange(pool.size)
+
+        model = cp_model.CpModel()
+        x = [model.NewBoolVar(f"x_{c}") for c in pool.tolist()]
+        positions = pool_pos[self.index.j_indices]
+        j_indptr = self.index.j_indptr.tolist()
+        for r in range(self.index.num_j):
+            row = positions[j_indptr[r] : j_indptr[r + 1]]
+            literals = [x[p] for p in row[row >= 0].tolist()]
+            if self.t == 1:
+                model.AddBoolOr(literals)
+            else:
+                model.Add(cp_model.LinearExpr.Sum(literals) >= self.t)
+        objective = cp_model.LinearExpr.Sum(x)
+        model.Minimize(objective)
+        model.Add(objective <= int(self.initial.size))
+        model.Add(objective >= math.ceil(self.lower_bound - 1e-6))
+        hinted = np.zeros(pool.size, dtype=bool)
+        hinted[pool_pos[self.initial]] = True
+        for var, hint in zip(x, hinted.tolist()):
+            model.AddHint(var, int(hint))
+
+        solver = cp_model.CpSolver()
+        p = solver.parameters
+        p.max_time_in_seconds = max(0.1, deadline.remaining())
+        p.num_search_workers = self.workers
+        p.random_seed = 42
+        p.absolute_gap_limit = 0.99
+        status = solver.Solve(model)
+        self.stats["ip_time"] = solver.WallTime()
+        if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+            print(
+                f"Column generation: integer solve ended with {solver.StatusName(status)}; keeping the initial cover.",
+                file=sys.stderr,
+            )
+            return self.initial.tolist()
+        chosen = [c for c, var in zip(pool.tolist(), x) if solver.Value(var)]
         print(
-            f"Solving Final RMP with {len(final_columns)} columns (Placeholder)...",
+            f"Column generation: integer cover {len(chosen)} from {pool.size} columns ({solver.StatusName(status)}).",
             file=sys.stderr,
         )
-        # This would again use a solver like _threshold_set_cover
-        # For placeholder, just return a subset
-        return final_columns[: min(len(final_columns), 5)]
+        return chosen
+
+    def solve(self) -> Tuple[List[int], float, Dict[str, Any]]:
+        """
+        Column generation followed by the integer solve on the pool.
+
+        Returns:
+            (k indices of the cover, LP lower bound rounded up, stats with
+            rounds, added columns, pool size, convergence and timings)
+        """
+        deadline = Deadline(self.time_limit)
+        self.generate_columns(deadline.child(self.lp_share))
+        selected = self.solve_integer(deadline)
+        self.stats["pool_size"] = int(self.in_pool.sum())
+        return selected, float(math.ceil(self.lower_bound - 1e-6)), self.stats
 
 
-# Example usage (if needed for testing)
+# Example usage
 if __name__ == "__main__":
-    # Example parameters
-    m_cg = 50
-    n_cg = 15
-    k_cg = 6
-    j_cg = 5
-    s_cg = 4
-    t_cg = 1
-    samples_cg = list(range(1, n_cg + 1))  # Use first n numbers for simplicity
+    from utils import colex
+    from utils.coverage import build_coverage_index
 
+    n_cg, k_cg, j_cg, s_cg, t_cg = 12, 6, 5, 4, 1
     print(
-        f"Running CG Placeholder Example: m={m_cg}, n={n_cg}, k={k_cg}, j={j_cg}, s={s_cg}, t={t_cg}"
+        f"Running column generation: n={n_cg}, k={k_cg}, j={j_cg}, s={s_cg}, t={t_cg}"
     )
-
-    cg_solver = ColumnGenerationSolver(samples_cg, n_cg, k_cg, j_cg, s_cg, t_cg)
-    placeholder_solution = cg_solver.solve()
-
-    print("\nPlaceholder CG Solution (subset of generated columns):")
-    for combo in placeholder_solution:
-        print(combo)
+    index_cg = build_coverage_index(
+        colex.masks(np.arange(colex.num_subsets(n_cg, k_cg)), n_cg, k_cg),
+        colex.masks(np.arange(colex.num_subsets(n_cg, j_cg)), n_cg, j_cg),
+        s_cg,
+        n_cg,
+    )
+    cover, bound, cg_stats = ColumnGenerationSolver(
+        index_cg, t_cg, time_limit=20
+    ).solve()
+    print(f"Cover size {len(cover)}, lower bound {bound}, stats {cg_stats}")
@@ -0,0 +1,136 @@
+# GRASP multi-start greedy for the threshold cover (t = 1) over the shared CSR
+# coverage index (utils.coverage.CoverageIndex).
+#
+# Each start is a randomized greedy: at every step it picks uniformly among the
+# candidates whose gain is within alpha of the best (the restricted candidate
+# list), then drops redundant picks. Starts run in worker processes that map
+# the CSR arrays from shared memory (solver.shared_index) instead of receiving
+# a pickled copy. With a deadline the starts run in batches of one per worker,
+# no batch is launched once it has passed, and every start stops at it.
+
+import random
+import sys
+from contextlib import ExitStack
+from typing import List, Optional, Tuple
+
+import numpy as np
+from solver.shared_index import shared_index_pool, worker_index
+from utils.coverage import CoverageIndex, CoverageState
+from utils.deadline import Deadline
+
+
+def randomized_greedy(
+    index: CoverageIndex,
+    alpha: float,
+    seed: Optional[int] = None,
+    time_limit: Optional[float] = None,
+) -> List[int]:
+    """
+    One GRASP construction: greedy with a restricted candidate list.
+
+    Args:
+        index: Coverage index of the instance.
+        alpha: Candidates with gain >= (1 - alpha) * max gain form the
+            restricted list (0: random tie-breaking among maximum-gain
+            candidates only).
+        seed: Seed for the choice within the restricted list.
+        time_limit: Seconds for the construction (unbounded if None).
+
+    Returns:
+        k indices of the cover after dropping redundant picks (last pick kept
+        longest), or a partial selection if the candidates cannot cover every
+        j-subset or the time limit is reached first.
+    """
+    deadline = Deadline(time_limit) if time_limit is not None else None
+    rng = random.Random(seed)
+    gain = index.k_degrees().astype(np.int64)
+    satisfied = np.zeros(index.num_j, dtype=bool)
+    num_satisfied = 0
+    selected: List[int] = []
+
+    while num_satisfied < index.num_j:
+        if deadline is not None and deadline.expired():
+            break
+        live = np.flatnonzero(gain > 0)
+        if not live.size:
+            break
+        rcl = live[gain[live] >= (1 - alpha) * gain[live].max()]
+        k_idx = int(rcl[rng.randrange(rcl.size)])
+        selected.append(k_idx)
+
+        covered = index.covered_by(k_idx)
+        fresh = covered[~satisfied[covered]]
+        satisfied[fresh] = True
+        num_satisfied += int(fresh.size)
+        # Incremental gains: every k covering a newly satisfied j-subset loses one
+        gain -= np.bincount(index.covering_many(fresh), minlength=index.num_k)
+
+    if num_satisfied < index.num_j:
+        return selected
+    state = CoverageState(index, selected_k=selected)
+    for k_idx in selected:  # Early picks are the most likely to be redundant
+        if state.can_remove(k_idx):
+            state.remove(k_idx)
+    return state.selected_indices().tolist()
+
+
+def _start_in_worker(args: Tuple[float, int, Optional[float]]) -> List[int]:
+    return randomized_greedy(worker_index(), *args)
+
+
+def grasp_multi_start(
+    index: CoverageIndex,
+    num_starts: int,
+    alpha: float = 0.05,
+    seed: Optional[int] = None,
+    workers: int = 1,
+    deadline: Optional[Deadline] = None,
+) -> List[int]:
+    """
+    Runs ``num_starts`` GRASP constructions and returns the smallest full cover.
+
+    Args:
+        index: Coverage index of the instance.
+        num_starts: Number of randomized starts.
+        alpha: Restricted candidate list width (see :func:`randomized_greedy`).
+        seed: Base seed; start i uses seed + i (random base seed if None).
+        workers: Worker processes; the index is shared through shared memory
+            when greater than 1.
+        deadline: When to stop. Starts then run in batches of ``workers``;
+            no batch starts after the deadline and each start gets the time
+            left when its batch is launched.
+
+    Returns:
+        k indices of the best cover found (empty if no start completed).
+    """
+    base_seed = seed if seed is not None else random.randrange(2**31)
+    seeds = [base_seed + i for i in range(num_starts)]
+    workers = max(1, min(workers, num_starts))
+    batch_size = workers if deadline is not None else max(1, num_starts)
+
+    covers: List[List[int]] = []
+    with ExitStack() as stack:
+        pool = None
+        if workers > 1:
+            pool = stack.enter_context(shared_index_pool(index, workers))
+        for first in range(0, num_starts, batch_size):
+            if deadline is not None and deadline.expired():
+                break
+            time_limit = deadline.remaining() if deadline is not None else None
+            tasks = [
+                (alpha, start_seed, time_limit)
+                for start_seed in seeds[first : first + batch_size]
+            ]
+            if pool is not None:
+                covers.extend(pool.map(_start_in_worker, tasks))
+            else:
+                covers.extend(randomized_greedy(index, *task) for task in tasks)
+
+    complete = [c for c in covers if index.is_cover(c)]
+    sizes = sorted(len(c) for c in complete)
+    print(
+        f"GRASP: {len(covers)}/{num_starts} starts (alpha={alpha}, {workers} processes), "
+        f"{len(complete)} complete, sizes {sizes[:1] + sizes[-1:] if sizes else []} (best, worst)",
+        file=sys.stderr,
+    )
+    return min(complete, key=len) if complete else []
@@ -0,0 +1,337 @@
+# Greedy selection engines for the threshold cover, operating on the shared
+# CSR coverage index (utils.coverage.CoverageIndex).
+#
+# Every engine picks, at each step, the k-combination that satisfies the most
+# still-unsatisfied j-subsets, breaking ties by the lowest k index, so the
+# engines return the same selection order and differ only in how much work
+# they spend finding the argmax. The opt-in stochastic engine is the exception:
+# it takes the argmax over a random sample of candidates. Each returns
+# (selected k indices, stats); given a deadline, an engine stops picking once
+# it has passed and returns the partial selection.
+
+import heapq
+import math
+import sys
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+from utils.coverage import CoverageIndex
+from utils.deadline import Deadline
+
+# on_pick(iteration, k_idx, gain, num_satisfied) is called after each selection
+PickCallback = Optional[Callable[[int, int, int, int], None]]
+
+
+def exact_greedy(
+    index: CoverageIndex,
+    on_pick: PickCallback = None,
+    deadline: Optional[Deadline] = None,
+) -> Tuple[List[int], Dict[str, int]]:
+    """
+    Reference greedy: rescores every remaining candidate in every iteration.
+
+    ``stats["evaluations"]`` counts candidate scorings (one per remaining
+    candidate per iteration).
+    """
+    num_j_subsets = index.num_j
+    # Inverted index: map j_subset index to list of k_combo indices that cover it
+    j_to_k: Dict[int, List[int]] = {
+        js_idx: index.covering(js_idx).tolist() for js_idx in range(num_j_subsets)
+    }
+    satisfied_j_mask = np.zeros(num_j_subsets, dtype=bool)
+    num_satisfied = 0
+    candidate_k_indices_set = set(
+        range(index.num_k)
+    )  # Use set for faster removal check
+    selected_k_indices = []  # Store selected indices in order
+    iter_count = 0
+    evaluations = 0
+
+    while num_satisfied < num_j_subsets and candidate_k_indices_set:
+        if deadline is not None and deadline.expired():
+            break
+        iter_count += 1
+        unsatisfied_j_indices = np.where(~satisfied_j_mask)[0]
+        if not unsatisfied_j_indices.size:
+            print(f"Iteration {iter_count}: All j-subsets satisfied.", file=sys.stderr)
+            break
+
+        # Calculate scores (counts of newly covered j-subsets) for candidate k-combos
+        k_combo_scores: Dict[int, int] = {k_idx: 0 for k_idx in candidate_k_indices_set}
+        num_candidate_k = len(candidate_k_indices_set)
+        evaluations += num_candidate_k
+        print(
+            f"Iteration {iter_count}: Scoring {num_candidate_k} candidates against {len(unsatisfied_j_indices)} unsatisfied j-subsets...",
+            file=sys.stderr,
+        )
+
+        # Iterate through unsatisfied j-subsets and increment score for covering candidate k-combos
+        for js_idx in unsatisfied_j_indices:
+            for k_idx in j_to_k.get(js_idx, []):
+                # Increment score only if the k_combo is still a candidate
+                if k_idx in k_combo_scores:
+                    k_combo_scores[k_idx] += 1
+
+        # Find the k_idx with the maximum score (first, i.e. lowest, index on ties)
+        non_zero_scores = {k: v for k, v in k_combo_scores.items() if v > 0}
+        if not non_zero_scores:
+            print(
+                f"Warning: Greedy iteration {iter_count}: No k-combo covers any *new* j-subset.",
+                file=sys.stderr,
+            )
+            break  # No progress possible
+        best_k_idx_iter = max(non_zero_scores, key=non_zero_scores.get)
+        best_count_iter = non_zero_scores[best_k_idx_iter]
+
+        # Add the best k-combo to the results
+        selected_k_indices.append(best_k_idx_iter)
+        candidate_k_indices_set.remove(best_k_idx_iter)  # Remove selected index
+
+        # Find indices of unsatisfied j-subsets that are covered by the chosen k_idx
+        newly_satisfied_indices = [
+            js_idx
+            for js_idx in unsatisfied_j_indices
+            if best_k_idx_iter in j_to_k.get(js_idx, [])
+        ]
+        if newly_satisfied_indices:
+            satisfied_j_mask[newly_satisfied_indices] = True
+            num_satisfied = int(np.sum(satisfied_j_mask))  # Update total count
+
+        if on_pick:
+            on_pick(iter_count, best_k_idx_iter, best_count_iter, num_satisfied)
+
+    return selected_k_indices, {"iterations": iter_count, "evaluations": evaluations}
+
+
+def lazy_greedy(
+    index: CoverageIndex,
+    on_pick: PickCallback = None,
+    deadline: Optional[Deadline] = None,
+) -> Tuple[List[int], Dict[str, int]]:
+    """
+    Lazy greedy (CELF) selection.
+
+    Coverage gain is submodular, so a candidate's last computed gain is an
+    upper bound on its current gain. Candidates sit in a max-heap keyed by
+    (stale gain, index); only the popped candidate is re-evaluated, and it is
+    selected when its fresh gain still beats the next stale bound.
+
+    ``stats["evaluations"]`` counts gain re-evaluations.
+    """
+    satisfied = np.zeros(index.num_j, dtype=bool)
+    num_satisfied = 0
+    heap = [(-int(degree), k_idx) for k_idx, degree in enumerate(index.k_degrees())]
+    heapq.heapify(heap)
+    selected_k_indices: List[int] = []
+    evaluations = 0
+
+    while num_satisfied < index.num_j and heap:
+        if deadline is not None and deadline.expired():
+            break
+        neg_bound, k_idx = heapq.heappop(heap)
+        if neg_bound == 0:
+            print(
+                f"Warning: Lazy greedy iteration {len(selected_k_indices) + 1}: No k-combo covers any *new* j-subset.",
+                file=sys.stderr,
+            )
+            break
+        covered = index.covered_by(k_idx)
+        fresh = covered[~satisfied[covered]]
+        evaluations += 1
+        gain = int(fresh.size)
+        if gain == 0:
+            continue  # Can never gain again
+        if heap and (-gain, k_idx) > heap[0]:
+            heapq.heappush(heap, (-gain, k_idx))  # Stale bound was too optimistic
+            continue
+
+        selected_k_indices.append(k_idx)
+        satisfied[fresh] = True
+        num_satisfied += gain
+        if on_pick:
+            on_pick(len(selected_k_indices), k_idx, gain, num_satisfied)
+
+    print(
+        f"Lazy greedy: {len(selected_k_indices)} picks with {evaluations} gain evaluations "
+        f"(exact greedy would rescore every remaining candidate each iteration).",
+        file=sys.stderr,
+    )
+    return selected_k_indices, {
+        "iterations": len(selected_k_indices),
+        "evaluations": evaluations,
+    }
+
+
+def bucket_greedy(
+    index: CoverageIndex,
+    on_pick: PickCallback = None,
+    deadline: Optional[Deadline] = None,
+) -> Tuple[List[int], Dict[str, int]]:
+    """
+    Greedy with incrementally maintained gains in bucket queues.
+
+    ``gain[k]`` is the number of unsatisfied j-subsets k covers. When a pick
+    satisfies j-subsets, the gains of every k-combination covering them are
+    decremented through the j->k rows, so no candidate is ever rescored.
+    ``buckets[g]`` holds chunks of candidates that had gain g when pushed;
+    the changed candidates of a pick are pushed in bulk, one chunk per new
+    gain value. Gains only decrease, so no candidate is pushed into the top
+    bucket once the pointer has reached it: its chunks are merged, filtered
+    and sorted once on arrival, and after each pick the entries whose gain has
+    since dropped are filtered out in one vectorized pass. The first live
+    entry is the lowest index with the highest gain; total work scales with
+    the number of nonzeros in the coverage matrix.
+
+    ``stats["evaluations"]`` counts gain decrements.
+    """
+    gain = index.k_degrees().astype(np.int64)
+    selected = np.zeros(index.num_k, dtype=bool)
+    satisfied = np.zeros(index.num_j, dtype=bool)
+    top = int(gain.max()) if gain.size else 0
+    # Stable sort by gain keeps indices ascending inside each bucket
+    order = np.argsort(gain, kind="stable")
+    bounds = np.searchsorted(gain[order], np.arange(top + 2))
+    buckets: List[List[np.ndarray]] = [
+        [order[bounds[g] : bounds[g + 1]]] for g in range(top + 1)
+    ]
+    current = buckets[top].pop()  # Live entries of the top bucket, sorted
+    num_satisfied = 0
+    selected_k_indices: List[int] = []
+    evaluations = 0
+
+    while num_satisfied < index.num_j:
+        if deadline is not None and deadline.expired():
+            break
+        # Drop stale entries; move the pointer down while the top bucket is empty
+        current = current[(gain[current] == top) & ~selected[current]]
+        while not current.size and top > 0:
+            top -= 1
+            # Gains strictly decrease, so a candidate is pushed at most once per bucket
+            merged = np.concatenate(buckets[top])
+            buckets[top] = []
+            current = np.sort(merged[(gain[merged] == top) & ~selected[merged]])
+        if top == 0:
+            print(
+                f"Warning: Bucket greedy iteration {len(selected_k_indices) + 1}: No k-combo covers any *new* j-subset.",
+                file=sys.stderr,
+            )
+            break
+
+        k_idx = int(current[0])
+        selected[k_idx] = True
+        selected_k_indices.append(k_idx)
+        covered = index.covered_by(k_idx)
+        fresh = covered[~satisfied[covered]]
+        satisfied[fresh] = True
+        num_satisfied += int(fresh.size)
+
+        # Decrement the gain of every k-combination covering a newly satisfied j-subset
+        affected = index.covering_many(fresh)
+        evaluations += int(affected.size)
+        changed, counts = np.unique(affected, return_counts=True)
+        gain[changed] -= counts
+        changed = changed[(gain[changed] > 0) & ~selected[changed]]
+        if changed.size:
+            by_gain = changed[np.argsort(gain[changed], kind="stable")]
+            new_gains = gain[by_gain]
+            starts = np.flatnonzero(np.diff(new_gains, prepend=-1))
+            for begin, end in zip(
+                starts.tolist(), np.append(starts[1:], by_gain.size).tolist()
+            ):
+                buckets[int(new_gains[begin])].append(by_gain[begin:end])
+
+        if on_pick:
+            on_pick(len(selected_k_indices), k_idx, int(fresh.size), num_satisfied)
+
+    print(
+        f"Bucket greedy: {len(selected_k_indices)} picks with {evaluations} gain decrements "
+        f"(coverage matrix nnz = {index.nnz}).",
+        file=sys.stderr,
+    )
+    return selected_k_indices, {
+        "iterations": len(selected_k_indices),
+        "evaluations": evaluations,
+    }
+
+
+def stochastic_greedy(
+    index: CoverageIndex,
+    on_pick: PickCallback = None,
+    epsilon: float = 0.1,
+    seed: Optional[int] = None,
+    deadline: Optional[Deadline] = None,
+) -> Tuple[List[int], Dict[str, int]]:
+    """
+    Stochastic greedy: scores only a random sample of candidates per pick.
+
+    Each iteration samples (num_k / K) * log(1 / epsilon) candidates, where K
+    estimates the cover size as ceil(num_j / max degree), and selects the
+    best sampled one (lowest index on ties). If no sampled candidate gains
+    anything, all candidates are scored so the cover still completes. Unlike
+    the other engines, the selection depends on ``seed``. ``epsilon`` must
+    lie strictly between 0 and 1; at least one candidate is sampled per pick.
+
+    ``stats["evaluations"]`` counts candidate scorings.
+    """
+    if not 0 < epsilon < 1:
+        raise ValueError(f"epsilon ({epsilon}) must satisfy 0 < epsilon < 1")
+    rng = np.random.default_rng(seed)
+    degrees = index.k_degrees()
+    unsatisfied = np.ones(index.num_j, dtype=bool)
+    num_satisfied = 0
+    selected_k_indices: List[int] = []
+    evaluations = 0
+    est_size = max(1, math.ceil(index.num_j / max(1, int(degrees.max(initial=0)))))
+    sample_size = max(
+        1,
+        min(index.num_k, math.ceil(index.num_k / est_size * math.log(1 / epsilon))),
+    )
+
+    def _score(candidates: np.ndarray) -> np.ndarray:
+        hits = unsatisfied[index.covered_by_many(candidates)]
+        prefix = np.concatenate(([0], np.cumsum(hits, dtype=np.int64)))
+        ends = np.cumsum(degrees[candidates])
+        return prefix[ends] - prefix[ends - degrees[candidates]]
+
+    while num_satisfied < index.num_j:
+        if deadline is not None and deadline.expired():
+            break
+        sample = np.unique(rng.integers(0, index.num_k, size=sample_size))
+        gains = _score(sample)
+        evaluations += int(sample.size)
+        if gains.max(initial=0) == 0:
+            sample = np.arange(index.num_k)
+            gains = _score(sample)
+            evaluations += index.num_k
+            if gains.max(initial=0) == 0:
+                print(
+                    f"Warning: Stochastic greedy iteration {len(selected_k_indices) + 1}: No k-combo covers any *new* j-subset.",
+                    file=sys.stderr,
+                )
+                break
+        best = int(np.argmax(gains))  # First maximum: lowest sampled index
+        k_idx, gain = int(sample[best]), int(gains[best])
+
+        selected_k_indices.append(k_idx)
+        unsatisfied[index.covered_by(k_idx)] = False
+        num_satisfied += gain
+        if on_pick:
+            on_pick(len(selected_k_indices), k_idx, gain, num_satisfied)
+
+    print(
+        f"Stochastic greedy: {len(selected_k_indices)} picks with {evaluations} candidate scorings "
+        f"({sample_size} sampled per pick, epsilon={epsilon}).",
+        file=sys.stderr,
+    )
+    return selected_k_indices, {
+        "iterations": len(selected_k_indices),
+        "evaluations": evaluations,
+    }
+
+
+GREEDY_ENGINES = {
+    "exact": exact_greedy,
+    "lazy": lazy_greedy,
+    "bucket": bucket_greedy,
+    "stochastic": stochastic_greedy,
+}
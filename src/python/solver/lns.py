@@ -0,0 +1,262 @@
+# Large-neighbourhood search over a threshold cover on the shared CSR coverage
+# index (utils.coverage.CoverageIndex).
+#
+# Each neighbourhood draws a random subset R of the samples and frees the
+# selected k-combinations that share the most samples with R (at most
+# max_free of them); the rest of the cover stays fixed. The j-subsets that
+# fall below t without the freed columns, together with the columns covering
+# them (the freed ones plus the best-scoring others, at most max_candidates),
+# form a small CP-SAT model built from the j->k CSR rows: cover every such
+# row up to t with as few columns as possible, hinted with the freed columns
+# and capped at their number. A strictly smaller replacement improves the
+# cover; an equal-size one is accepted as a sideways move. Neighbourhoods are
+# drawn in batches, solved in worker processes that map the CSR arrays from
+# shared memory (solver.shared_index), and applied one by one if they still
+# fit the current cover. The loop runs until the deadline.
+
+import sys
+from contextlib import ExitStack
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from ortools.sat.python import cp_model
+from solver.shared_index import shared_index_pool, worker_index
+from utils.coverage import CoverageIndex, CoverageState, popcount64
+from utils.deadline import Deadline
+
+# (freed columns, rows to cover, per-row demand, candidate columns)
+Neighbourhood = Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]
+
+
+def draw_neighbourhood(
+    index: CoverageIndex,
+    state: CoverageState,
+    k_masks: np.ndarray,
+    n: int,
+    rng: np.random.Generator,
+    num_samples: int = 4,
+    max_free: int = 8,
+    max_candidates: int = 100,
+) -> Optional[Neighbourhood]:
+    """
+    Frees the selected combinations closest to a random sample subset.
+
+    Args:
+        index: Coverage index of the instance.
+        state: Current cover.
+        k_masks: uint64 sample bitmask of every k-combination.
+        n: Number of samples.
+        rng: Random generator for the sample subset and tie-breaking.
+        num_samples: Size of the random sample subset R.
+        max_free: Most selected combinations to free.
+        max_candidates: Most columns in the sub-model (freed ones included).
+
+    Returns:
+        (freed, rows, demand, candidates), or None if no selected
+        combination touches R.
+    """
+    subset = rng.choice(n, size=min(num_samples, n), replace=False)
+    subset_mask = np.bitwise_or.reduce(np.uint64(1) << subset.astype(np.uint64))
+    selected = state.selected_indices()
+    overlap = popcount64(k_masks[selected] & subset_mask).astype(np.int64)
+    order = np.lexsort((rng.random(selected.size), -overlap))[:max_free]
+    freed = selected[order[overlap[order] > 0]]
+    if not freed.size:
+        return None
+
+    counts = state.counts - np.bincount(
+        index.covered_by_many(freed), minlength=index.num_j
+    )
+    rows = np.unique(index.covered_by_many(freed))
+    rows = rows[counts[rows] < state.t]
+    demand = state.t - counts[rows]
+    score = np.bincount(index.covering_many(rows), minlength=index.num_k)
+    score[state.selected] = 0  # Kept columns are already counted in ``counts``
+    score[freed] = np.iinfo(score.dtype).max  # Freed columns are always candidates
+    candidates = np.flatnonzero(score)
+    if candidates.size > max_candidates:
+        best = np.argpartition(-score[candidates], max_candidates - 1)
+        candidates = np.sort(candidates[best[:max_candidates]])
+    return freed, rows, demand, candidates
+
+
+def solve_neighbourhood(
+    index: CoverageIndex,
+    neighbourhood: Neighbourhood,
+    time_limit: float = 1.0,
+    seed: int = 0,
+) -> Optional[List[int]]:
+    """
+    Re-optimises one neighbourhood with CP-SAT.
+
+    Returns:
+        The replacement columns (at most as many as were freed), or None if
+        CP-SAT found no solution in time.
+    """
+    freed, rows, demand, candidates = neighbourhood
+    if not rows.size:
+        return []  # The freed columns were redundant
+    pos = np.full(index.num_k, -1, dtype=np.int64)
+    pos[candidates] = np.arange(candidates.size)
+
+    model = cp_model.CpModel()
+    x = [model.NewBoolVar(f"x_{c}") for c in candidates.tolist()]
+    for r, need in zip(rows.tolist(), demand.tolist()):
+        cols = pos[index.covering(r)]
+        literals = [x[p] for p in cols[cols >= 0].tolist()]
+        if need == 1:
+            model.AddBoolOr(literals)
+        else:
+            model.Add(cp_model.LinearExpr.Sum(literals) >= need)
+    objective = cp_model.LinearExpr.Sum(x)
+    model.Minimize(objective)
+    model.Add(objective <= int(freed.size))
+    for p in pos[freed].tolist():
+        model.AddHint(x[p], 1)
+
+    solver = cp_model.CpSolver()
+    solver.parameters.max_time_in_seconds = time_limit
+    solver.parameters.num_search_workers = 1
+    solver.parameters.random_seed = seed
+    status = solver.Solve(model)
+    if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+        return None
+    return [c for c, var in zip(candidates.tolist(), x) if solver.Value(var)]
+
+
+def _solve_in_worker(args: Tuple[Neighbourhood, float, int]) -> Optional[List[int]]:
+    return solve_neighbourhood(worker_index(), *args)
+
+
+def lns_improve(
+    index: CoverageIndex,
+    cover: Sequence[int],
+    k_masks: np.ndarray,
+    n: int,
+    t: int = 1,
+    deadline: Optional[Deadline] = None,
+    workers: int = 1,
+    seed: Optional[int] = None,
+    num_samples: int = 4,
+    max_free: int = 8,
+    max_candidates: int = 100,
+    sub_time: float = 1.0,
+    target: int = 0,
+) -> Tuple[List[int], Dict[str, Any]]:
+    """
+    Improves a cover by large-neighbourhood search until the deadline.
+
+    Args:
+        index: Coverage index of the instance.
+        cover: k indices of a full t-cover.
+        k_masks: uint64 sample bitmask of every k-combination.
+        n: Number of samples.
+        t: Coverage threshold.
+        deadline: When to stop (10 s from the call if None).
+        workers: Worker processes; each batch holds one neighbourhood per
+            worker and the index is shared through shared memory when
+            greater than 1.
+        seed: Seed for the neighbourhoods and the sub-models.
+        num_samples, max_free, max_candidates: Neighbourhood shape (see
+            :func:`draw_neighbourhood`).
+        sub_time: Upper bound on the CP-SAT time per neighbourhood.
+        target: Stop once the cover has at most this size (e.g. a lower bound).
+
+    Returns:
+        (k indices of the improved cover, stats with the neighbourhoods
+        solved, improvements, sideways moves and the size before and after)
+    """
+    deadline = deadline or Deadline(10.0)
+    rng = np.random.default_rng(seed)
+    state = CoverageState(index, t=t, selected_k=cover)
+    if not state.is_cover():
+        raise ValueError("lns_improve needs a full cover to start from")
+    stats = {
+        "initial_size": len(cover),
+        "neighbourhoods": 0,
+        "improvements": 0,
+        "sideways": 0,
+        "batches": 0,
+    }
+    workers = max(1, workers)
+    with ExitStack() as stack:
+        pool = None
+        if workers > 1:
+            pool = stack.enter_context(shared_index_pool(index, workers))
+        while deadline.remaining() > 0.05 and state.selected_indices().size > target:
+            time_limit = min(sub_time, deadline.remaining())
+            batch = []
+            for _ in range(workers):
+                neighbourhood = draw_neighbourhood(
+                    index, state, k_masks, n, rng, num_samples, max_free, max_candidates
+                )
+                if neighbourhood is not None:
+                    batch.append(neighbourhood)
+            if not batch:
+                continue
+            tasks = [(nb, time_limit, int(rng.integers(2**31))) for nb in batch]
+            if pool is not None:
+                replacements = list(pool.map(_solve_in_worker, tasks))
+            else:
+                replacements = [solve_neighbourhood(index, *task) for task in tasks]
+            stats["batches"] += 1
+            stats["neighbourhoods"] += len(batch)
+
+            # Apply the best replacements first; skip those the earlier ones invalidated
+            results = sorted(
+                (
+                    (len(new) - nb[0].size, nb[0], new)
+                    for nb, new in zip(batch, replacements)
+                    if new is not None
+                ),
+                key=lambda item: item[0],
+            )
+            for delta, freed, new in results:
+                added = np.setdiff1d(np.asarray(new, dtype=np.int64), freed)
+                if not state.selected[freed].all() or state.selected[added].any():
+                    continue  # An earlier move of this batch took or freed them
+                if delta == 0 and set(new) == set(freed.tolist()):
+                    continue
+                for c in freed.tolist():
+                    state.remove(c)
+                for c in new:
+                    state.add(c)
+                if not state.is_cover():  # Another move changed the kept columns
+                    for c in new:
+                        state.remove(c)
+                    for c in freed.tolist():
+                        state.add(c)
+                    continue
+                stats["improvements" if delta < 0 else "sideways"] += 1
+
+    result = state.selected_indices().tolist()
+    stats["final_size"] = len(result)
+    print(
+        f"LNS: {stats['neighbourhoods']} neighbourhoods in {stats['batches']} batches "
+        f"({workers} processes), {stats['improvements']} improvements, {stats['sideways']} sideways moves; "
+        f"cover {stats['initial_size']} -> {stats['final_size']}.",
+        file=sys.stderr,
+    )
+    return result, stats
+
+
+# Example usage
+if __name__ == "__main__":
+    from solver.greedy import bucket_greedy
+    from utils import colex
+    from utils.coverage import build_coverage_index
+
+    n_lns, k_lns, j_lns, s_lns = 14, 6, 5, 4
+    print(f"Running LNS: n={n_lns}, k={k_lns}, j={j_lns}, s={s_lns}")
+    masks_lns = colex.masks(np.arange(colex.num_subsets(n_lns, k_lns)), n_lns, k_lns)
+    index_lns = build_coverage_index(
+        masks_lns,
+        colex.masks(np.arange(colex.num_subsets(n_lns, j_lns)), n_lns, j_lns),
+        s_lns,
+        n_lns,
+    )
+    cover_lns, _ = bucket_greedy(index_lns)
+    improved, lns_stats = lns_improve(
+        index_lns, cover_lns, masks_lns, n_lns, deadline=Deadline(10), seed=0
+    )
+    print(f"Greedy {len(cover_lns)} -> LNS {len(improved)}, stats {lns_stats}")
@@ -0,0 +1,125 @@
+# Swap-based local search for the threshold cover (t = 1) over the shared CSR
+# coverage index (utils.coverage.CoverageIndex).
+#
+# A j-subset covered by exactly one selected k-combination a is "critical" for
+# a. A replacement for a must cover all of a's critical j-subsets, so the
+# candidates are found by counting, over the j->k rows of those j-subsets, how
+# often each k-combination appears. 2-for-1 swaps (shrink the cover) replace
+# two selected combinations a, b by one candidate of both; 1-for-1 swaps keep
+# the size but move the cover across plateaus so new 2-for-1 swaps appear.
+# Coverage is tracked incrementally with CoverageState.
+
+import random
+import sys
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from utils.coverage import CoverageIndex, CoverageState
+
+
+def _replacement_mask(state: CoverageState, k_idx: int) -> np.ndarray:
+    """Boolean mask of unselected k-combinations covering every critical j-subset of ``k_idx``."""
+    index = state.index
+    rows = index.covered_by(k_idx)
+    critical = rows[state.counts[rows] == 1]
+    hits = np.bincount(index.covering_many(critical), minlength=index.num_k)
+    return (hits == critical.size) & ~state.selected
+
+
+def _try_two_for_one(
+    state: CoverageState, masks: Dict[int, np.ndarray], deadline: float
+) -> bool:
+    """Applies the first 2-for-1 swap that keeps a full cover."""
+    selected = state.selected_indices().tolist()
+    for pos, a in enumerate(selected):
+        if time.perf_counter() >= deadline:
+            break
+        for b in selected[pos + 1 :]:
+            candidates = np.flatnonzero(masks[a] & masks[b])
+            if not candidates.size:
+                continue
+            state.remove(a)
+            state.remove(b)
+            for c in candidates.tolist():
+                # c covers the critical rows of a and b; it must also cover
+                # the rows that only a and b together were covering
+                state.add(c)
+                if state.is_cover():
+                    return True
+                state.remove(c)
+            state.add(a)
+            state.add(b)
+    return False
+
+
+def swap_local_search(
+    index: CoverageIndex,
+    selected_k: Sequence[int],
+    time_budget: float,
+    seed: Optional[int] = None,
+    max_stall: int = 200,
+) -> Tuple[List[int], Dict[str, int]]:
+    """
+    Improves a full cover with 2-for-1 and 1-for-1 swaps until the time budget runs out.
+
+    Args:
+        index: Coverage index of the instance.
+        selected_k: k indices of a full cover (t = 1).
+        time_budget: Seconds to spend.
+        seed: Seed for the choice of 1-for-1 swaps.
+        max_stall: Stop after this many consecutive 1-for-1 swaps without a
+            2-for-1 improvement.
+
+    Returns:
+        (k indices of the improved cover, stats with the number of each swap kind)
+    """
+    deadline = time.perf_counter() + time_budget
+    state = CoverageState(index, selected_k=selected_k)
+    stats = {"two_for_one": 0, "one_for_one": 0, "removed": 0}
+    if not state.is_cover():
+        print(
+            "Warning: swap local search needs a full cover; skipping.", file=sys.stderr
+        )
+        return list(selected_k), stats
+
+    rng = random.Random(seed)
+    best = state.selected_indices().tolist()
+    stall = 0
+    while time.perf_counter() < deadline and stall < max_stall:
+        # Redundant combinations (no critical j-subsets) are dropped outright
+        redundant = [
+            a for a in state.selected_indices().tolist() if state.can_remove(a)
+        ]
+        for a in redundant:
+            if state.can_remove(a):
+                state.remove(a)
+                stats["removed"] += 1
+
+        masks = {
+            a: _replacement_mask(state, a) for a in state.selected_indices().tolist()
+        }
+        if _try_two_for_one(state, masks, deadline):
+            stats["two_for_one"] += 1
+            stall = 0
+        else:
+            # Plateau move: swap a random selected combination for a random replacement
+            movable = [a for a, mask in masks.items() if mask.any()]
+            if not movable:
+                break
+            a = rng.choice(movable)
+            c = int(rng.choice(np.flatnonzero(masks[a])))
+            state.remove(a)
+            state.add(c)
+            stats["one_for_one"] += 1
+            stall += 1
+
+        if int(np.count_nonzero(state.selected)) < len(best):
+            best = state.selected_indices().tolist()
+
+    print(
+        f"Swap local search: {len(selected_k)} -> {len(best)} "
+        f"({stats['two_for_one']} 2-for-1, {stats['one_for_one']} 1-for-1, {stats['removed']} removals)",
+        file=sys.stderr,
+    )
+    return best, stats
@@ -0,0 +1,206 @@
+# LP relaxation bound and randomized rounding for the threshold cover over the
+# shared CSR coverage index (utils.coverage.CoverageIndex).
+#
+# The LP relaxation
+#     min sum_c x_c   s.t.   sum_{c covers r} x_c >= t,   0 <= x_c <= 1
+# is solved with solver.cg_solver (PDLP or GLOP). Up to FULL_LP_NNZ coverage
+# entries every column that prices out enters after the first round, which is
+# about as fast as building the full LP directly; larger instances add a
+# limited number of columns per round. The dual bound holds for every cover.
+# Each rounding picks column c with probability min(1, scale * x_c),
+# then greedily repairs the rows still below t (most deficient rows covered,
+# ties broken by the larger x_c) and finally drops redundant columns, lowest
+# x_c first. Rounds are independent and seeded, and run in batches of one per
+# worker process, mapping the CSR arrays from shared memory
+# (solver.shared_index); no batch is launched once the time limit has passed.
+
+import math
+import sys
+import time
+from contextlib import ExitStack
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from solver.cg_solver import ColumnGenerationSolver
+from solver.shared_index import shared_index_pool, worker_index
+from utils.coverage import CoverageIndex, CoverageState
+from utils.deadline import Deadline
+
+# Coverage entries up to which the LP takes every improving column at once
+FULL_LP_NNZ = 2_000_000
+
+
+def round_and_repair(
+    index: CoverageIndex,
+    x: np.ndarray,
+    t: int = 1,
+    seed: Optional[int] = None,
+    scale: float = 1.0,
+) -> List[int]:
+    """
+    One randomized rounding of an LP solution, repaired into a cover.
+
+    Args:
+        index: Coverage index of the instance.
+        x: LP value of every k-combination.
+        t: Coverage threshold.
+        seed: Seed for the rounding.
+        scale: Column c is picked with probability min(1, scale * x_c).
+
+    Returns:
+        k indices of the cover (a partial selection if some j-subset cannot
+        be covered t times).
+    """
+    rng = np.random.default_rng(seed)
+    picked = rng.random(index.num_k) < np.minimum(1.0, scale * x)
+    counts = np.bincount(
+        index.covered_by_many(np.flatnonzero(picked)), minlength=index.num_j
+    )
+    deficit = np.maximum(0, t - counts)
+
+    # gain[c]: rows below t that c would count towards (-1 once c is picked)
+    prefix = np.concatenate(([0], np.cumsum(deficit[index.k_indices] > 0)))
+    gain = prefix[index.k_indptr[1:]] - prefix[index.k_indptr[:-1]]
+    gain[picked] = -1
+    tie_break = 0.5 * np.clip(x, 0.0, 1.0)  # < 1: only orders equal gains
+    while True:
+        best = int(np.argmax(gain + tie_break))
+        if gain[best] <= 0:
+            break  # Every row reached t, or no column helps the rest
+        picked[best] = True
+        gain[best] = -1
+        rows = index.covered_by(best)
+        rows = rows[deficit[rows] > 0]
+        deficit[rows] -= 1
+        done = rows[deficit[rows] == 0]
+        # Every unpicked column covering a row that just reached t loses one
+        gain -= np.bincount(index.covering_many(done), minlength=index.num_k)
+        gain[picked] = -1
+
+    chosen = np.flatnonzero(picked)
+    state = CoverageState(index, t=t, selected_k=chosen.tolist())
+    if not state.is_cover():
+        return chosen.tolist()
+    for k_idx in chosen[np.argsort(x[chosen], kind="stable")].tolist():
+        if state.can_remove(k_idx):
+            state.remove(k_idx)
+    return state.selected_indices().tolist()
+
+
+def _round_in_worker(args: Tuple[np.ndarray, np.ndarray, int, int, float]) -> List[int]:
+    support, values, t, seed, scale = args
+    index = worker_index()
+    x = np.zeros(index.num_k)
+    x[support] = values
+    return round_and_repair(index, x, t, seed, scale)
+
+
+def lp_rounding_cover(
+    index: CoverageIndex,
+    t: int = 1,
+    num_rounds: int = 16,
+    seed: Optional[int] = None,
+    workers: int = 1,
+    time_limit: Optional[float] = None,
+    lp_share: float = 0.7,
+    scales: Sequence[float] = (0.25, 0.5, 1.0),
+    lp_solver: str = "PDLP",
+) -> Tuple[List[int], float, Dict[str, Any]]:
+    """
+    Solves the LP relaxation and returns the best of its randomized roundings.
+
+    Args:
+        index: Coverage index of the instance.
+        t: Coverage threshold.
+        num_rounds: Number of seeded roundings.
+        seed: Base seed; rounding i uses seed + i (0 if None).
+        workers: Worker processes for the roundings; the index is shared
+            through shared memory when greater than 1.
+        time_limit: Seconds for the LP and the roundings (default 30). The
+            roundings run in batches of ``workers``; after the first batch
+            none is launched once the limit has passed.
+        lp_share: Fraction of the time limit for the LP relaxation.
+        scales: Rounding probability factors (see :func:`round_and_repair`);
+            rounding i uses ``scales[i % len(scales)]``.
+        lp_solver: OR-Tools linear solver for the LP ("PDLP" or "GLOP").
+
+    Returns:
+        (k indices of the smallest cover found, LP lower bound rounded up,
+        stats with the LP objective, convergence, cover sizes and timings)
+    """
+    deadline = Deadline(time_limit or 30)
+    lp = ColumnGenerationSolver(
+        index,
+        t,
+        workers=workers,
+        columns_per_round=index.num_k if index.nnz <= FULL_LP_NNZ else 100,
+        lp_solver=lp_solver,
+    )
+    lp.generate_columns(deadline.child(lp_share))
+    bound = float(math.ceil(lp.lower_bound - 1e-6))
+
+    start = time.perf_counter()
+    base_seed = seed if seed is not None else 0
+    support = np.flatnonzero(lp.primal > 0)
+    tasks = [
+        (support, lp.primal[support], t, base_seed + i, scales[i % len(scales)])
+        for i in range(num_rounds)
+    ]
+    workers = max(1, min(workers, num_rounds))
+    covers: List[List[int]] = []
+    with ExitStack() as stack:
+        pool = None
+        if workers > 1:
+            pool = stack.enter_context(shared_index_pool(index, workers))
+        # One rounding per worker per batch; no batch after the deadline
+        for first in range(0, num_rounds, workers):
+            if covers and deadline.expired():
+                break
+            batch = tasks[first : first + workers]
+            if pool is not None:
+                covers.extend(pool.map(_round_in_worker, batch))
+            else:
+                covers.extend(
+                    round_and_repair(index, lp.primal, *task[2:]) for task in batch
+                )
+
+    # The greedy cover seeding the LP pool competes with the roundings
+    complete = [c for c in covers if index.is_cover(c, t)] + [lp.initial.tolist()]
+    sizes = sorted(len(c) for c in complete[:-1])
+    best = min(complete, key=len)
+    stats = {
+        "lp_objective": lp.stats["lp_objective"],
+        "lp_bound": bound,
+        "converged": lp.stats["converged"],
+        "pricing_rounds": lp.stats["rounds"],
+        "roundings": len(covers),
+        "complete_roundings": len(sizes),
+        "best_rounding": sizes[0] if sizes else None,
+        "initial_cover": int(lp.initial.size),
+        "lp_time": lp.stats["lp_time"],
+        "rounding_time": time.perf_counter() - start,
+    }
+    print(
+        f"LP rounding: bound {bound:.0f} (LP {stats['lp_objective']}), {len(covers)} roundings "
+        f"({workers} processes), sizes {sizes[:1] + sizes[-1:] if sizes else []} (best, worst), "
+        f"greedy {lp.initial.size}; best cover {len(best)}.",
+        file=sys.stderr,
+    )
+    return best, bound, stats
+
+
+# Example usage
+if __name__ == "__main__":
+    from utils import colex
+    from utils.coverage import build_coverage_index
+
+    n_lp, k_lp, j_lp, s_lp, t_lp = 12, 6, 5, 4, 1
+    print(f"Running LP rounding: n={n_lp}, k={k_lp}, j={j_lp}, s={s_lp}, t={t_lp}")
+    index_lp = build_coverage_index(
+        colex.masks(np.arange(colex.num_subsets(n_lp, k_lp)), n_lp, k_lp),
+        colex.masks(np.arange(colex.num_subsets(n_lp, j_lp)), n_lp, j_lp),
+        s_lp,
+        n_lp,
+    )
+    cover_lp, bound_lp, stats_lp = lp_rounding_cover(index_lp, t_lp, time_limit=10)
+    print(f"Cover size {len(cover_lp)}, LP bound {bound_lp}, stats {stats_lp}")
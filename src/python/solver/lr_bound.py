@@ -1,129 +1,155 @@
-# Placeholder for Lagrangian Relaxation Lower Bound Calculation
-# This would involve relaxing the set cover constraints and penalizing violations
-# using Lagrange multipliers, then solving the relaxed problem (often easier)
-# and updating multipliers iteratively (e.g., using subgradient method).
-
+# Lagrangian lower bound for the threshold cover over the shared CSR coverage
+# index (utils.coverage.CoverageIndex).
+#
+# Relaxing the row constraints sum_{c covers r} x_c >= t with multipliers
+# u >= 0 leaves a problem that decomposes per column:
+#     L(u) = t * sum(u) + sum_c min(0, 1 - a_c . u),   x_c(u) = [1 - a_c . u < 0]
+# and L(u) is a lower bound on the cover size for every u. The reduced costs
+# 1 - a_c . u are one sparse matvec (a segment sum over the k->j CSR rows), and
+# g_r = t - sum_{c covers r} x_c(u) is a subgradient, so each iteration costs
+# O(nnz). Multipliers follow Polyak steps
+#     u <- max(0, u + lambda * (UB - L(u)) / ||g||^2 * g)
+# towards the upper bound UB (a known cover size), halving lambda when the
+# bound has not improved for a number of iterations.
+
+import math
 import sys
 import time
-from typing import Any, Dict, List, Optional, Tuple
+from typing import List, Optional
+
+import numpy as np
+from utils.coverage import CoverageIndex
 
 
-# Placeholder class or functions
 class LagrangianRelaxationBound:
-    def __init__(self, samples: List[int], n: int, k: int, j: int, s: int, t: int):
-        self.samples = samples
-        self.n = n
-        self.k = k
-        self.j = j
-        self.s = s
+    """
+    Subgradient optimisation of the Lagrangian dual of the cover problem.
+
+    Args:
+        index: Coverage index of the instance.
+        t: Coverage threshold.
+        upper_bound: Size of a known cover (Polyak step target); the number of
+            k-combinations if None.
+    """
+
+    def __init__(
+        self, index: CoverageIndex, t: int = 1, upper_bound: Optional[float] = None
+    ):
+        self.index = index
         self.t = t
-        # ... other initializations ...
-        self.k_combos = list(itertools.combinations(samples, k))
-        self.j_subsets = list(itertools.combinations(samples, j))
-        print("LagrangianRelaxationBound initialized (Placeholder).", file=sys.stderr)
+        self.upper_bound = float(index.num_k if upper_bound is None else upper_bound)
+        self.best_bound = 0.0
+        self.best_multipliers = np.zeros(index.num_j)
+        self.history: List[float] = []  # Best bound after each iteration
+        self.iterations = 0
+
+    def reduced_costs(self, multipliers: np.ndarray) -> np.ndarray:
+        """1 - a_c . u for every k-combination."""
+        prefix = np.concatenate(([0.0], np.cumsum(multipliers[self.index.k_indices])))
+        return 1.0 - (
+            prefix[self.index.k_indptr[1:]] - prefix[self.index.k_indptr[:-1]]
+        )
+
+    def _initial_multipliers(self) -> np.ndarray:
+        # u_r = 1 / (largest degree of a column covering r): every reduced cost
+        # stays >= 0, so L(u) = t * sum(u) is a valid start
+        inv_degree = 1.0 / np.maximum(1, self.index.k_degrees())
+        covered = self.index.j_degrees() > 0
+        multipliers = np.zeros(self.index.num_j)
+        if np.any(covered):
+            row_min = np.minimum.reduceat(
+                inv_degree[self.index.j_indices], self.index.j_indptr[:-1][covered]
+            )
+            multipliers[covered] = row_min
+        return multipliers
 
     def calculate_lower_bound(
-        self, max_iterations: int = 100, tolerance: float = 1e-4
+        self,
+        max_iterations: int = 1000,
+        tolerance: float = 1e-4,
+        time_limit: Optional[float] = None,
+        step_scale: float = 2.0,
+        patience: int = 20,
     ) -> float:
         """
-        Calculates a lower bound for the set cover problem using Lagrangian Relaxation.
-
-        (Placeholder Implementation)
+        Runs subgradient iterations and returns the best bound, rounded up.
+
+        Args:
+            max_iterations: Upper bound on iterations.
+            tolerance: Stop once lambda falls below this.
+            time_limit: Seconds to spend (no limit if None).
+            step_scale: Initial Polyak step factor lambda.
+            patience: Iterations without improvement before lambda is halved.
+
+        Returns:
+            ceil(best L(u)), a lower bound on the size of every cover. The
+            iteration stops early once it reaches ``upper_bound``.
         """
-        print(
-            "Calculating Lagrangian Relaxation Lower Bound (Placeholder)...",
-            file=sys.stderr,
-        )
-        start_time = time.time()
-
-        # 1. Initialize Lagrange multipliers (lambda) - typically start at 0
-        lagrange_multipliers = {j_subset: 0.0 for j_subset in self.j_subsets}
-        num_j_subsets = len(self.j_subsets)
-        best_lower_bound = 0.0
-
-        # 2. Iteratively solve the relaxed problem and update multipliers
-        for iter_num in range(max_iterations):
-            # a. Solve the Lagrangian Subproblem:
-            #    Minimize Sum(cost[i]*x[i]) - Sum(lambda[p]*(Sum(a[i,p]*x[i]) - b[p]))
-            #    For set cover (cost=1, b=t): Minimize Sum(x[i]*(1 - Sum(lambda[p]*a[i,p]))) + Sum(lambda[p]*t)
-            #    Where a[i,p] is 1 if combo i covers subset p, 0 otherwise.
-            #    This often decomposes into independent decisions for each x[i].
-            #    We select x[i]=1 if its coefficient (1 - Sum(lambda[p]*a[i,p])) is negative.
-            print(
-                f"  LR Iter {iter_num+1}: Solving subproblem (Placeholder)...",
-                file=sys.stderr,
-            )
-            current_subproblem_cost = 0  # Simulate solving subproblem
-            violation_degrees = {
-                j_subset: -self.t for j_subset in self.j_subsets
-            }  # Simulate violation calculation
-
-            # b. Calculate the current lower bound (dual value)
-            #    dual_value = subproblem_cost + Sum(lambda[p] * t)
-            current_lower_bound = (
-                current_subproblem_cost + sum(lagrange_multipliers.values()) * self.t
-            )
-            best_lower_bound = max(best_lower_bound, current_lower_bound)
-            print(
-                f"  LR Iter {iter_num+1}: Current LB = {current_lower_bound:.4f}, Best LB = {best_lower_bound:.4f}",
-                file=sys.stderr,
-            )
-
-            # c. Update multipliers using subgradient method:
-            #    lambda[p] = max(0, lambda[p] + step_size * (Sum(a[i,p]*x[i]) - b[p]))
-            #    Where (Sum(a[i,p]*x[i]) - b[p]) is the violation degree for subset p.
-            #    Step size needs a strategy (e.g., diminishing step size).
-            print(
-                f"  LR Iter {iter_num+1}: Updating multipliers (Placeholder)...",
-                file=sys.stderr,
-            )
-            step_size = 1.0 / (iter_num + 1)  # Example diminishing step size
-            change_magnitude = 0.0
-            for j_subset in self.j_subsets:
-                violation = violation_degrees.get(
-                    j_subset, -self.t
-                )  # Get violation from subproblem solution
-                new_lambda = max(
-                    0.0, lagrange_multipliers[j_subset] + step_size * violation
-                )
-                change_magnitude += abs(new_lambda - lagrange_multipliers[j_subset])
-                lagrange_multipliers[j_subset] = new_lambda
-
-            # d. Check for convergence (e.g., small change in multipliers or bound)
-            if change_magnitude < tolerance:
-                print(
-                    f"  LR Iter {iter_num+1}: Multiplier update magnitude ({change_magnitude:.6f}) below tolerance. Converged.",
-                    file=sys.stderr,
-                )
+        if self.index.num_j == 0:
+            return 0.0
+        if np.any(self.index.j_degrees() < self.t):
+            return math.inf  # Some j-subset cannot be covered t times
+        start = time.perf_counter()
+        multipliers = self._initial_multipliers()
+        stall = 0
+        for _ in range(max_iterations):
+            if time_limit is not None and time.perf_counter() - start >= time_limit:
+                break
+            self.iterations += 1
+            reduced = self.reduced_costs(multipliers)
+            value = self.t * multipliers.sum() + np.minimum(0.0, reduced).sum()
+            if value > self.best_bound + 1e-9:
+                self.best_bound = float(value)
+                self.best_multipliers = multipliers.copy()
+                stall = 0
+            else:
+                stall += 1
+                if stall >= patience:
+                    step_scale /= 2
+                    stall = 0
+            self.history.append(self.best_bound)
+            if (
+                math.ceil(self.best_bound - 1e-6) >= self.upper_bound
+                or step_scale < tolerance
+            ):
                 break
 
-        end_time = time.time()
+            chosen = np.flatnonzero(reduced < 0)
+            subgradient = self.t - np.bincount(
+                self.index.covered_by_many(chosen), minlength=self.index.num_j
+            )
+            # Rows with u = 0 and a negative subgradient cannot move
+            subgradient[(multipliers <= 0) & (subgradient < 0)] = 0
+            norm = float(np.dot(subgradient, subgradient))
+            if norm == 0:
+                break  # x(u) is a cover meeting every row exactly: u is optimal
+            step = step_scale * (self.upper_bound - value) / norm
+            multipliers = np.maximum(0.0, multipliers + step * subgradient)
+
+        bound = float(math.ceil(self.best_bound - 1e-6))
         print(
-            f"Lagrangian Relaxation placeholder finished in {end_time - start_time:.3f}s.",
+            f"Lagrangian bound: {self.best_bound:.3f} (ceil {bound:.0f}) after {self.iterations} iterations "
+            f"in {time.perf_counter() - start:.3f}s, upper bound {self.upper_bound:.0f}.",
             file=sys.stderr,
         )
-        print(f"Final Best Lower Bound: {best_lower_bound:.4f}", file=sys.stderr)
-        return best_lower_bound
+        return bound
 
 
 # Example usage
 if __name__ == "__main__":
-    import itertools  # Need itertools for the class init
-
-    # Example parameters
-    m_lr = 50
-    n_lr = 12
-    k_lr = 6
-    j_lr = 5
-    s_lr = 4
-    t_lr = 1
-    samples_lr = list(range(1, n_lr + 1))
-
-    print(
-        f"Running LR Bound Placeholder Example: m={m_lr}, n={n_lr}, k={k_lr}, j={j_lr}, s={s_lr}, t={t_lr}"
+    from solver.greedy import bucket_greedy
+    from utils import colex
+    from utils.coverage import build_coverage_index
+
+    n_lr, k_lr, j_lr, s_lr, t_lr = 12, 6, 5, 4, 1
+    print(f"Running Lagrangian bound: n={n_lr}, k={k_lr}, j={j_lr}, s={s_lr}, t={t_lr}")
+    index_lr = build_coverage_index(
+        colex.masks(np.arange(colex.num_subsets(n_lr, k_lr)), n_lr, k_lr),
+        colex.masks(np.arange(colex.num_subsets(n_lr, j_lr)), n_lr, j_lr),
+        s_lr,
+        n_lr,
     )
-
-    lr_calculator = LagrangianRelaxationBound(samples_lr, n_lr, k_lr, j_lr, s_lr, t_lr)
-    lower_bound = lr_calculator.calculate_lower_bound()
-
-    print(f"\nCalculated Lower Bound (Placeholder): {lower_bound}")
+    cover_lr, _ = bucket_greedy(index_lr)
+    lr_calculator = LagrangianRelaxationBound(index_lr, t_lr, len(cover_lr))
+    lower_bound = lr_calculator.calculate_lower_bound(time_limit=5)
+    print(f"Greedy cover {len(cover_lr)}, lower bound {lower_bound}")
@@ -0,0 +1,239 @@
+# Set-cover presolve (t = 1) on the shared CSR coverage index
+# (utils.coverage.CoverageIndex).
+#
+# Three reductions are applied until none of them changes the instance:
+#   * forced columns: a j-subset with a single remaining covering k-combination
+#     fixes that combination; every j-subset it covers is then satisfied;
+#   * row dominance: if every combination covering j-subset r1 also covers r2,
+#     covering r1 implies covering r2, so r2 is dropped;
+#   * column dominance: if k-combination c1 covers a subset of the remaining
+#     j-subsets covered by c2, some optimal cover avoids c1, so c1 is dropped.
+# Subset tests only look at candidates that share the rarest element and have
+# at least the same degree. When all remaining degrees are equal (e.g. the full
+# symmetric instance) dominance would mean identical rows/columns, and the
+# dominance sweeps are skipped, so such instances cost one pass over degrees.
+
+import sys
+from typing import Dict, List, Sequence
+
+import numpy as np
+from utils.coverage import CoverageIndex, csr_dtype
+
+
+def _segment_sums(values: np.ndarray, indptr: np.ndarray) -> np.ndarray:
+    """Sums of ``values`` over each CSR row delimited by ``indptr``."""
+    prefix = np.concatenate(([0], np.cumsum(values, dtype=np.int64)))
+    return prefix[indptr[1:]] - prefix[indptr[:-1]]
+
+
+class PresolveResult:
+    """
+    Outcome of :func:`presolve_cover`: fixed, remaining and dropped rows/columns.
+
+    ``active_k`` / ``active_j`` are the original indices of the k-combinations
+    and j-subsets left in the reduced instance, ``fixed_k`` the combinations
+    that every returned cover contains, and ``uncoverable_j`` the j-subsets no
+    combination covers (the instance is infeasible if non-empty).
+    """
+
+    def __init__(
+        self,
+        index: CoverageIndex,
+        fixed_k: np.ndarray,
+        active_k: np.ndarray,
+        active_j: np.ndarray,
+        uncoverable_j: np.ndarray,
+        stats: Dict[str, int],
+    ):
+        self.index = index
+        self.fixed_k = fixed_k
+        self.active_k = active_k
+        self.active_j = active_j
+        self.uncoverable_j = uncoverable_j
+        self.stats = stats
+
+    def reduced_index(self) -> CoverageIndex:
+        """Coverage index of the remaining instance, re-indexed to 0..len(active)-1."""
+        if (
+            self.active_k.size == self.index.num_k
+            and self.active_j.size == self.index.num_j
+        ):
+            return self.index  # Nothing eliminated: no copy of the CSR arrays
+        k_pos = np.full(self.index.num_k, -1, dtype=np.int64)
+        k_pos[self.active_k] = np.arange(self.active_k.size)
+        j_pos = np.full(self.index.num_j, -1, dtype=np.int64)
+        j_pos[self.active_j] = np.arange(self.active_j.size)
+
+        def _restrict(indptr, indices, rows, col_pos):
+            # Gather the kept CSR rows, then drop entries whose column was removed
+            lengths = indptr[rows + 1] - indptr[rows]
+            offsets = np.repeat(indptr[rows] - np.cumsum(lengths) + lengths, lengths)
+            gathered = col_pos[indices[offsets + np.arange(lengths.sum())]]
+            keep = gathered >= 0
+            new_indptr = np.zeros(rows.size + 1, dtype=np.int64)
+            np.cumsum(
+                _segment_sums(keep, np.concatenate(([0], np.cumsum(lengths)))),
+                out=new_indptr[1:],
+            )
+            return (
+                new_indptr.astype(csr_dtype(int(new_indptr[-1]))),
+                gathered[keep].astype(np.int32),
+            )
+
+        k_indptr, k_indices = _restrict(
+            self.index.k_indptr, self.index.k_indices, self.active_k, j_pos
+        )
+        j_indptr, j_indices = _restrict(
+            self.index.j_indptr, self.index.j_indices, self.active_j, k_pos
+        )
+        return CoverageIndex(
+            k_indptr,
+            k_indices,
+            j_indptr,
+            j_indices,
+            self.active_k.size,
+            self.active_j.size,
+        )
+
+    def expand(self, reduced_selection: Sequence[int]) -> List[int]:
+        """Original k indices of the fixed columns plus a reduced-instance selection."""
+        chosen = self.active_k[np.asarray(reduced_selection, dtype=np.int64)]
+        return self.fixed_k.tolist() + chosen.tolist()
+
+
+def presolve_cover(index: CoverageIndex, max_passes: int = 20) -> PresolveResult:
+    """
+    Shrinks a t = 1 cover instance with forced-column and dominance reductions.
+
+    Args:
+        index: Coverage index of the instance.
+        max_passes: Upper bound on reduction passes.
+
+    Returns:
+        A :class:`PresolveResult`; ``stats`` counts fixed columns, dominated
+        columns, dominated rows, rows satisfied by fixed columns and the
+        total eliminated columns and rows.
+    """
+    col_active = np.ones(index.num_k, dtype=bool)
+    row_active = np.ones(index.num_j, dtype=bool)
+    fixed = np.zeros(index.num_k, dtype=bool)
+    stats = {
+        "fixed_columns": 0,
+        "dominated_columns": 0,
+        "dominated_rows": 0,
+        "rows_covered_by_fixed": 0,
+        "passes": 0,
+    }
+
+    row_deg = index.j_degrees().astype(np.int64)
+    uncoverable = np.flatnonzero(row_deg == 0)
+    row_active[uncoverable] = False  # Nothing can cover them; reported separately
+
+    for _ in range(max_passes):
+        stats["passes"] += 1
+        changed = False
+
+        # --- Forced columns ---
+        row_deg = _segment_sums(col_active[index.j_indices], index.j_indptr)
+        forced_rows = np.flatnonzero(row_active & (row_deg == 1))
+        for r in forced_rows.tolist():
+            if not row_active[r]:
+                continue  # Already satisfied by a column fixed in this sweep
+            cols = index.covering(r)
+            c = int(cols[col_active[cols]][0])
+            fixed[c] = True
+            col_active[c] = False
+            rows = index.covered_by(c)
+            stats["rows_covered_by_fixed"] += int(np.count_nonzero(row_active[rows]))
+            row_active[rows] = False
+            stats["fixed_columns"] += 1
+            changed = True
+
+        # --- Row dominance: drop rows whose covering set contains another row's ---
+        row_deg = _segment_sums(col_active[index.j_indices], index.j_indptr)
+        col_deg = _segment_sums(row_active[index.k_indices], index.k_indptr)
+        live_rows = np.flatnonzero(row_active)
+        if live_rows.size and row_deg[live_rows].min() != row_deg[live_rows].max():
+            mark = np.zeros(index.num_k, dtype=bool)
+            for r1 in live_rows[np.argsort(row_deg[live_rows], kind="stable")].tolist():
+                if not row_active[r1]:
+                    continue
+                cols = index.covering(r1)
+                cols = cols[col_active[cols]]
+                pivot = cols[np.argmin(col_deg[cols])]
+                candidates = index.covered_by(pivot)
+                candidates = candidates[
+                    row_active[candidates]
+                    & (row_deg[candidates] >= row_deg[r1])
+                    & (candidates != r1)
+                ]
+                if not candidates.size:
+                    continue
+                mark[cols] = True
+                hits = _segment_sums(
+                    mark[index.covering_many(candidates)],
+                    np.concatenate(([0], np.cumsum(index.j_degrees()[candidates]))),
+                )
+                mark[cols] = False
+                dominated = candidates[hits == cols.size]
+                if dominated.size:
+                    row_active[dominated] = False
+                    stats["dominated_rows"] += int(dominated.size)
+                    changed = True
+
+        # --- Column dominance: drop columns whose covered rows another column covers ---
+        row_deg = _segment_sums(col_active[index.j_indices], index.j_indptr)
+        col_deg = _segment_sums(row_active[index.k_indices], index.k_indptr)
+        empty_cols = np.flatnonzero(col_active & (col_deg == 0))
+        if empty_cols.size:
+            col_active[empty_cols] = False  # Cover nothing that is still needed
+            stats["dominated_columns"] += int(empty_cols.size)
+            changed = True
+        live_cols = np.flatnonzero(col_active)
+        if live_cols.size and col_deg[live_cols].min() != col_deg[live_cols].max():
+            mark = np.zeros(index.num_j, dtype=bool)
+            for c1 in live_cols[np.argsort(col_deg[live_cols], kind="stable")].tolist():
+                rows = index.covered_by(c1)
+                rows = rows[row_active[rows]]
+                pivot = rows[np.argmin(row_deg[rows])]
+                candidates = index.covering(pivot)
+                candidates = candidates[
+                    col_active[candidates]
+                    & (col_deg[candidates] >= col_deg[c1])
+                    & (candidates != c1)
+                ]
+                if not candidates.size:
+                    continue
+                mark[rows] = True
+                hits = _segment_sums(
+                    mark[index.covered_by_many(candidates)],
+                    np.concatenate(([0], np.cumsum(index.k_degrees()[candidates]))),
+                )
+                mark[rows] = False
+                if np.any(hits == rows.size):
+                    col_active[c1] = False
+                    row_deg[rows] -= 1
+                    stats["dominated_columns"] += 1
+                    changed = True
+
+        if not changed:
+            break
+
+    result = PresolveResult(
+        index,
+        np.flatnonzero(fixed),
+        np.flatnonzero(col_active),
+        np.flatnonzero(row_active),
+        uncoverable,
+        stats,
+    )
+    stats["eliminated_columns"] = index.num_k - int(result.active_k.size)
+    stats["eliminated_rows"] = index.num_j - int(result.active_j.size)
+    print(
+        f"Presolve: {stats['fixed_columns']} fixed columns, "
+        f"{stats['dominated_columns']} dominated columns, {stats['dominated_rows']} dominated rows, "
+        f"{stats['rows_covered_by_fixed']} rows covered by fixed columns; "
+        f"{result.active_k.size}/{index.num_k} columns and {result.active_j.size}/{index.num_j} rows remain.",
+        file=sys.stderr,
+    )
+    return result
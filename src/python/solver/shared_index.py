@@ -0,0 +1,88 @@
+# Sharing the CSR coverage index (utils.coverage.CoverageIndex) with worker
+# processes.
+#
+# The four CSR arrays are copied once into multiprocessing.shared_memory
+# blocks; each pool worker maps them as NumPy views in its initializer
+# instead of receiving a pickled copy with every task. Task functions running
+# in a worker read the index through worker_index(). Used by the GRASP
+# starts, the LP roundings and the LNS sub-models.
+
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from multiprocessing import shared_memory
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+from utils.coverage import CoverageIndex
+
+CSR_FIELDS = ("k_indptr", "k_indices", "j_indptr", "j_indices")
+
+# Shared-memory handles and index of the current pool worker (set by attach_worker)
+_worker_blocks: List[shared_memory.SharedMemory] = []
+_worker_index: Optional[CoverageIndex] = None
+
+
+def share_index(
+    index: CoverageIndex,
+) -> Tuple[List[shared_memory.SharedMemory], Dict[str, tuple]]:
+    """
+    Copies the CSR arrays into new shared-memory blocks.
+
+    Returns:
+        (the blocks, which the caller must close and unlink, and the specs to
+        pass to :func:`attach_worker`)
+    """
+    blocks, specs = [], {}
+    for field in CSR_FIELDS:
+        array = getattr(index, field)
+        block = shared_memory.SharedMemory(create=True, size=max(1, array.nbytes))
+        np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[:] = array
+        blocks.append(block)
+        specs[field] = (block.name, array.shape, array.dtype.str)
+    specs["num_k"], specs["num_j"] = index.num_k, index.num_j
+    return blocks, specs
+
+
+def attach_worker(specs: Dict[str, tuple]) -> None:
+    """Pool initializer: maps the shared CSR arrays of :func:`share_index`."""
+    global _worker_index
+    arrays = {}
+    for field in CSR_FIELDS:
+        name, shape, dtype = specs[field]
+        block = shared_memory.SharedMemory(name=name)
+        _worker_blocks.append(block)  # Keep the mapping alive for the views
+        arrays[field] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+    _worker_index = CoverageIndex(num_k=specs["num_k"], num_j=specs["num_j"], **arrays)
+
+
+def worker_index() -> CoverageIndex:
+    """The index attached in the current pool worker."""
+    if _worker_index is None:
+        raise RuntimeError("No coverage index attached to this process")
+    return _worker_index
+
+
+def release(blocks: List[shared_memory.SharedMemory]) -> None:
+    """Closes and unlinks the blocks created by :func:`share_index`."""
+    for block in blocks:
+        block.close()
+        block.unlink()
+
+
+@contextmanager
+def shared_index_pool(
+    index: CoverageIndex, workers: int
+) -> Iterator[ProcessPoolExecutor]:
+    """
+    Process pool whose workers map ``index`` from shared memory.
+
+    The blocks are released when the block exits, also on errors.
+    """
+    blocks, specs = share_index(index)
+    try:
+        with ProcessPoolExecutor(
+            workers, initializer=attach_worker, initargs=(specs,)
+        ) as pool:
+            yield pool
+    finally:
+        release(blocks)
@@ -0,0 +1,159 @@
+# Sample-permutation symmetry for the CP-SAT cover model.
+#
+# Coverage only depends on intersection sizes, so any permutation of the n
+# sample indices that maps the candidate k-combinations and the j-subsets onto
+# themselves maps covers to covers of the same size. Such a permutation acts
+# on the model columns as a column permutation sigma. Every orbit of covers
+# contains a lex-leader x (columns in index order) with x >=_lex x o sigma for
+# every group element, so adding that comparison for a set of generators
+# (cyclic shift, adjacent transpositions) removes symmetric copies without
+# cutting off every optimal cover. The comparison is truncated to the first
+# moved columns, which keeps it valid (a prefix of a lex constraint is implied
+# by the full one) and bounds the number of auxiliary literals.
+
+import sys
+from typing import List, Sequence
+
+import numpy as np
+from ortools.sat.python import cp_model
+from utils import colex
+
+SAMPLE_GENERATORS = ("cyclic", "transpositions")
+
+
+def sample_generators(
+    n: int, kinds: Sequence[str] = SAMPLE_GENERATORS
+) -> List[np.ndarray]:
+    """
+    Permutations of the sample indices 0..n-1 (perm[i] is the image of i).
+
+    Args:
+        n: Number of samples.
+        kinds: "cyclic" for the shift i -> i+1 mod n, "transpositions" for
+            the adjacent swaps (i i+1); together they generate the full
+            symmetric group.
+
+    Returns:
+        List of int64 permutation arrays.
+    """
+    generators = []
+    for kind in kinds:
+        if kind == "cyclic":
+            generators.append(np.roll(np.arange(n), -1))
+        elif kind == "transpositions":
+            for i in range(n - 1):
+                perm = np.arange(n)
+                perm[[i, i + 1]] = perm[[i + 1, i]]
+                generators.append(perm)
+        else:
+            raise ValueError(f"Unknown sample generator kind '{kind}'")
+    return generators
+
+
+def permute_ranks(ranks: np.ndarray, perm: np.ndarray, n: int, r: int) -> np.ndarray:
+    """Colex ranks of the images of the given r-subsets under a sample permutation."""
+    members = np.sort(perm[colex.unrank(ranks, n, r)], axis=1)
+    return colex.rank(members, n)
+
+
+def column_permutations(
+    combos: np.ndarray,
+    j_subsets: np.ndarray,
+    n: int,
+    k: int,
+    j: int,
+    generators: Sequence[np.ndarray],
+) -> List[np.ndarray]:
+    """
+    Column maps of the generators that leave the instance invariant.
+
+    Args:
+        combos: Colex ranks of the model columns (k-combinations).
+        j_subsets: Colex ranks of the j-subsets to cover.
+        n, k, j: Sample count and subset sizes.
+        generators: Sample permutations (see :func:`sample_generators`).
+
+    Returns:
+        For every generator mapping both rank sets onto themselves (in
+        generator order), an int64 array sigma with column c mapped to column
+        sigma[c]; other generators are skipped.
+    """
+    combos = np.asarray(combos, dtype=np.int64)
+    order = np.argsort(combos, kind="stable")
+    sorted_combos = combos[order]
+    sorted_j = np.sort(np.asarray(j_subsets, dtype=np.int64))
+
+    maps = []
+    for perm in generators:
+        images = permute_ranks(combos, perm, n, k)
+        pos = np.searchsorted(sorted_combos, images)
+        pos[pos == sorted_combos.size] = 0
+        if not np.array_equal(sorted_combos[pos], images):
+            continue  # Some candidate is mapped outside the candidate set
+        if not np.array_equal(np.sort(permute_ranks(sorted_j, perm, n, j)), sorted_j):
+            continue
+        maps.append(order[pos])
+    return maps
+
+
+def add_lex_leader(
+    model: cp_model.CpModel,
+    x: Sequence[cp_model.IntVar],
+    column_perms: Sequence[np.ndarray],
+    max_length: int = 256,
+) -> int:
+    """
+    Adds x >=_lex x o sigma for each column map sigma, truncated to moved columns.
+
+    With b_0 = true and columns c_0 < c_1 < ... moved by sigma, the clauses
+    b_i => x[c_i] >= x[sigma(c_i)] and b_i & x[c_i] == x[sigma(c_i)] => b_(i+1)
+    encode the comparison over the first ``max_length`` moved columns.
+
+    Returns:
+        The number of comparisons (pairs of columns) added.
+    """
+    added = 0
+    for sigma in column_perms:
+        moved = np.flatnonzero(sigma != np.arange(sigma.size))[:max_length]
+        prefix_equal = None  # b_i; None stands for the constant true b_0
+        for pos, c in enumerate(moved.tolist()):
+            a, b = x[c], x[int(sigma[c])]
+            guard = [prefix_equal.Not()] if prefix_equal is not None else []
+            model.AddBoolOr(guard + [a, b.Not()])
+            if pos + 1 < moved.size:
+                nxt = model.NewBoolVar(f"lex_{added}")
+                model.AddBoolOr(guard + [a, nxt])
+                model.AddBoolOr(guard + [b.Not(), nxt])
+                prefix_equal = nxt
+            added += 1
+    print(
+        f"Symmetry: {len(column_perms)} column permutations, {added} lex-leader comparisons.",
+        file=sys.stderr,
+    )
+    return added
+
+
+def orbit_labels(maps: Sequence[np.ndarray], size: int) -> np.ndarray:
+    """
+    Orbit of each of ``size`` items under the group generated by the item maps.
+
+    Args:
+        maps: Permutations of 0..size-1 (e.g. column maps from
+            :func:`column_permutations`).
+        size: Number of items.
+
+    Returns:
+        An int64 array of orbit ids 0..num_orbits-1, numbered in order of the
+        smallest member.
+    """
+    label = np.arange(size)
+    changed = True
+    while changed:
+        # Spread the smallest member along every generator edge, both ways
+        before = label.copy()
+        for sigma in maps:
+            np.minimum.at(label, sigma, label)
+            label = np.minimum(label, label[sigma])
+        label = label[label]  # Pointer jumping halves the remaining distance
+        changed = not np.array_equal(label, before)
+    return np.unique(label, return_inverse=True)[1].astype(np.int64)
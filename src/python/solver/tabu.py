@@ -0,0 +1,219 @@
+# Tabu search for the threshold cover over the shared CSR coverage index
+# (utils.coverage.CoverageIndex), for instances too large for the exact models.
+#
+# The search keeps the cover size fixed and minimises the number of j-subsets
+# covered fewer than t times. A move swaps one selected k-combination for an
+# unselected one: the column entering is the best one covering a random
+# j-subset below t, the column leaving the one that loses the fewest j-subsets
+# given that entry, with
+#     delta(out, in) = loss(out) - gain(in) - |rows of both at t| + |rows of both at t - 1|
+# The j-subsets below t are kept in a set (array plus position map), and
+# loss(c), the j-subsets only c keeps at t, is kept for every selected column.
+# Both are updated after each swap from the rows of the two swapped columns
+# and the selected columns covering those rows, so an iteration costs a few
+# column and row degrees plus one pass over the cover, never a scan of the
+# rows or of the coverage matrix. A column that leaves may not re-enter (and
+# one that enters may not leave) for ``tenure`` iterations unless the move
+# reaches a new best state of the current size. Whenever every j-subset is
+# covered the cover is recorded and the column with the smallest loss is
+# dropped, lowering the target size by one, until the deadline or a lower
+# bound is reached.
+
+import sys
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from utils.coverage import CoverageIndex, CoverageState
+from utils.deadline import Deadline
+
+
+class _TabuState:
+    """
+    A :class:`CoverageState` with the rows below ``t`` and the per-column
+    losses maintained across moves.
+
+    ``below[:num_below]`` lists the j-subsets covered fewer than ``t`` times
+    and ``position[j]`` is the place of j-subset j in it (-1 when absent).
+    ``loss[c]`` is, for a selected column c, the number of its j-subsets
+    covered exactly ``t`` times (stale for unselected columns).
+    """
+
+    def __init__(self, index: CoverageIndex, t: int, cover: Sequence[int]):
+        self.index = index
+        self.t = t
+        self.cover = CoverageState(index, t=t, selected_k=cover)
+        self.below = np.zeros(index.num_j, dtype=np.int64)
+        self.position = np.full(index.num_j, -1, dtype=np.int64)
+        self.num_below = 0
+        self._enter_below(np.flatnonzero(self.cover.counts < t))
+        members = self.cover.selected_indices()
+        self.loss = np.zeros(index.num_k, dtype=np.int64)
+        lengths = index.k_indptr[members + 1] - index.k_indptr[members]
+        hits = self.cover.counts[index.covered_by_many(members)] == t
+        prefix = np.concatenate(([0], np.cumsum(hits)))
+        ends = np.cumsum(lengths)
+        self.loss[members] = prefix[ends] - prefix[ends - lengths]
+
+    def _enter_below(self, rows: np.ndarray) -> None:
+        self.below[self.num_below : self.num_below + rows.size] = rows
+        self.position[rows] = np.arange(self.num_below, self.num_below + rows.size)
+        self.num_below += int(rows.size)
+
+    def _leave_below(self, rows: np.ndarray) -> None:
+        for row in rows.tolist():  # Swap with the last entry
+            slot = int(self.position[row])
+            self.num_below -= 1
+            last = int(self.below[self.num_below])
+            self.below[slot] = last
+            self.position[last] = slot
+            self.position[row] = -1
+
+    def below_rows(self) -> np.ndarray:
+        return self.below[: self.num_below]
+
+    def move(self, k_idx: int, add: bool) -> None:
+        """Adds or removes ``k_idx`` and updates the row set and the losses."""
+        t, index = self.t, self.index
+        rows = index.covered_by(k_idx)
+        old = self.cover.counts[rows].copy()
+        if add:
+            self.cover.add(k_idx)
+        else:
+            self.cover.remove(k_idx)
+        new = self.cover.counts[rows]
+        # Rows leaving or reaching count t change the loss of their other coverers
+        for crossed, sign in ((rows[old == t], -1), (rows[new == t], 1)):
+            if crossed.size:
+                coverers = index.covering_many(crossed)
+                coverers = coverers[self.cover.selected[coverers] & (coverers != k_idx)]
+                np.add.at(self.loss, coverers, sign)
+        if add:
+            self.loss[k_idx] = int(np.count_nonzero(new == t))
+            self._leave_below(rows[(old < t) & (new >= t)])
+        else:
+            self._enter_below(rows[(old >= t) & (new < t)])
+
+
+def tabu_set_cover(
+    index: CoverageIndex,
+    cover: Sequence[int],
+    t: int = 1,
+    deadline: Optional[Deadline] = None,
+    seed: Optional[int] = None,
+    tenure: int = 3,
+    target: int = 0,
+) -> Tuple[List[int], Dict[str, Any]]:
+    """
+    Shrinks a cover by tabu search until the deadline.
+
+    Args:
+        index: Coverage index of the instance.
+        cover: k indices of a full t-cover to start from.
+        t: Coverage threshold.
+        deadline: When to stop (10 s from the call if None).
+        seed: Seed for the row choice and tie-breaking.
+        tenure: Iterations a swapped column stays tabu.
+        target: Stop once a cover of at most this size is found (e.g. a lower
+            bound).
+
+    Returns:
+        (k indices of the smallest full cover found, stats with the
+        iterations, the size before and after and when each size was reached)
+    """
+    deadline = deadline or Deadline(10.0)
+    rng = np.random.default_rng(seed)
+    search = _TabuState(index, t, cover)
+    state, loss = search.cover, search.loss
+    if not state.is_cover():
+        raise ValueError("tabu_set_cover needs a full cover to start from")
+    start = time.perf_counter()
+    best = state.selected_indices()
+    stats: Dict[str, Any] = {
+        "initial_size": int(best.size),
+        "iterations": 0,
+        "size_times": [],  # (size, seconds) each time a smaller cover is found
+    }
+    tabu_until = np.zeros(index.num_k, dtype=np.int64)
+    slot_of = np.full(index.num_k, -1, dtype=np.int64)  # Position in ``members``
+    iteration = 0
+
+    while best.size > max(target, 1) and not deadline.expired():
+        # Lower the target size: drop the column that uncovers the fewest rows
+        members = state.selected_indices()
+        search.move(int(members[np.argmin(loss[members])]), add=False)
+        members = state.selected_indices()
+        slot_of[:] = -1
+        slot_of[members] = np.arange(members.size)
+        best_uncovered = state.num_uncovered
+
+        while state.num_uncovered and not deadline.expired():
+            iteration += 1
+            # Entering column: the best non-tabu one covering a random row below t
+            below = search.below_rows()
+            row = int(below[rng.integers(below.size)])
+            entering = index.covering(row)
+            entering = entering[~state.selected[entering]]
+            allowed = entering[tabu_until[entering] <= iteration]
+            if allowed.size:
+                entering = allowed
+            # gain = rows at t - 1 it covers, counted over the few rows below t
+            near = np.sort(index.covering_many(below[state.counts[below] == t - 1]))
+            gains = np.searchsorted(near, entering, side="right") - np.searchsorted(
+                near, entering
+            )
+            top = np.flatnonzero(gains == gains.max())
+            col_in = int(entering[top[rng.integers(top.size)]])
+
+            # Leaving column: the smallest delta given the entry
+            delta = loss[members] - gains.max()
+            rows_in = index.covered_by(col_in)
+            for value, sign in ((t, -1), (t - 1, 1)):
+                rows = rows_in[state.counts[rows_in] == value]
+                if value > 0 and rows.size:
+                    slots = slot_of[index.covering_many(rows)]
+                    np.add.at(delta, slots[slots >= 0], sign)
+            aspiration = state.num_uncovered + delta < best_uncovered
+            delta[(tabu_until[members] > iteration) & ~aspiration] = index.num_j
+            top = np.flatnonzero(delta == delta.min())
+            slot = int(top[rng.integers(top.size)])
+            col_out = int(members[slot])
+
+            search.move(col_out, add=False)
+            search.move(col_in, add=True)
+            members[slot], slot_of[col_in], slot_of[col_out] = col_in, slot, -1
+            tabu_until[col_out] = tabu_until[col_in] = iteration + tenure
+            best_uncovered = min(best_uncovered, state.num_uncovered)
+
+        if state.num_uncovered:
+            break  # Deadline reached before every row was covered again
+        best = state.selected_indices()
+        stats["size_times"].append((int(best.size), time.perf_counter() - start))
+
+    stats["iterations"] = iteration
+    stats["final_size"] = int(best.size)
+    print(
+        f"Tabu search: {iteration} iterations in {time.perf_counter() - start:.3f}s, "
+        f"cover {stats['initial_size']} -> {stats['final_size']}.",
+        file=sys.stderr,
+    )
+    return best.tolist(), stats
+
+
+# Example usage
+if __name__ == "__main__":
+    from solver.greedy import bucket_greedy
+    from utils import colex
+    from utils.coverage import build_coverage_index
+
+    n_tabu, k_tabu, j_tabu, s_tabu = 14, 6, 5, 4
+    print(f"Running tabu search: n={n_tabu}, k={k_tabu}, j={j_tabu}, s={s_tabu}")
+    index_tabu = build_coverage_index(
+        colex.masks(np.arange(colex.num_subsets(n_tabu, k_tabu)), n_tabu, k_tabu),
+        colex.masks(np.arange(colex.num_subsets(n_tabu, j_tabu)), n_tabu, j_tabu),
+        s_tabu,
+        n_tabu,
+    )
+    cover_tabu, _ = bucket_greedy(index_tabu)
+    improved, tabu_stats = tabu_set_cover(index_tabu, cover_tabu, deadline=Deadline(10))
+    print(f"Greedy {len(cover_tabu)} -> tabu {len(improved)}, stats {tabu_stats}")
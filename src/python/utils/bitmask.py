@@ -2,6 +2,10 @@ import itertools
 from typing import List, Set, Tuple
 
 import numpy as np
+from utils import colex
+from utils.coverage import build_coverage_index, popcount64
+
+MAX_BITS = 64  # Single-word uint64 masks
 
 
 def generate_masks(item_list: List[Tuple[int, ...]], max_element: int) -> np.ndarray:
@@ -31,11 +35,14 @@ def generate_masks(item_list: List[Tuple[int, ...]], max_element: int) -> np.nda
     # Initialize with False. We use max_element as width because indices are 0 to max_element-1
     bool_array = np.zeros((num_items, max_element), dtype=bool)
 
-    for i, item in enumerate(item_list):
-        # Convert 1-based elements to 0-based indices for the array
-        indices = [x - 1 for x in item if 1 <= x <= max_element]
-        if indices:  # Ensure there are valid indices before assignment
-            bool_array[i, indices] = True
+    # Scatter all (row, element) pairs at once; out-of-range elements are ignored
+    lengths = np.fromiter((len(item) for item in item_list), dtype=np.intp)
+    elements = np.fromiter(
+        itertools.chain.from_iterable(item_list), dtype=np.int64, count=lengths.sum()
+    )
+    rows = np.repeat(np.arange(num_items), lengths)
+    valid = (elements >= 1) & (elements <= max_element)
+    bool_array[rows[valid], elements[valid] - 1] = True
 
     # Pack the boolean array into uint8 bitmasks along the element axis (axis=1)
     # 'order=C' is the default and suitable here.
@@ -44,6 +51,71 @@ def generate_masks(item_list: List[Tuple[int, ...]], max_element: int) -> np.nda
     return bitmasks
 
 
+def int_mask(i: int) -> np.uint64:
+    """Single-bit uint64 mask for element index i (0 <= i < 64)."""
+    if not 0 <= i < MAX_BITS:
+        raise ValueError(f"Element index {i} does not fit into a uint64 mask.")
+    return np.uint64(1) << np.uint64(i)
+
+
+def all_masks(n: int, r: int) -> np.ndarray:
+    """
+    Generates uint64 single-word masks for all r-subsets of {0, ..., n-1}.
+
+    Masks are produced in colex order, so position i holds the subset whose
+    colex rank is i (see utils.colex).
+
+    Args:
+        n: Number of elements (n <= 64).
+        r: Subset size.
+
+    Returns:
+        A uint64 array of length C(n, r).
+    """
+    if n > MAX_BITS:
+        raise ValueError(f"all_masks supports at most {MAX_BITS} elements, got {n}.")
+    total = colex.num_subsets(n, r)
+    return colex.masks(np.arange(total, dtype=np.int64), n, r)
+
+
+def build_cover_indices(
+    bit_k: np.ndarray, bit_s: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    For each k-mask, lists the indices of the s-masks it contains.
+
+    An s-subset is covered by a k-combination when ``(kmask & smask) == smask``.
+    The lists come from the shared CSR coverage index (containment is
+    intersection size >= s for s-subsets), so no Nk x Ns matrix is formed.
+
+    Args:
+        bit_k: uint64 masks of the k-combinations (equal popcount).
+        bit_s: uint64 masks of the s-subsets (equal popcount).
+
+    Returns:
+        (counts, covers): counts is an int32 array of shape (Nk,) with the
+        number of covered s-subsets per k-mask; covers is an int32 matrix of
+        shape (Nk, max_count) holding the s-indices, padded with -1.
+    """
+    bit_k = np.asarray(bit_k, dtype=np.uint64)
+    bit_s = np.asarray(bit_s, dtype=np.uint64)
+    if bit_k.size == 0 or bit_s.size == 0:
+        return np.zeros(bit_k.size, dtype=np.int32), np.full(
+            (bit_k.size, 0), -1, dtype=np.int32
+        )
+
+    s = int(popcount64(bit_s[:1])[0])
+    n = int(np.bitwise_or.reduce(np.concatenate([bit_k, bit_s]))).bit_length()
+    index = build_coverage_index(bit_k, bit_s, s, n)
+
+    counts = index.k_degrees().astype(np.int32)
+    covers = np.full((bit_k.size, int(counts.max())), -1, dtype=np.int32)
+    rows = np.repeat(np.arange(bit_k.size), counts)
+    cols = np.arange(index.nnz) - np.repeat(index.k_indptr[:-1], counts)
+    covers[rows, cols] = index.k_indices
+    return counts, covers
+
+
 def check_s_subset_coverage_bitwise(
     k_combo_masks: np.ndarray,
     j_subset_masks: np.ndarray,
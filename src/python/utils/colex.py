@@ -0,0 +1,148 @@
+import itertools
+import sys
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+# Combinatorial number system in colexicographic order. The r-subset
+# {c_1 < c_2 < ... < c_r} of index space 0..n-1 has rank sum_i C(c_i, i), so
+# subsets are identified by a single integer instead of a tuple, and whole
+# arrays of subsets are ranked/unranked with NumPy arithmetic.
+
+
+def binomial_table(n: int, r: int) -> np.ndarray:
+    """
+    Returns the table C[a, b] = C(a, b) for 0 <= a <= n, 0 <= b <= r.
+
+    Args:
+        n: Largest upper index.
+        r: Largest lower index.
+
+    Returns:
+        An int64 array of shape (n + 1, r + 1).
+    """
+    table = np.zeros((n + 1, r + 1), dtype=np.int64)
+    table[:, 0] = 1
+    for a in range(1, n + 1):
+        table[a, 1:] = table[a - 1, 1:] + table[a - 1, :-1]
+    return table
+
+
+def num_subsets(n: int, r: int) -> int:
+    """Number of r-subsets of n elements (0 when r is out of range)."""
+    if r < 0 or r > n:
+        return 0
+    return int(binomial_table(n, r)[n, r])
+
+
+def rank(subsets: np.ndarray, n: int) -> np.ndarray:
+    """
+    Colex ranks of r-subsets given as rows of ascending indices in 0..n-1.
+
+    Args:
+        subsets: Integer array of shape (N, r), each row sorted ascending.
+        n: Size of the index space.
+
+    Returns:
+        An int64 array of N ranks in 0..C(n, r)-1.
+    """
+    subsets = np.asarray(subsets, dtype=np.intp)
+    if subsets.ndim != 2:
+        raise ValueError("subsets must be a 2-D array of shape (N, r)")
+    r = subsets.shape[1]
+    if subsets.shape[0] == 0 or r == 0:
+        return np.zeros(subsets.shape[0], dtype=np.int64)
+    table = binomial_table(n, r)
+    return table[subsets, np.arange(1, r + 1)].sum(axis=1)
+
+
+def unrank(ranks: np.ndarray, n: int, r: int) -> np.ndarray:
+    """
+    Inverse of :func:`rank`: the r-subsets with the given colex ranks.
+
+    Args:
+        ranks: Integer array of ranks in 0..C(n, r)-1.
+        n: Size of the index space.
+        r: Subset size.
+
+    Returns:
+        An int32 array of shape (N, r) with each row sorted ascending.
+    """
+    remaining = np.array(ranks, dtype=np.int64).reshape(-1)
+    out = np.empty((remaining.size, r), dtype=np.int32)
+    if remaining.size == 0:
+        return out
+    if np.any(remaining < 0) or np.any(remaining >= num_subsets(n, r)):
+        raise ValueError(f"ranks must lie in [0, C({n}, {r}))")
+    table = binomial_table(n, r)
+    for i in range(r, 0, -1):
+        # Largest c with C(c, i) <= remaining; column i is non-decreasing in c
+        c = np.searchsorted(table[:n, i], remaining, side="right") - 1
+        out[:, i - 1] = c
+        remaining -= table[c, i]
+    return out
+
+
+def masks(ranks: np.ndarray, n: int, r: int) -> np.ndarray:
+    """uint64 bitmasks (bit c set for member c) of the r-subsets with the given ranks."""
+    members = unrank(ranks, n, r).astype(np.uint64)
+    if r == 0:
+        return np.zeros(members.shape[0], dtype=np.uint64)
+    return np.bitwise_or.reduce(np.uint64(1) << members, axis=1)
+
+
+def rank_tuples(
+    subsets: Sequence[Tuple[int, ...]], samples: Sequence[int]
+) -> np.ndarray:
+    """
+    Colex ranks of subsets given as tuples of sample values.
+
+    Args:
+        subsets: Tuples of sample values (each sorted ascending).
+        samples: Sorted sample list defining index space (sample i -> index i).
+
+    Returns:
+        An int32 array of ranks.
+    """
+    if len(subsets) == 0:
+        return np.empty(0, dtype=np.int32)
+    sample_arr = np.asarray(samples)
+    positions = np.searchsorted(sample_arr, np.asarray(subsets))
+    return rank(np.sort(positions, axis=1), len(samples)).astype(np.int32)
+
+
+def to_tuples(
+    ranks: np.ndarray, samples: Sequence[int], r: int
+) -> List[Tuple[int, ...]]:
+    """
+    Converts colex ranks back into tuples of sample values (for output only).
+
+    Args:
+        ranks: Integer array of ranks.
+        samples: Sorted sample list defining index space.
+        r: Subset size.
+
+    Returns:
+        A list of tuples of (Python int) sample values.
+    """
+    sample_arr = np.asarray(samples)
+    return [tuple(row) for row in sample_arr[unrank(ranks, len(samples), r)].tolist()]
+
+
+# Example Usage
+if __name__ == "__main__":
+    n_example, r_example = 9, 4
+    subsets_example = np.array(
+        list(itertools.combinations(range(n_example), r_example))
+    )
+    ranks_example = rank(subsets_example, n_example)
+    print(
+        f"C({n_example},{r_example}) = {num_subsets(n_example, r_example)}, "
+        f"ranks form a permutation: {np.array_equal(np.sort(ranks_example), np.arange(len(ranks_example)))}",
+        file=sys.stderr,
+    )
+    round_trip = unrank(ranks_example, n_example, r_example)
+    print(
+        f"unrank(rank(x)) == x: {np.array_equal(round_trip, subsets_example)}",
+        file=sys.stderr,
+    )
@@ -0,0 +1,456 @@
+import itertools
+import sys
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+# A k-combination covers a j-subset at level s exactly when the two share at
+# least s samples (any s of the shared samples form a common s-subset, and a
+# common s-subset implies s shared samples). Coverage therefore reduces to
+# popcount(kmask & jmask) >= s on single-word bitmasks, which avoids building
+# the sets of s-subsets that the original set-comparison code allocated.
+
+MAX_UNIVERSE = 64  # Samples must fit into a single uint64 word
+CHUNK_CELLS = 1 << 24  # Upper bound on (j rows x k columns) evaluated per chunk
+
+_M1 = np.uint64(0x5555555555555555)
+_M2 = np.uint64(0x3333333333333333)
+_M4 = np.uint64(0x0F0F0F0F0F0F0F0F)
+_H01 = np.uint64(0x0101010101010101)
+
+
+def popcount64(x: np.ndarray) -> np.ndarray:
+    """
+    Counts the set bits of every element of a uint64 array.
+
+    Uses ``np.bitwise_count`` when available (NumPy >= 2.0) and falls back to
+    the SWAR bit-twiddling popcount otherwise.
+
+    Args:
+        x: Array of dtype uint64.
+
+    Returns:
+        A uint8 array with the same shape as ``x``.
+    """
+    x = np.asarray(x, dtype=np.uint64)
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(x).astype(np.uint8, copy=False)
+    x = x - ((x >> np.uint64(1)) & _M1)
+    x = (x & _M2) + ((x >> np.uint64(2)) & _M2)
+    x = (x + (x >> np.uint64(4))) & _M4
+    return ((x * _H01) >> np.uint64(56)).astype(np.uint8)
+
+
+def subset_masks(
+    subsets: Sequence[Tuple[int, ...]], universe: Sequence[int]
+) -> np.ndarray:
+    """
+    Converts subsets of sample values into single-word uint64 bitmasks.
+
+    Bit ``i`` of a mask is set when ``universe[i]`` is a member of the subset.
+
+    Args:
+        subsets: Sequence of equally sized tuples of sample values.
+        universe: Sorted sequence of all sample values (at most 64 of them).
+
+    Returns:
+        A uint64 array with one mask per subset.
+    """
+    universe_arr = np.asarray(universe)
+    if universe_arr.size > MAX_UNIVERSE:
+        raise ValueError(
+            f"Bitmask coverage supports at most {MAX_UNIVERSE} samples, got {universe_arr.size}."
+        )
+    if len(subsets) == 0:
+        return np.empty(0, dtype=np.uint64)
+
+    members = np.asarray(subsets)
+    positions = np.searchsorted(universe_arr, members)
+    if np.any(positions >= universe_arr.size) or np.any(
+        universe_arr[np.minimum(positions, universe_arr.size - 1)] != members
+    ):
+        raise ValueError("Subset contains a value that is not part of the universe.")
+
+    bits = np.left_shift(np.uint64(1), positions.astype(np.uint64))
+    return np.bitwise_or.reduce(bits, axis=1)
+
+
+def covering_k_indices(
+    k_masks: np.ndarray, j_masks: np.ndarray, s: int
+) -> List[np.ndarray]:
+    """
+    Lists, for every j-subset, the indices of the k-combinations covering it.
+
+    When every k-combination and j-subset has exactly s members, coverage is
+    mask equality and the lists are found by sorting instead of a pairwise
+    scan. Otherwise the intersection sizes are evaluated in chunks of j rows.
+
+    Args:
+        k_masks: uint64 masks of the k-combinations.
+        j_masks: uint64 masks of the j-subsets.
+        s: Minimum intersection size for a k-combination to cover a j-subset.
+
+    Returns:
+        A list with one sorted int64 index array per j-subset.
+    """
+    num_k = k_masks.size
+    num_j = j_masks.size
+    if num_j == 0:
+        return []
+    if num_k == 0:
+        return [np.empty(0, dtype=np.int64) for _ in range(num_j)]
+
+    k_sizes = popcount64(k_masks)
+    j_sizes = popcount64(j_masks)
+    if np.all(k_sizes == s) and np.all(j_sizes == s):
+        # k = j = s: a k-combination covers a j-subset iff the masks are equal.
+        order = np.argsort(k_masks, kind="stable")
+        sorted_masks = k_masks[order]
+        lo = np.searchsorted(sorted_masks, j_masks, side="left")
+        hi = np.searchsorted(sorted_masks, j_masks, side="right")
+        return [np.sort(order[a:b]) for a, b in zip(lo.tolist(), hi.tolist())]
+
+    result: List[np.ndarray] = []
+    rows_per_chunk = max(1, CHUNK_CELLS // num_k)
+    for start in range(0, num_j, rows_per_chunk):
+        chunk = j_masks[start : start + rows_per_chunk]
+        hits = popcount64(chunk[:, None] & k_masks[None, :]) >= s
+        rows, cols = np.nonzero(hits)
+        splits = np.searchsorted(rows, np.arange(1, chunk.size))
+        result.extend(np.split(cols, splits))
+    return result
+
+
+def _gather_rows(indptr: np.ndarray, indices: np.ndarray, rows) -> np.ndarray:
+    """Concatenates the CSR rows ``rows`` without a Python-level loop."""
+    rows = np.asarray(rows, dtype=np.int64)
+    if rows.size == 0:
+        return indices[:0]
+    starts = indptr[rows]
+    lengths = indptr[rows + 1] - starts
+    offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+    return indices[offsets + np.arange(lengths.sum())]
+
+
+class CoverageIndex:
+    """
+    Sparse k-combination x j-subset coverage matrix in CSR form, plus its transpose.
+
+    Row ``r`` of the k-side lists the j-subsets covered by k-combination ``r``
+    (``k_indices[k_indptr[r]:k_indptr[r + 1]]``); the j-side lists, in
+    increasing order, the k-combinations covering each j-subset. Indices are
+    int32 positions in the k/j lists the index was built from.
+    """
+
+    def __init__(
+        self,
+        k_indptr: np.ndarray,
+        k_indices: np.ndarray,
+        j_indptr: np.ndarray,
+        j_indices: np.ndarray,
+        num_k: int,
+        num_j: int,
+    ):
+        self.k_indptr = k_indptr
+        self.k_indices = k_indices
+        self.j_indptr = j_indptr
+        self.j_indices = j_indices
+        self.num_k = num_k
+        self.num_j = num_j
+
+    @property
+    def nnz(self) -> int:
+        return int(self.k_indices.size)
+
+    def covered_by(self, k_idx: int) -> np.ndarray:
+        """j-subset indices covered by k-combination ``k_idx``."""
+        return self.k_indices[self.k_indptr[k_idx] : self.k_indptr[k_idx + 1]]
+
+    def covering(self, j_idx: int) -> np.ndarray:
+        """k-combination indices covering j-subset ``j_idx`` (sorted)."""
+        return self.j_indices[self.j_indptr[j_idx] : self.j_indptr[j_idx + 1]]
+
+    def covered_by_many(self, k_idx: Sequence[int]) -> np.ndarray:
+        """Concatenated :meth:`covered_by` rows of several k-combinations."""
+        return _gather_rows(self.k_indptr, self.k_indices, k_idx)
+
+    def covering_many(self, j_idx: Sequence[int]) -> np.ndarray:
+        """Concatenated :meth:`covering` rows of several j-subsets."""
+        return _gather_rows(self.j_indptr, self.j_indices, j_idx)
+
+    def k_degrees(self) -> np.ndarray:
+        return np.diff(self.k_indptr)
+
+    def j_degrees(self) -> np.ndarray:
+        return np.diff(self.j_indptr)
+
+    def cover_counts(self, selected_k: Sequence[int]) -> np.ndarray:
+        """Number of selected k-combinations covering each j-subset."""
+        rows = self.covered_by_many(selected_k)
+        return np.bincount(rows, minlength=self.num_j).astype(np.int32)
+
+    def is_cover(self, selected_k: Sequence[int], t: int = 1) -> bool:
+        """True if every j-subset is covered by at least t selected k-combinations."""
+        if self.num_j == 0:
+            return True
+        return bool(np.all(self.cover_counts(selected_k) >= t))
+
+
+def csr_dtype(nnz: int):
+    """Smallest index dtype (int32 or int64) for CSR arrays with ``nnz`` entries."""
+    return np.int32 if nnz < np.iinfo(np.int32).max else np.int64
+
+
+def build_coverage_index(
+    k_masks: np.ndarray, j_masks: np.ndarray, s: int, n: int
+) -> CoverageIndex:
+    """
+    Builds the CSR coverage index by enumerating covered j-subsets directly.
+
+    For each k-combination, every covered j-subset is obtained by picking
+    i >= s of its members and j - i samples from outside it, so the work is
+    proportional to the number of nonzeros instead of C(n,k) * C(n,j). The
+    enumerated masks are mapped to positions in ``j_masks`` by binary search;
+    j-subsets absent from ``j_masks`` are skipped.
+
+    Args:
+        k_masks: uint64 masks of the k-combinations (all of the same size k).
+        j_masks: uint64 masks of the j-subsets to index (all of the same size j).
+        s: Minimum intersection size for coverage.
+        n: Number of samples (bits) in the universe.
+
+    Returns:
+        A CoverageIndex over the given k-combination and j-subset orders.
+    """
+    num_k = int(k_masks.size)
+    num_j = int(j_masks.size)
+    if num_k == 0 or num_j == 0:
+        empty_k = np.zeros(num_k + 1, dtype=np.int32)
+        empty_j = np.zeros(num_j + 1, dtype=np.int32)
+        none = np.empty(0, dtype=np.int32)
+        return CoverageIndex(empty_k, none, empty_j, none, num_k, num_j)
+
+    k = int(popcount64(k_masks[:1])[0])
+    j = int(popcount64(j_masks[:1])[0])
+    outside = n - k
+
+    # Member patterns: choose i of the k members and j - i of the outsiders
+    patterns = []
+    for i in range(max(s, j - outside), min(j, k) + 1):
+        inside = list(itertools.combinations(range(k), i))
+        out = list(itertools.combinations(range(outside), j - i))
+        patterns.append(
+            (
+                np.array(inside, dtype=np.intp).reshape(len(inside), i),
+                np.array(out, dtype=np.intp).reshape(len(out), j - i),
+            )
+        )
+    degree = sum(a.shape[0] * b.shape[0] for a, b in patterns)
+
+    j_order = np.argsort(j_masks, kind="stable").astype(np.int32)
+    j_sorted = j_masks[j_order]
+    bit_positions = np.arange(n, dtype=np.uint64)
+
+    counts = np.zeros(num_k, dtype=np.int64)
+    row_chunks: List[np.ndarray] = []
+    rows_per_chunk = max(1, CHUNK_CELLS // max(degree, 1))
+    sentinel = np.int32(num_j)
+    for start in range(0, num_k, rows_per_chunk):
+        chunk = k_masks[start : start + rows_per_chunk]
+        member = ((chunk[:, None] >> bit_positions) & np.uint64(1)).astype(bool)
+        bits = np.uint64(1) << bit_positions
+        in_bits = np.broadcast_to(bits, member.shape)[member].reshape(-1, k)
+        out_bits = np.broadcast_to(bits, member.shape)[~member].reshape(-1, outside)
+
+        parts = []
+        for inside, out in patterns:
+            in_masks = np.bitwise_or.reduce(in_bits[:, inside], axis=2)
+            if out.shape[1]:
+                out_masks = np.bitwise_or.reduce(out_bits[:, out], axis=2)
+            else:
+                out_masks = np.zeros((chunk.size, 1), dtype=np.uint64)
+            parts.append(
+                (in_masks[:, :, None] | out_masks[:, None, :]).reshape(chunk.size, -1)
+            )
+        enumerated = np.concatenate(parts, axis=1)
+
+        pos = np.minimum(np.searchsorted(j_sorted, enumerated), num_j - 1)
+        found = j_sorted[pos] == enumerated
+        j_idx = np.where(found, j_order[pos], sentinel)
+        j_idx.sort(axis=1)
+        counts[start : start + chunk.size] = found.sum(axis=1)
+        row_chunks.append(j_idx[j_idx != sentinel])
+
+    k_indices = np.concatenate(row_chunks).astype(np.int32, copy=False)
+    nnz = int(k_indices.size)
+    indptr_dtype = csr_dtype(nnz)
+    k_indptr = np.zeros(num_k + 1, dtype=indptr_dtype)
+    np.cumsum(counts, out=k_indptr[1:])
+
+    # Transpose: a stable sort by j keeps k ascending inside each j row
+    k_of_entry = np.repeat(np.arange(num_k, dtype=np.int32), counts)
+    order = np.argsort(k_indices, kind="stable")
+    j_indices = k_of_entry[order]
+    j_indptr = np.zeros(num_j + 1, dtype=indptr_dtype)
+    np.cumsum(np.bincount(k_indices, minlength=num_j), out=j_indptr[1:])
+
+    return CoverageIndex(k_indptr, k_indices, j_indptr, j_indices, num_k, num_j)
+
+
+def coverage_from_j_rows(
+    j_indptr: np.ndarray, j_indices: np.ndarray, num_k: int
+) -> CoverageIndex:
+    """
+    Builds a CoverageIndex from its j->k CSR rows.
+
+    Args:
+        j_indptr: Row pointers of the j->k rows.
+        j_indices: k indices, ascending inside each row.
+        num_k: Number of k-columns.
+
+    Returns:
+        The CoverageIndex with the k->j transpose filled in.
+    """
+    num_j = int(j_indptr.size) - 1
+    indptr_dtype = csr_dtype(int(j_indices.size))
+    j_of_entry = np.repeat(np.arange(num_j, dtype=np.int32), np.diff(j_indptr))
+    # A stable sort by k keeps j ascending inside each k row
+    order = np.argsort(j_indices, kind="stable")
+    k_indptr = np.zeros(num_k + 1, dtype=indptr_dtype)
+    np.cumsum(np.bincount(j_indices, minlength=num_k), out=k_indptr[1:])
+    return CoverageIndex(
+        k_indptr,
+        j_of_entry[order],
+        j_indptr.astype(indptr_dtype, copy=False),
+        j_indices.astype(np.int32, copy=False),
+        num_k,
+        num_j,
+    )
+
+
+def uncovered_j_indices(
+    selected_k_masks: np.ndarray, j_masks: np.ndarray, s: int, t: int = 1
+) -> np.ndarray:
+    """
+    Finds the j-subsets covered fewer than t times by the selected k-combinations.
+
+    Args:
+        selected_k_masks: uint64 masks of the selected k-combinations.
+        j_masks: uint64 masks of all j-subsets that must be covered.
+        s: Minimum intersection size that counts as coverage.
+        t: Number of distinct selected k-combinations required per j-subset.
+
+    Returns:
+        Sorted int64 positions in ``j_masks`` of the under-covered j-subsets.
+    """
+    if selected_k_masks.size == 0:
+        return np.arange(j_masks.size if t > 0 else 0, dtype=np.int64)
+    rows_per_chunk = max(1, CHUNK_CELLS // selected_k_masks.size)
+    missing = []
+    for start in range(0, j_masks.size, rows_per_chunk):
+        chunk = j_masks[start : start + rows_per_chunk]
+        counts = (popcount64(chunk[:, None] & selected_k_masks[None, :]) >= s).sum(
+            axis=1
+        )
+        missing.append(np.flatnonzero(counts < t) + start)
+    return np.concatenate(missing) if missing else np.empty(0, dtype=np.int64)
+
+
+class CoverageState:
+    """
+    Mutable selection of k-combinations with per-j cover counts.
+
+    Keeps ``counts[j]`` (selected k-combinations covering j-subset j) and the
+    number of j-subsets covered fewer than ``t`` times, so adding, removing or
+    testing the removal of one k-combination costs O(its column degree)
+    instead of a full coverage scan.
+    """
+
+    def __init__(self, index: CoverageIndex, t: int = 1, selected_k=()):
+        self.index = index
+        self.t = t
+        self.counts = np.zeros(index.num_j, dtype=np.int32)
+        self.selected = np.zeros(index.num_k, dtype=bool)
+        self.num_uncovered = index.num_j if t > 0 else 0
+        for k_idx in selected_k:
+            self.add(int(k_idx))
+
+    def add(self, k_idx: int) -> int:
+        """Selects ``k_idx``; returns how many j-subsets became covered."""
+        if self.selected[k_idx]:
+            raise ValueError(f"k-combination {k_idx} is already selected")
+        rows = self.index.covered_by(k_idx)
+        self.counts[rows] += 1
+        newly = int(np.count_nonzero(self.counts[rows] == self.t))
+        self.num_uncovered -= newly
+        self.selected[k_idx] = True
+        return newly
+
+    def remove(self, k_idx: int) -> int:
+        """Deselects ``k_idx``; returns how many j-subsets became uncovered."""
+        if not self.selected[k_idx]:
+            raise ValueError(f"k-combination {k_idx} is not selected")
+        rows = self.index.covered_by(k_idx)
+        lost = int(np.count_nonzero(self.counts[rows] == self.t))
+        self.counts[rows] -= 1
+        self.num_uncovered += lost
+        self.selected[k_idx] = False
+        return lost
+
+    def removal_loss(self, k_idx: int) -> int:
+        """j-subsets that would drop below t if the selected ``k_idx`` were removed."""
+        return int(
+            np.count_nonzero(self.counts[self.index.covered_by(k_idx)] == self.t)
+        )
+
+    def can_remove(self, k_idx: int) -> bool:
+        """True if removing the selected ``k_idx`` keeps every covered j-subset covered."""
+        return self.removal_loss(k_idx) == 0
+
+    def gain(self, k_idx: int) -> int:
+        """j-subsets that would reach t if the unselected ``k_idx`` were added."""
+        return int(
+            np.count_nonzero(self.counts[self.index.covered_by(k_idx)] == self.t - 1)
+        )
+
+    def is_cover(self) -> bool:
+        return self.num_uncovered == 0
+
+    def selected_indices(self) -> np.ndarray:
+        return np.flatnonzero(self.selected)
+
+
+# Example Usage
+if __name__ == "__main__":
+    samples_example = list(range(1, 11))
+    k_example, j_example, s_example = 6, 5, 4
+    k_combos_list = list(itertools.combinations(samples_example, k_example))
+    j_subsets_list = list(itertools.combinations(samples_example, j_example))
+
+    k_masks_arr = subset_masks(k_combos_list, samples_example)
+    j_masks_arr = subset_masks(j_subsets_list, samples_example)
+    lists = covering_k_indices(k_masks_arr, j_masks_arr, s_example)
+
+    # Cross-check against the original s-subset set comparison
+    k_sets = [set(itertools.combinations(c, s_example)) for c in k_combos_list]
+    mismatches = 0
+    for js_idx, js in enumerate(j_subsets_list):
+        st_js = set(itertools.combinations(js, s_example))
+        expected = [i for i, ks in enumerate(k_sets) if not ks.isdisjoint(st_js)]
+        mismatches += expected != lists[js_idx].tolist()
+    print(
+        f"{len(k_combos_list)} k-combos x {len(j_subsets_list)} j-subsets: {mismatches} mismatching rows",
+        file=sys.stderr,
+    )
+
+    index = build_coverage_index(
+        k_masks_arr, j_masks_arr, s_example, len(samples_example)
+    )
+    csr_mismatches = sum(
+        index.covering(js_idx).tolist() != lists[js_idx].tolist()
+        for js_idx in range(len(j_subsets_list))
+    )
+    print(
+        f"CSR index: nnz={index.nnz}, {csr_mismatches} rows differ from the pairwise scan",
+        file=sys.stderr,
+    )
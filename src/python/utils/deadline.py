@@ -0,0 +1,60 @@
+import time
+from typing import Optional
+
+# Wall-clock deadline shared by the phases of one solve. select_optimal_samples
+# creates a single Deadline from the caller's time_limit; the greedy engines,
+# GRASP, single-point removal, local search, tabu search, LNS, every CP-SAT
+# round and the orbit model ask it for a share of the time that is left
+# instead of using fixed budgets, and stop with their best solution so far
+# once it has passed. The coverage index build and the s == j pruning run to
+# completion and are charged against it.
+
+
+class Deadline:
+    """
+    A point in time (time.perf_counter) by which a solve must finish.
+
+    Args:
+        time_limit: Seconds from ``start``.
+        start: perf_counter value the limit is measured from (default: now).
+    """
+
+    def __init__(self, time_limit: float, start: Optional[float] = None):
+        self.start = time.perf_counter() if start is None else start
+        self.time_limit = float(time_limit)
+        self.end = self.start + self.time_limit
+
+    def elapsed(self) -> float:
+        """Seconds since ``start``."""
+        return time.perf_counter() - self.start
+
+    def remaining(self) -> float:
+        """Seconds left before the deadline (0 once it has passed)."""
+        return max(0.0, self.end - time.perf_counter())
+
+    def expired(self) -> bool:
+        return time.perf_counter() >= self.end
+
+    def budget(
+        self, share: float = 1.0, reserve: float = 0.0, cap: Optional[float] = None
+    ) -> float:
+        """
+        Seconds for the next phase.
+
+        Args:
+            share: Fraction of the remaining time (after ``reserve``) to give.
+            reserve: Seconds kept back for the phases that follow.
+            cap: Upper bound on the budget.
+
+        Returns:
+            ``share`` of the time left after ``reserve``, at most ``cap``; 0 if
+            nothing is left.
+        """
+        seconds = max(0.0, self.remaining() - reserve) * share
+        return min(seconds, cap) if cap is not None else seconds
+
+    def child(
+        self, share: float = 1.0, reserve: float = 0.0, cap: Optional[float] = None
+    ) -> "Deadline":
+        """A deadline starting now that ends after :meth:`budget` seconds."""
+        return Deadline(self.budget(share, reserve, cap))
@@ -24,6 +24,9 @@ export interface AlgorithmResult {
   samples: number[]; // The actual samples used (sorted)
   combos: number[][]; // List of resulting k-combinations (tuples from Python become arrays)
   execution_time?: number; // Optional: Time taken by the Python function
+  model_build_time?: number; // Optional: CP-SAT model construction time (s)
+  solve_time?: number; // Optional: CP-SAT solver wall time (s)
+  presolve?: Record<string, number>; // Optional: Presolve reduction counts (rows/columns eliminated)
   workers?: number; // Optional: Workers actually used by Python
   filename?: string; // Optional: The filename under which the result was saved
 }
@@ -71,6 +74,15 @@ export interface ProgressUpdate {
   percent: number;  // 进度百分比 (0-100)
   message: string;  // 进度描述信息
   elapsed_time?: number; // 运行时间（秒）
+  solution?: SolutionUpdate; // CP-SAT 找到的改进解
+}
+
+// Improving CP-SAT solution streamed with a progress update
+export interface SolutionUpdate {
+  size: number;    // 当前解的组合数
+  bound: number;   // 当前下界
+  gap: number;     // 相对间隙 (size - bound) / size
+  elapsed: number; // 求解器运行时间（秒）
 }
 
 // Type for the API exposed via preload script (for type safety in Renderer)
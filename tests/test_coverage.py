@@ -0,0 +1,98 @@
+import itertools
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Adjust path to import the algorithm utilities
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src" / "python"))
+
+from utils import colex
+from utils.bitmask import all_masks, build_cover_indices
+from utils.coverage import (
+    CoverageState,
+    build_coverage_index,
+    covering_k_indices,
+    subset_masks,
+)
+
+
+def _reference_rows(samples, k, j, s):
+    """Covering lists computed with the original s-subset set comparison."""
+    k_sets = [
+        set(itertools.combinations(kc, s)) for kc in itertools.combinations(samples, k)
+    ]
+    rows = []
+    for js in itertools.combinations(samples, j):
+        st_js = set(itertools.combinations(js, s))
+        rows.append([i for i, ks in enumerate(k_sets) if not ks.isdisjoint(st_js)])
+    return rows
+
+
+@pytest.mark.parametrize(
+    "n,k,j,s", [(9, 6, 5, 4), (9, 6, 5, 3), (8, 5, 5, 5), (10, 5, 4, 4), (8, 4, 4, 3)]
+)
+def test_coverage_engine_matches_set_comparison(n, k, j, s):
+    samples = list(range(3, 3 + 2 * n, 2))  # Non-contiguous sample values
+    k_masks = subset_masks(list(itertools.combinations(samples, k)), samples)
+    j_masks = subset_masks(list(itertools.combinations(samples, j)), samples)
+    expected = _reference_rows(samples, k, j, s)
+
+    pairwise = covering_k_indices(k_masks, j_masks, s)
+    index = build_coverage_index(k_masks, j_masks, s, n)
+
+    assert [row.tolist() for row in pairwise] == expected
+    assert [index.covering(i).tolist() for i in range(len(expected))] == expected
+    # The k-side rows must be the transpose of the j-side rows
+    for k_idx in range(index.num_k):
+        covered = index.covered_by(k_idx).tolist()
+        assert covered == sorted(i for i, row in enumerate(expected) if k_idx in row)
+
+
+@pytest.mark.parametrize("n,r", [(7, 3), (12, 5), (25, 7)])
+def test_colex_rank_unrank_round_trip(n, r):
+    total = colex.num_subsets(n, r)
+    ranks = np.unique(np.random.default_rng(n).integers(0, total, size=500))
+    subsets = colex.unrank(ranks, n, r)
+    assert np.all(np.diff(subsets, axis=1) > 0)
+    assert np.array_equal(colex.rank(subsets, n), ranks)
+    assert np.array_equal(
+        colex.masks(ranks, n, r),
+        np.bitwise_or.reduce(np.uint64(1) << subsets.astype(np.uint64), axis=1),
+    )
+
+
+def test_build_cover_indices_lists_contained_s_subsets():
+    bit_k = all_masks(10, 6)
+    bit_s = all_masks(10, 4)
+    counts, covers = build_cover_indices(bit_k, bit_s)
+    assert covers.shape == (bit_k.size, 15)  # C(6, 4) s-subsets per k-combination
+    for k_idx in range(bit_k.size):
+        expected = np.flatnonzero((bit_k[k_idx] & bit_s) == bit_s)
+        assert sorted(covers[k_idx, : counts[k_idx]].tolist()) == expected.tolist()
+
+
+@pytest.mark.parametrize("t", [1, 2])
+def test_coverage_state_tracks_counts_incrementally(t):
+    n = 10
+    index = build_coverage_index(all_masks(n, 5), all_masks(n, 4), 3, n)
+    rng = np.random.default_rng(t)
+    state = CoverageState(index, t=t)
+    for k_idx in rng.permutation(index.num_k)[:60].tolist():
+        state.add(k_idx)
+        if rng.random() < 0.3:
+            state.remove(int(rng.choice(state.selected_indices())))
+        counts = index.cover_counts(state.selected_indices())
+        assert np.array_equal(state.counts, counts)
+        assert state.num_uncovered == int(np.count_nonzero(counts < t))
+
+    state = CoverageState(index, t=t, selected_k=range(index.num_k))
+    assert state.is_cover()
+    for k_idx in rng.permutation(index.num_k)[:60].tolist():
+        rest = np.setdiff1d(state.selected_indices(), [k_idx])
+        assert state.can_remove(k_idx) == index.is_cover(rest, t)
+        if state.can_remove(k_idx):
+            state.remove(k_idx)
+    assert state.is_cover()
@@ -0,0 +1,245 @@
+import random
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Adjust path to import the algorithm utilities
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src" / "python"))
+
+from algorithm import (
+    _greedy_warm_start,
+    _threshold_set_cover,
+    _threshold_set_cover_lazy,
+)
+from solver.cg_solver import ColumnGenerationSolver
+from solver.symmetry import column_permutations, permute_ranks, sample_generators
+from utils import colex
+from utils.coverage import CoverageState, build_coverage_index, uncovered_j_indices
+
+
+@pytest.mark.parametrize("max_cut_rounds", [1, 50])
+@pytest.mark.parametrize("n,k,j,s,t", [(9, 5, 5, 5, 1), (10, 6, 5, 4, 2)])
+def test_cutting_planes_return_a_full_cover(n, k, j, s, t, max_cut_rounds):
+    combos = np.arange(colex.num_subsets(n, k), dtype=np.int32)
+    j_subsets = np.arange(colex.num_subsets(n, j), dtype=np.int32)
+    selected, objective, bound, stats = _threshold_set_cover_lazy(
+        combos,
+        j_subsets,
+        t,
+        1,
+        time_limit=10,
+        s=s,
+        n=n,
+        k=k,
+        j=j,
+        seed_size=10,
+        rng=random.Random(0),
+        max_cut_rounds=max_cut_rounds,
+    )
+    missing = uncovered_j_indices(
+        colex.masks(selected, n, k), colex.masks(j_subsets, n, j), s, t
+    )
+    assert missing.size == 0
+    assert objective == len(selected) >= bound
+    assert stats["cut_rounds"] <= max_cut_rounds
+
+
+@pytest.mark.parametrize("rng_seed", [0, 1])
+def test_cutting_planes_with_lex_symmetry_stay_feasible(rng_seed):
+    # A random seed set of rows is not invariant under the sample permutations
+    n, k, j, s = 10, 6, 5, 4
+    combos = np.arange(colex.num_subsets(n, k), dtype=np.int32)
+    j_subsets = np.arange(colex.num_subsets(n, j), dtype=np.int32)
+    selected, objective, bound, stats = _threshold_set_cover_lazy(
+        combos,
+        j_subsets,
+        1,
+        1,
+        time_limit=20,
+        s=s,
+        n=n,
+        k=k,
+        j=j,
+        seed_size=15,
+        rng=random.Random(rng_seed),
+        symmetry="lex",
+    )
+    missing = uncovered_j_indices(
+        colex.masks(selected, n, k), colex.masks(j_subsets, n, j), s
+    )
+    assert missing.size == 0
+    assert objective == len(selected) >= bound
+
+
+def test_presolved_model_returns_a_full_cover():
+    n, k, j, s = 12, 6, 5, 4
+    rng = np.random.default_rng(0)
+    combos = np.sort(rng.choice(colex.num_subsets(n, k), 80, replace=False))
+    j_subsets = np.arange(colex.num_subsets(n, j), dtype=np.int32)
+    selected, objective, bound, stats = _threshold_set_cover(
+        combos, j_subsets, 1, 1, time_limit=3, s=s, n=n, k=k, j=j, presolve=True
+    )
+    missing = uncovered_j_indices(
+        colex.masks(selected, n, k), colex.masks(j_subsets, n, j), s
+    )
+    assert missing.size == 0
+    assert objective == len(selected) >= bound
+    assert stats["presolve"]["eliminated_rows"] > 0
+
+
+@pytest.mark.parametrize("t", [1, 2])
+def test_greedy_warm_start_completes_hints_to_a_cover(t):
+    n, k, j, s = 10, 6, 5, 4
+    index = build_coverage_index(
+        colex.masks(np.arange(colex.num_subsets(n, k)), n, k),
+        colex.masks(np.arange(colex.num_subsets(n, j)), n, j),
+        s,
+        n,
+    )
+    warm, is_cover = _greedy_warm_start(index, t, hinted_k=[0, 1])
+    state = CoverageState(index, t=t, selected_k=warm)
+    assert is_cover and state.is_cover()
+    assert not any(state.can_remove(k_idx) for k_idx in warm)
+
+
+def test_lex_leader_symmetry_keeps_the_optimum():
+    n, k, j, s = 9, 6, 5, 4
+    combos = np.arange(colex.num_subsets(n, k), dtype=np.int32)
+    j_subsets = np.arange(colex.num_subsets(n, j), dtype=np.int32)
+    # Full instances are invariant under the cyclic shift and every transposition
+    perms = column_permutations(combos, j_subsets, n, k, j, sample_generators(n))
+    assert len(perms) == n
+    assert all(np.array_equal(np.sort(p), combos) for p in perms)
+    optimum = {}
+    for mode in ("none", "lex"):
+        selected, objective, bound, _ = _threshold_set_cover(
+            combos, j_subsets, 1, 1, time_limit=10, s=s, n=n, k=k, j=j, symmetry=mode
+        )
+        assert objective == bound == len(selected)
+        optimum[mode] = objective
+    assert optimum["lex"] == optimum["none"] == 3
+
+
+def test_orbit_mode_expands_to_a_verified_invariant_cover():
+    n, k, j, s = 10, 6, 5, 4
+    combos = np.arange(colex.num_subsets(n, k), dtype=np.int32)
+    j_subsets = np.arange(colex.num_subsets(n, j), dtype=np.int32)
+    selected, objective, bound, stats = _threshold_set_cover(
+        combos, j_subsets, 1, 1, time_limit=10, s=s, n=n, k=k, j=j, symmetry="orbit"
+    )
+    missing = uncovered_j_indices(
+        colex.masks(selected, n, k), colex.masks(j_subsets, n, j), s
+    )
+    assert missing.size == 0
+    assert objective == len(selected) == stats["orbit"]["objective"]
+    # Z_n orbits have at most n members
+    assert stats["orbit"]["column_orbits"] >= len(combos) / n
+    shifted = permute_ranks(selected, sample_generators(n, ("cyclic",))[0], n, k)
+    assert set(shifted.tolist()) == set(selected.tolist())
+    with pytest.raises(ValueError):
+        _threshold_set_cover(
+            combos[:-1], j_subsets, 1, 1, s=s, n=n, k=k, j=j, symmetry="orbit"
+        )
+
+
+@pytest.mark.parametrize("symmetry", ["lex", "orbit"])
+def test_improving_solutions_are_streamed_and_gap_limit_stops(symmetry):
+    n, k, j, s = 10, 6, 5, 4
+    combos = np.arange(colex.num_subsets(n, k), dtype=np.int32)
+    j_subsets = np.arange(colex.num_subsets(n, j), dtype=np.int32)
+    updates = []
+    selected, objective, bound, stats = _threshold_set_cover(
+        combos,
+        j_subsets,
+        1,
+        1,
+        time_limit=30,
+        progress_callback=lambda percent, message: updates.append((percent, message)),
+        s=s,
+        n=n,
+        k=k,
+        j=j,
+        symmetry=symmetry,
+        gap_limit=1.0,  # Any solution is within the gap
+    )
+    solution_updates = [u for u in updates if u[1].startswith("Solution")]
+    assert stats["solutions"] == len(solution_updates) == 1
+    assert stats["first_solution_time"] <= stats["solve_time"] < 30
+    assert all(10 <= percent <= 90 for percent, _ in solution_updates)
+    missing = uncovered_j_indices(
+        colex.masks(selected, n, k), colex.masks(j_subsets, n, j), s
+    )
+    assert missing.size == 0
+
+
+@pytest.mark.parametrize("t", [1, 2])
+def test_column_generation_returns_a_cover_and_a_valid_bound(t):
+    n, k, j, s = 9, 6, 5, 4
+    index = build_coverage_index(
+        colex.masks(np.arange(colex.num_subsets(n, k)), n, k),
+        colex.masks(np.arange(colex.num_subsets(n, j)), n, j),
+        s,
+        n,
+    )
+    cg = ColumnGenerationSolver(index, t, time_limit=5)
+    selected, bound, stats = cg.solve()
+    assert index.is_cover(selected, t)
+    optimum, _, proven_bound, _ = _threshold_set_cover(
+        np.arange(index.num_k, dtype=np.int32),
+        np.arange(index.num_j, dtype=np.int32),
+        t,
+        1,
+        time_limit=10,
+        s=s,
+        n=n,
+        k=k,
+        j=j,
+    )
+    assert proven_bound == len(optimum)
+    assert 0 < bound <= len(optimum) <= len(selected)
+    assert stats["converged"] and stats["pool_size"] == cg.pool.size
+    extra = cg.priced_columns(5)
+    assert not np.any(cg.in_pool[extra])
+
+
+@pytest.mark.parametrize("n,k,j,s,t", [(9, 6, 5, 4, 1), (9, 5, 4, 3, 2)])
+def test_highs_backend_matches_the_cpsat_optimum(n, k, j, s, t):
+    pytest.importorskip("scipy")
+    combos = np.arange(colex.num_subsets(n, k), dtype=np.int32)
+    j_subsets = np.arange(colex.num_subsets(n, j), dtype=np.int32)
+    results = {
+        backend: _threshold_set_cover(
+            combos, j_subsets, t, 1, time_limit=30, s=s, n=n, k=k, j=j, backend=backend
+        )
+        for backend in ("cpsat", "highs")
+    }
+    selected, objective, bound, stats = results["highs"]
+    index = build_coverage_index(
+        colex.masks(combos, n, k), colex.masks(j_subsets, n, j), s, n
+    )
+    assert index.is_cover(selected, t)
+    assert objective == bound == results["cpsat"][1]
+    assert stats["highs"]["status"] == "OPTIMAL"
+    with pytest.raises(ValueError):
+        _threshold_set_cover(
+            combos, j_subsets, t, 1, s=s, n=n, k=k, j=j, backend="simplex"
+        )
+
+
+@pytest.mark.parametrize("n,k,j,s,t", [(10, 6, 5, 4, 1), (9, 5, 4, 3, 2)])
+def test_tabu_backend_returns_a_cover_no_larger_than_the_warm_start(n, k, j, s, t):
+    combos = np.arange(colex.num_subsets(n, k), dtype=np.int32)
+    j_subsets = np.arange(colex.num_subsets(n, j), dtype=np.int32)
+    index = build_coverage_index(
+        colex.masks(combos, n, k), colex.masks(j_subsets, n, j), s, n
+    )
+    warm, _ = _greedy_warm_start(index, t)
+    selected, objective, bound, stats = _threshold_set_cover(
+        combos, j_subsets, t, 1, time_limit=2, s=s, n=n, k=k, j=j, backend="tabu"
+    )
+    assert index.is_cover(selected, t)
+    assert 0 < bound <= objective == len(selected) <= len(warm)
+    assert stats["tabu"]["final_size"] == len(selected)
@@ -0,0 +1,275 @@
+import contextlib
+import io
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Adjust path to import the algorithm utilities
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src" / "python"))
+
+from algorithm import select_optimal_samples
+from solver.beam import beam_search
+from solver.grasp import grasp_multi_start
+from solver.greedy import GREEDY_ENGINES, bucket_greedy, exact_greedy, stochastic_greedy
+from solver.lns import lns_improve
+from solver.local_search import swap_local_search
+from solver.lp_rounding import lp_rounding_cover, round_and_repair
+from solver.lr_bound import LagrangianRelaxationBound
+from solver.presolve import presolve_cover
+from solver.tabu import tabu_set_cover
+from utils import colex
+from utils.coverage import build_coverage_index
+from utils.deadline import Deadline
+
+
+def _full_index(n, k, j, s):
+    k_masks = colex.masks(np.arange(colex.num_subsets(n, k)), n, k)
+    j_masks = colex.masks(np.arange(colex.num_subsets(n, j)), n, j)
+    return build_coverage_index(k_masks, j_masks, s, n)
+
+
+@pytest.mark.parametrize("engine", sorted(set(GREEDY_ENGINES) - {"stochastic"}))
+@pytest.mark.parametrize("n,k,j,s", [(9, 6, 5, 4), (11, 6, 5, 3), (10, 5, 5, 5)])
+def test_greedy_engines_match_exact_selection(engine, n, k, j, s):
+    index = _full_index(n, k, j, s)
+    expected, _ = exact_greedy(index)
+    selected, stats = GREEDY_ENGINES[engine](index)
+    assert selected == expected
+    assert index.is_cover(np.asarray(selected))
+    assert stats["iterations"] == len(selected)
+
+
+@pytest.mark.parametrize("beam_width,workers", [(1, 1), (4, 1), (3, 2)])
+def test_beam_search_returns_valid_cover(beam_width, workers):
+    index = _full_index(11, 6, 5, 4)
+    selected = beam_search(index, beam_width, workers=workers)
+    assert index.is_cover(np.asarray(selected))
+    if beam_width == 1:
+        assert selected == exact_greedy(index)[0]
+
+
+def test_swap_local_search_keeps_a_smaller_full_cover():
+    index = _full_index(12, 6, 5, 4)
+    greedy, _ = bucket_greedy(index)
+    improved, stats = swap_local_search(index, greedy, time_budget=5.0, seed=0)
+    assert index.is_cover(np.asarray(improved))
+    assert len(improved) == len(greedy) - stats["two_for_one"] - stats["removed"]
+    assert len(improved) < len(greedy)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_grasp_multi_start_is_seeded_and_valid(workers):
+    index = _full_index(11, 6, 5, 4)
+    best = grasp_multi_start(index, num_starts=4, seed=3, workers=workers)
+    assert index.is_cover(np.asarray(best))
+    assert best == grasp_multi_start(index, num_starts=4, seed=3, workers=1)
+
+
+@pytest.mark.parametrize("engine", sorted(GREEDY_ENGINES))
+def test_greedy_engines_and_grasp_stop_at_the_deadline(engine):
+    index = _full_index(11, 6, 5, 4)
+    selected, stats = GREEDY_ENGINES[engine](index, deadline=Deadline(0.0))
+    assert selected == [] and stats["iterations"] == 0
+    assert GREEDY_ENGINES[engine](index, deadline=Deadline(60.0))[0]
+    assert grasp_multi_start(index, num_starts=4, seed=3, deadline=Deadline(0.0)) == []
+    best = grasp_multi_start(index, num_starts=4, seed=3, deadline=Deadline(60.0))
+    assert best == grasp_multi_start(index, num_starts=4, seed=3)
+
+
+def test_stochastic_greedy_is_seeded_and_valid():
+    index = _full_index(12, 6, 5, 4)
+    selected, stats = stochastic_greedy(index, epsilon=0.1, seed=5)
+    assert index.is_cover(np.asarray(selected))
+    assert selected == stochastic_greedy(index, epsilon=0.1, seed=5)[0]
+    assert stats["evaluations"] < exact_greedy(index)[1]["evaluations"]
+    for epsilon in (0.0, 1.0, 1.5):
+        with pytest.raises(ValueError):
+            stochastic_greedy(index, epsilon=epsilon)
+    # An epsilon close to 1 still samples at least one candidate per pick
+    assert index.is_cover(stochastic_greedy(index, epsilon=0.999, seed=0)[0])
+
+
+def test_presolve_fixes_forced_columns_and_drops_dominated_ones():
+    # Pairs over samples 0..3 covering singletons {0}, {1}, {2}: combinations
+    # 0 and 3 cover one singleton each and are dominated by 1 and 2, which then
+    # become the only covers of {0} and {2}
+    k_masks = np.array([0b1001, 0b0011, 0b0110, 0b1100], dtype=np.uint64)
+    j_masks = np.array([0b001, 0b010, 0b100], dtype=np.uint64)
+    index = build_coverage_index(k_masks, j_masks, 1, 4)
+    pre = presolve_cover(index)
+    assert pre.fixed_k.tolist() == [1, 2]
+    assert pre.expand([]) == [1, 2]
+    assert pre.stats["dominated_columns"] == 2
+    assert pre.stats["eliminated_columns"] == 4
+    assert pre.stats["eliminated_rows"] == 3
+
+
+def test_presolve_reduced_instance_expands_to_a_full_cover():
+    rng = np.random.default_rng(0)
+    n, k, j, s = 12, 6, 5, 4
+    k_ranks = np.sort(rng.choice(colex.num_subsets(n, k), 80, replace=False))
+    k_masks = colex.masks(k_ranks, n, k)
+    j_masks = colex.masks(np.arange(colex.num_subsets(n, j)), n, j)
+    index = build_coverage_index(k_masks, j_masks, s, n)
+    pre = presolve_cover(index)
+    reduced = pre.reduced_index()
+    assert pre.stats["eliminated_columns"] + pre.stats["eliminated_rows"] > 0
+    assert reduced.num_k == pre.active_k.size and reduced.num_j == pre.active_j.size
+    selected, _ = bucket_greedy(reduced)
+    assert index.is_cover(np.asarray(pre.expand(selected)))
+
+
+def test_deadline_budget_shares_the_remaining_time():
+    deadline = Deadline(10.0)
+    assert 4.0 < deadline.budget(0.5, reserve=1.0) <= 4.5
+    assert deadline.budget(cap=2.0) == 2.0
+    assert Deadline(0.0).budget() == 0.0 and Deadline(0.0).expired()
+    assert deadline.child(0.5).time_limit <= 5.0
+
+
+@pytest.mark.parametrize("orbit_mode", [False, True])
+def test_select_optimal_samples_honours_a_short_time_limit(orbit_mode):
+    # Local search (2 s) and the orbit model used to run past a 1 s limit
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(
+        io.StringIO()
+    ):
+        result = select_optimal_samples(
+            45,
+            16,
+            6,
+            5,
+            4,
+            random_select=True,
+            seed=0,
+            time_limit=1,
+            workers=1,
+            orbit_mode=orbit_mode,
+        )
+    assert result["execution_time"] < 1.5
+    index = _full_index(16, 6, 5, 4)
+    assert index.is_cover(np.asarray(result["greedy_indices"], dtype=np.int64))
+
+
+def test_beam_search_honours_a_short_time_limit():
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(
+        io.StringIO()
+    ):
+        start = time.perf_counter()
+        result = select_optimal_samples(
+            45,
+            15,
+            6,
+            5,
+            4,
+            random_select=True,
+            seed=1,
+            time_limit=1,
+            workers=1,
+            beam_width=16,
+        )
+        elapsed = time.perf_counter() - start
+    assert elapsed < 1.5 and result["execution_time"] < 1.5
+    index = _full_index(15, 6, 5, 4)
+    assert index.is_cover(np.asarray(result["greedy_indices"], dtype=np.int64))
+    # The search itself stops with a partial cover
+    partial = beam_search(index, 4, workers=1, deadline=Deadline(0.0))
+    assert partial == []
+
+
+def test_lagrangian_bound_is_valid_and_reported_for_greedy_covers():
+    # C(9,6,5,4) = 3, so the rounded-up bound can be at most 3
+    index = _full_index(9, 6, 5, 4)
+    lr = LagrangianRelaxationBound(index, upper_bound=len(bucket_greedy(index)[0]))
+    bound = lr.calculate_lower_bound(time_limit=5)
+    assert 0 < bound <= 3
+    assert np.all(np.diff(lr.history) >= 0)
+
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(
+        io.StringIO()
+    ):
+        result = select_optimal_samples(
+            45, 12, 6, 5, 4, random_select=True, seed=0, time_limit=5, workers=1
+        )
+    assert 0 < result["best_bound"] <= len(result["combos"])
+    assert 0 < result["accuracy"] <= 1
+
+
+@pytest.mark.parametrize("t,workers", [(1, 1), (1, 2), (2, 1)])
+def test_lp_rounding_returns_a_cover_within_its_bound(t, workers):
+    index = _full_index(9, 6, 5, 4)
+    selected, bound, stats = lp_rounding_cover(
+        index, t, num_rounds=4, seed=0, workers=workers, time_limit=10
+    )
+    assert index.is_cover(selected, t)
+    assert 0 < bound <= len(selected)
+    if t == 1:
+        assert bound <= 3  # C(9,6,5,4) = 3
+    assert stats["complete_roundings"] == stats["roundings"] == 4
+    # Past the time limit only the first batch (one rounding per worker) runs
+    selected, _, stats = lp_rounding_cover(
+        index, t, num_rounds=16, seed=0, workers=workers, time_limit=0.01
+    )
+    assert stats["roundings"] == workers
+    assert index.is_cover(selected, t)
+    # Without an LP solution the repair alone builds a cover
+    assert index.is_cover(round_and_repair(index, np.zeros(index.num_k), t), t)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_lns_keeps_a_full_cover_and_never_grows_it(workers):
+    n, k, j, s = 10, 6, 5, 4
+    k_masks = colex.masks(np.arange(colex.num_subsets(n, k)), n, k)
+    index = _full_index(n, k, j, s)
+    cover = exact_greedy(index)[0]
+    improved, stats = lns_improve(
+        index, cover, k_masks, n, deadline=Deadline(2), workers=workers, seed=0
+    )
+    assert index.is_cover(improved)
+    assert len(improved) <= len(cover)
+    assert stats["final_size"] == len(improved)
+    assert stats["neighbourhoods"] > 0
+    with pytest.raises(ValueError):
+        lns_improve(index, cover[:1], k_masks, n, deadline=Deadline(1))
+
+
+def test_tabu_search_shrinks_the_greedy_cover():
+    index = _full_index(12, 6, 5, 4)
+    cover = bucket_greedy(index)[0]
+    improved, stats = tabu_set_cover(index, cover, deadline=Deadline(3), seed=0)
+    assert index.is_cover(improved)
+    assert len(improved) < len(cover)
+    assert stats["final_size"] == len(improved)
+    assert [size for size, _ in stats["size_times"]] == list(
+        range(len(cover) - 1, len(improved) - 1, -1)
+    )
+    # The search stops at the target size
+    capped, _ = tabu_set_cover(index, cover, target=len(cover) - 1, seed=0)
+    assert len(capped) == len(cover) - 1
+    with pytest.raises(ValueError):
+        tabu_set_cover(index, cover[:1], deadline=Deadline(1))
+
+
+def test_tabu_backend_for_s_below_j_reports_a_bound_within_the_time_limit():
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(
+        io.StringIO()
+    ):
+        result = select_optimal_samples(
+            45,
+            14,
+            6,
+            5,
+            4,
+            random_select=True,
+            seed=0,
+            time_limit=3,
+            workers=1,
+            backend="tabu",
+        )
+    assert result["execution_time"] < 3.5
+    assert 0 < result["best_bound"] <= len(result["combos"])
+    index = _full_index(14, 6, 5, 4)
+    assert index.is_cover(np.asarray(result["greedy_indices"], dtype=np.int64))